@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Convert resume_builder_data.resume_data rows stored as JSON-encoded strings
+into JSON objects, one batch per transaction.
+
+Requires the 20261031_resume_data_native_jsonb migration. Safe to re-run;
+it stops when no string-encoded rows are left.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_client import supabase
+
+def backfill_resume_data(batch_size: int, pause_seconds: float) -> int:
+    """Run backfill_resume_data_batch until it converts nothing; returns the total converted"""
+    total = 0
+    while True:
+        response = supabase.rpc("backfill_resume_data_batch", {"p_batch_size": batch_size}).execute()
+        converted = response.data or 0
+        if not converted:
+            break
+        total += converted
+        print(f"🔄 Converted {converted} row(s) ({total} so far)")
+        time.sleep(pause_seconds)
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill resume_data as native JSONB")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="Seconds to wait between batches")
+    args = parser.parse_args()
+
+    total = backfill_resume_data(args.batch_size, args.pause)
+    print(f"✅ Done: {total} row(s) converted")
+    print("   Next: ALTER TABLE public.resume_builder_data VALIDATE CONSTRAINT resume_builder_data_resume_data_object;")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Fill resume_builder_data.preview for rows saved before the preview column
+existed, one batch per transaction.
+
+Requires the 20261029_resume_list_preview migration. Safe to re-run;
+it stops when no empty previews are left.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from supabase_client import supabase
+
+def backfill_resume_preview(batch_size: int, pause_seconds: float) -> int:
+    """Run backfill_resume_preview_batch until it fills nothing; returns the total filled"""
+    total = 0
+    while True:
+        response = supabase.rpc("backfill_resume_preview_batch", {"p_batch_size": batch_size}).execute()
+        filled = response.data or 0
+        if not filled:
+            break
+        total += filled
+        print(f"🔄 Filled {filled} preview(s) ({total} so far)")
+        time.sleep(pause_seconds)
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill resume list previews")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="Seconds to wait between batches")
+    args = parser.parse_args()
+
+    total = backfill_resume_preview(args.batch_size, args.pause)
+    print(f"✅ Done: {total} preview(s) filled")
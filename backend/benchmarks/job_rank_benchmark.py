@@ -0,0 +1,74 @@
+"""Job match ranking: one score_job_match call per job vs. the vectorized rank_jobs
+
+Builds a synthetic board of saved jobs, scores it both ways against one
+profile and prints jobs/second. It also checks that the two paths agree on
+every score.
+
+The scorer module imports the Supabase client, so the backend .env must be
+present, but no queries are made.
+
+Usage (from backend/):
+    python benchmarks/job_rank_benchmark.py --jobs 500
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import ats_scorer, skill_taxonomy  # noqa: E402
+
+FILLER = "team build product customers ship reliable features collaborate ownership growth".split()
+TITLES = ["Frontend Engineer", "Backend Engineer", "Data Scientist", "DevOps Engineer", "Product Manager"]
+# Includes skills outside the taxonomy, which only the profile's own matcher finds
+PROFILE_SKILLS = ["React", "TypeScript", "Node.js", "PostgreSQL", "AWS", "Docker", "GraphQL", "Figma",
+                  "Storybook", "Prisma"]
+
+def sample_jobs(count: int, words: int, seed: int) -> list:
+    rng = random.Random(seed)
+    vocabulary = skill_taxonomy.all_skills() + PROFILE_SKILLS[-2:]
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(vocabulary, 12)
+        text = [rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(words)]
+        jobs.append({"id": f"job-{i}", "job_title": rng.choice(TITLES), "description": " ".join(text)})
+    return jobs
+
+def report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<18} {count / seconds:10.1f} jobs/s  ({seconds * 1000:8.2f} ms total)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--words", type=int, default=400, help="words per job description")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    jobs = sample_jobs(args.jobs, args.words, args.seed)
+    titles = ["Frontend Developer"]
+
+    start = time.perf_counter()
+    # The corpus as user_job_corpus(user_id, PROFILE_SKILLS) builds it
+    matcher = skill_taxonomy.skill_matcher(PROFILE_SKILLS)
+    document_frequency: Counter = Counter()
+    for job in jobs:
+        document_frequency.update(ats_scorer.job_term_counts(job["job_title"], job["description"], matcher).keys())
+    per_job = {
+        job["id"]: ats_scorer.score_job_match(job["job_title"], job["description"], PROFILE_SKILLS, titles,
+                                              len(jobs), document_frequency)["matchScore"]
+        for job in jobs
+    }
+    report("per job", len(jobs), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ranked = ats_scorer.rank_jobs(jobs, PROFILE_SKILLS, titles)
+    report("rank_jobs", len(jobs), time.perf_counter() - start)
+
+    mismatches = sum(1 for match in ranked if per_job[match["job_id"]] != match["matchScore"])
+    print(f"score mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
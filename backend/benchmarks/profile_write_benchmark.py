@@ -0,0 +1,61 @@
+"""Compare profile write latency: select-then-write vs. single upsert
+
+Runs both strategies against the configured Supabase project for one test
+user and prints median / p95 latency per write.
+
+Usage (from backend/):
+    BENCH_USER_ID=<auth user uuid> python benchmarks/profile_write_benchmark.py --iterations 50
+
+The user must exist in auth.users; their profile job_title is overwritten.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from supabase_client import supabase  # noqa: E402
+from utils.profile_write import upsert_profile  # noqa: E402
+
+def select_then_write(user_id: str, data: dict) -> None:
+    """The previous route logic: look the row up, then update or insert"""
+    data = {**data, "updated_at": datetime.utcnow().isoformat()}
+    existing = supabase.table("user_profile").select("id").eq("user_id", user_id).execute()
+    if existing.data:
+        supabase.table("user_profile").update(data).eq("user_id", user_id).execute()
+    else:
+        supabase.table("user_profile").insert({**data, "user_id": user_id, "full_name": "User"}).execute()
+
+def measure(label: str, write, user_id: str, iterations: int) -> float:
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        write(user_id, {"job_title": f"Benchmark {label} {i}"})
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    median = statistics.median(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{label:<18} median {median:7.1f} ms   p95 {p95:7.1f} ms")
+    return median
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--user-id", default=os.getenv("BENCH_USER_ID"))
+    args = parser.parse_args()
+    if not args.user_id:
+        parser.error("pass --user-id or set BENCH_USER_ID")
+
+    # Warm up connections so the first strategy is not penalised
+    upsert_profile(args.user_id, {"job_title": "Benchmark warmup"})
+
+    legacy = measure("select+write", select_then_write, args.user_id, args.iterations)
+    upsert = measure("upsert", upsert_profile, args.user_id, args.iterations)
+    print(f"upsert / select+write: {upsert / legacy:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Resume render throughput: inline vs. process pool vs. render cache
+
+Renders synthetic resumes with the Modern Professional template schema and
+prints renders/second for
+- inline rendering in the calling process,
+- the render_resume process pool (distinct resumes, so every call renders), and
+- repeat requests for one resume (served from the render cache).
+
+Runs offline; no database or credentials needed.
+
+Usage (from backend/):
+    python benchmarks/render_benchmark.py --renders 200 --format pdf
+"""
+import argparse
+import ast
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from utils import resume_render  # noqa: E402
+
+def template_schema() -> dict:
+    """template_config from seed_template.py, read without importing it (that needs Supabase)"""
+    tree = ast.parse((BACKEND / "seed_template.py").read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "template_config":
+            return ast.literal_eval(node.value)
+    raise RuntimeError("template_config not found in seed_template.py")
+
+def sample_resume(index: int) -> dict:
+    return {
+        "personalInfo": {"firstName": "Bench", "lastName": f"User {index}", "email": "bench@example.com",
+                         "phone": "555-0100", "location": "Remote", "jobTitle": "Software Engineer"},
+        "summary": "Engineer with experience building and operating web platforms. " * 3,
+        "workExperience": [
+            {"id": f"exp-{i}", "title": "Senior Engineer", "company": f"Company {i}", "location": "Remote",
+             "startDate": "2019-01", "endDate": "2022-06", "isCurrent": i == 0,
+             "description": "\n".join(f"• Delivered project {j} that improved reliability and reduced cost" for j in range(5))}
+            for i in range(4)
+        ],
+        "education": [{"id": "edu-0", "school": "State University", "degree": "BSc", "field": "Computer Science",
+                       "startDate": "2010", "endDate": "2014"}],
+        "skills": [{"id": f"s{i}", "name": f"Skill {i}", "category": "Technical"} for i in range(15)],
+        "languages": [{"name": "English", "proficiency": "Native"}, {"name": "Spanish", "proficiency": "Professional"}],
+    }
+
+def report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<22} {count / seconds:8.1f} renders/s  ({seconds * 1000 / count:6.2f} ms each)")
+
+async def run(fmt: str, renders: int) -> None:
+    schema = template_schema()
+    resumes = [sample_resume(i) for i in range(renders)]
+    renderer = resume_render.render_resume_pdf if fmt == "pdf" else resume_render.render_resume_html
+
+    start = time.perf_counter()
+    for resume in resumes:
+        renderer(schema, resume)
+    report("inline", renders, time.perf_counter() - start)
+
+    # Warm the workers so process start-up is not counted
+    await asyncio.gather(*(resume_render.render_resume(fmt, "warmup", schema, sample_resume(-i)) for i in range(1, resume_render.RENDER_WORKERS + 1)))
+    start = time.perf_counter()
+    await asyncio.gather(*(resume_render.render_resume(fmt, "bench", schema, resume) for resume in resumes))
+    report(f"pool ({resume_render.RENDER_WORKERS} workers)", renders, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        await resume_render.render_resume(fmt, "bench", schema, resumes[0])
+    report("cached", renders, time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=100)
+    parser.add_argument("--format", choices=resume_render.RENDER_FORMATS, default="pdf")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.format, args.renders))
+    finally:
+        resume_render.shutdown_render_pool()
+
+if __name__ == "__main__":
+    main()
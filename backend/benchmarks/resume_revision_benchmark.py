@@ -0,0 +1,110 @@
+"""Resume revision storage: snapshot+delta history vs. full copies
+
+Creates a scratch resume for a test user, saves it through a series of small
+edits (the shape autosave produces), then reports
+- bytes stored in resume_revisions vs. keeping a full copy per revision, and
+- load_revision latency for early and late revisions, which should stay flat
+  as the history grows because each rebuild starts from a nearby snapshot.
+
+Usage (from backend/):
+    BENCH_USER_ID=<auth user uuid> python benchmarks/resume_revision_benchmark.py --revisions 200
+
+The scratch resume and its history are deleted at the end.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from supabase_client import supabase  # noqa: E402
+from utils.resume_revisions import load_revision, record_revision  # noqa: E402
+
+def sample_resume() -> dict:
+    return {
+        "personalInfo": {"firstName": "Bench", "lastName": "User", "email": "bench@example.com", "phone": "",
+                         "location": "Remote", "jobTitle": "Software Engineer"},
+        "summary": "Engineer with experience building web platforms. " * 4,
+        "workExperience": [
+            {"id": f"exp-{i}", "title": "Engineer", "company": f"Company {i}", "location": "Remote",
+             "startDate": "2020-01", "endDate": "2022-01", "isCurrent": False,
+             "description": "Built and operated services used by thousands of customers. " * 6}
+            for i in range(5)
+        ],
+        "education": [{"id": "edu-0", "school": "State University", "degree": "BSc", "field": "CS",
+                       "startDate": "2012", "endDate": "2016"}],
+        "skills": [{"id": f"skill-{i}", "name": f"Skill {i}", "category": "Technical"} for i in range(20)],
+        "languages": [{"name": "English", "proficiency": "Native"}],
+    }
+
+def edit(document: dict, step: int) -> dict:
+    """One autosave-sized change"""
+    document = copy.deepcopy(document)
+    choice = step % 4
+    if choice == 0:
+        document["summary"] += f" Update {step}."
+    elif choice == 1:
+        job = random.choice(document["workExperience"])
+        job["description"] = job["description"][:-1] + f" ({step})."
+    elif choice == 2:
+        document["skills"].append({"id": f"skill-x{step}", "name": f"Extra {step}", "category": "Technical"})
+    else:
+        document["personalInfo"]["jobTitle"] = f"Software Engineer {step}"
+    return document
+
+def size(document: dict) -> int:
+    return len(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+def time_restore(resume_id: str, user_id: str, revision: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load_revision(resume_id, user_id, revision)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--revisions", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--user-id", default=os.getenv("BENCH_USER_ID"))
+    args = parser.parse_args()
+    if not args.user_id:
+        parser.error("pass --user-id or set BENCH_USER_ID")
+
+    random.seed(42)
+    document = sample_resume()
+    created = supabase.table("resume_builder_data").insert({
+        "user_id": args.user_id, "template_id": "modern-professional", "title": "Revision benchmark", "resume_data": document
+    }).execute().data[0]
+    resume_id = created["id"]
+
+    try:
+        record_revision(resume_id, args.user_id, created["version"], created["title"], document)
+        full_copy_bytes = size(document)
+        for step in range(1, args.revisions):
+            previous, document = document, edit(document, step)
+            row = supabase.table("resume_builder_data").update({"resume_data": document}).eq("id", resume_id).execute().data[0]
+            record_revision(resume_id, args.user_id, row["version"], row["title"], document, previous=previous)
+            full_copy_bytes += size(document)
+
+        stored = supabase.table("resume_revisions").select("size_bytes").eq("resume_id", resume_id).execute().data
+        stored_bytes = sum(row["size_bytes"] for row in stored)
+        print(f"revisions:        {len(stored)}")
+        print(f"full copies:      {full_copy_bytes:>10,} bytes")
+        print(f"snapshot+delta:   {stored_bytes:>10,} bytes ({stored_bytes / full_copy_bytes:.1%} of full copies)")
+
+        latest = row["version"]
+        for revision in sorted({1, latest // 4, latest // 2, latest - 1, latest} - {0}):
+            print(f"restore r{revision:<6} median {time_restore(resume_id, args.user_id, revision, args.repeats):7.1f} ms")
+    finally:
+        supabase.table("resume_builder_data").delete().eq("id", resume_id).execute()
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,9 @@ from routes.jobs import router as jobs_router
 from routes.ai_extraction import router as ai_extraction_router
 from routes.ai_match import router as ai_match_router
 from routes.subscriptions import router as subscriptions_router
+from routes.statistics import router as statistics_router
+from utils.template_registry import refresh_templates, start_template_listener
+from utils.resume_render import shutdown_render_pool
 import logging
 import threading
 
@@ -158,7 +161,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Credentialed requests ignore the "*" wildcard, so custom headers are listed explicitly
+    expose_headers=["*", "X-Next-Cursor", "ETag"],
     max_age=3600,
 )
 
@@ -173,6 +177,21 @@ app.include_router(jobs_router)
 app.include_router(ai_extraction_router)
 app.include_router(ai_match_router)
 app.include_router(subscriptions_router)
+app.include_router(statistics_router)
+
+@app.on_event("startup")
+def load_template_registry():
+    """Load resume templates into memory before serving; a failure here retries on first use"""
+    try:
+        refresh_templates()
+    except Exception as e:
+        print(f"⚠️ TEMPLATES: Could not load template registry at startup: {str(e)}")
+    start_template_listener()
+
+@app.on_event("shutdown")
+def stop_render_workers():
+    """Stop resume render worker processes with the server"""
+    shutdown_render_pool()
 
 # Rely on CORSMiddleware for preflight handling and headers
 
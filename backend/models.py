@@ -43,6 +43,69 @@ class UpdateJob(BaseModel):
     deadline: Optional[date] = None
     description: Optional[str] = None  # Removed max_length to allow full descriptions
 
+class JobListQuery(BaseModel):
+    """Query parameters accepted by the job list endpoints"""
+    # Without limit or cursor every matching job is returned, as before paging existed
+    limit: Optional[int] = Field(None, ge=1, le=1000)
+    cursor: Optional[str] = None
+    # Comma-separated column names; all job columns when omitted
+    fields: Optional[str] = None
+    status: Optional[List[str]] = None
+    company: Optional[str] = None
+    date_applied_from: Optional[date] = None
+    date_applied_to: Optional[date] = None
+    updated_after: Optional[datetime] = None
+
+class JobChanges(BaseModel):
+    """Delta returned by GET /api/jobs/changes"""
+    upserted: List[Job]
+    deleted: List[UUID]
+    # Pass back as ?since= on the next sync
+    cursor: str
+    has_more: bool
+    # The cursor predates pruned change history: drop local state and treat this
+    # sync (and its has_more pages) as a full one from scratch
+    reset: bool = False
+
+class BulkJobUpdate(UpdateJob):
+    id: UUID
+
+class BulkUpdateJobs(BaseModel):
+    updates: List[BulkJobUpdate] = Field(..., min_length=1, max_length=500)
+
+class BulkJobUpdateResult(BaseModel):
+    id: UUID
+    success: bool
+    job: Optional[Job] = None
+    error: Optional[str] = None
+
+class BulkUpdateJobsResponse(BaseModel):
+    results: List[BulkJobUpdateResult]
+    updated: int
+    failed: int
+
+class JobSearchHit(BaseModel):
+    id: UUID
+    job_title: str
+    company: str
+    location: Optional[str] = None
+    status: str
+    date_applied: Optional[date] = None
+    updated_at: Optional[datetime] = None
+    rank: float
+    # HTML-escaped matched fragments; terms wrapped in <mark></mark> are the only markup
+    headline: Optional[str] = None
+
+class JobSearchResponse(BaseModel):
+    results: List[JobSearchHit]
+    has_more: bool
+    next_offset: Optional[int] = None
+
+class JobSuggestion(BaseModel):
+    value: str
+    # Number of saved jobs using this value
+    uses: int
+
 # Profile-related models
 class Profile(BaseModel):
     id: Optional[UUID]
@@ -134,6 +197,32 @@ class ProfileStats(BaseModel):
     interviews: int
     offers: int
 
+class FunnelStage(BaseModel):
+    status: str
+    count: int
+    # Jobs currently at this stage or any later one
+    reached: int
+    # reached / reached of the previous stage (None for the first stage)
+    conversion_rate: Optional[float] = None
+
+class StageDuration(BaseModel):
+    status: str
+    transitions: int
+    average_days: float
+
+class WeeklyActivity(BaseModel):
+    week_start: date
+    jobs_added: int
+    applications: int
+
+class JobStatistics(BaseModel):
+    total_jobs: int
+    status_counts: Dict[str, int]
+    funnel: List[FunnelStage]
+    time_in_stage: List[StageDuration]
+    weekly: List[WeeklyActivity]
+    average_weekly_applications: float
+
 # Skills models (normalized table)
 class Skill(BaseModel):
     id: Optional[UUID]
@@ -370,6 +459,37 @@ class UpdateLanguage(BaseModel):
     language: Optional[str] = None
     proficiency: Optional[str] = None
 
+# Bulk section models
+class BulkSkills(BaseModel):
+    items: List[CreateSkill] = Field(..., max_length=500)
+
+class BulkExperience(BaseModel):
+    items: List[CreateExperience] = Field(..., max_length=200)
+
+class BulkEducation(BaseModel):
+    items: List[CreateEducation] = Field(..., max_length=200)
+
+class BulkLanguages(BaseModel):
+    items: List[CreateLanguage] = Field(..., max_length=200)
+
+class BulkDelete(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+class FullProfileExperience(CreateExperience):
+    # Existing entries keep their id; entries without one are created
+    id: Optional[UUID] = None
+
+class FullProfileEducation(CreateEducation):
+    id: Optional[UUID] = None
+
+class FullProfileUpdate(BaseModel):
+    """Whole-profile save; a section left as None is not touched, a list replaces it"""
+    profile: Optional[UpdateProfile] = None
+    skills: Optional[List[CreateSkill]] = Field(None, max_length=500)
+    work_experience: Optional[List[FullProfileExperience]] = Field(None, max_length=200)
+    education: Optional[List[FullProfileEducation]] = Field(None, max_length=200)
+    languages: Optional[List[CreateLanguage]] = Field(None, max_length=200)
+
 # Resume models removed - using AI-generated resumes instead
 
 # Resume Builder Data models
@@ -380,6 +500,7 @@ class ResumeBuilderData(BaseModel):
     title: str = "My Resume"
     resume_data: Dict[str, Any]  # JSONB field
     is_current: bool = False
+    version: int = 1  # Bumped by the database on every content change
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -391,12 +512,36 @@ class SaveResumeRequest(BaseModel):
 class UpdateResumeRequest(BaseModel):
     title: Optional[str] = None
     resume_data: Optional[Dict[str, Any]] = None
+    version: Optional[int] = None  # When given, the update fails with 409 if the resume has moved on
+
+class PatchResumeRequest(BaseModel):
+    version: int  # Version the patch was computed against
+    patch: Optional[List[Dict[str, Any]]] = None  # RFC 6902 JSON Patch operations on resume_data
+    merge_patch: Optional[Dict[str, Any]] = None  # RFC 7386 JSON Merge Patch for resume_data
+    title: Optional[str] = None
+
+class ResumeRevision(BaseModel):
+    revision: int
+    kind: str  # "snapshot" or "delta"
+    title: Optional[str] = None
+    size_bytes: int
+    created_at: datetime
+
+class ResumeRevisionDocument(BaseModel):
+    revision: int
+    title: Optional[str] = None
+    resume_data: Dict[str, Any]
+
+class ResumeRevisionDiff(BaseModel):
+    from_revision: int
+    to_revision: int
+    patch: List[Dict[str, Any]]  # RFC 6902 operations turning from_revision into to_revision
 
 class ResumeBuilderItem(BaseModel):
     id: UUID
     template_id: str
     title: str
-    resume_data: Optional[Dict[str, Any]] = None
+    preview: Dict[str, Any] = {}  # Trigger-maintained summary of resume_data
     created_at: datetime
     updated_at: datetime
     is_current: bool
@@ -8,6 +8,8 @@ from uuid import UUID
 from datetime import datetime
 from utils.dependencies import get_current_user
 from utils.job_extraction import extract_job_data_with_ai, check_duplicate_job
+from utils.job_autocomplete import invalidate_job_suggestions
+from utils.embeddings import invalidate_job_embeddings, queue_job_embeddings
 import sys
 from pathlib import Path
 
@@ -94,6 +96,8 @@ async def save_job_direct(request: LinkedInScrapeRequest, user_id: str = Depends
         
         # Save to database
         response = supabase.table("jobs").insert(job_data).execute()
+        invalidate_job_suggestions(user_id)
+        queue_job_embeddings(user_id)
         
         if response.data:
             job_id = response.data[0]["id"]
@@ -191,6 +195,9 @@ async def scrape_linkedin_job(request: LinkedInScrapeRequest, background_tasks:
             "updated_at": datetime.utcnow().isoformat()
         }
         insert_resp = supabase.table("jobs").insert(placeholder_job).execute()
+        invalidate_job_suggestions(user_id)
+        # Embedded once enrichment has filled in the description
+        invalidate_job_embeddings(user_id)
         if not insert_resp.data:
             raise HTTPException(status_code=500, detail="Failed to insert placeholder job")
         job_id = insert_resp.data[0]["id"]
@@ -252,6 +259,8 @@ async def scrape_linkedin_job(request: LinkedInScrapeRequest, background_tasks:
                     "updated_at": datetime.utcnow().isoformat()
                 }
                 supabase.table("jobs").update(update).eq("id", str(job_id_local)).eq("user_id", uid).execute()
+                invalidate_job_suggestions(uid)
+                queue_job_embeddings(uid)
             except Exception as _e:
                 print(f"Background enrichment failed for job {job_id_local}: {_e}")
 
@@ -345,6 +354,9 @@ async def ingest_job_html(request: JobIngestionRequest, background_tasks: Backgr
             "updated_at": datetime.utcnow().isoformat()
         }
         insert_resp = supabase.table("jobs").insert(placeholder_job).execute()
+        invalidate_job_suggestions(user_id)
+        # Embedded once enrichment has filled in the description
+        invalidate_job_embeddings(user_id)
         if not insert_resp.data:
             raise HTTPException(status_code=500, detail="Failed to insert placeholder job")
         job_id = insert_resp.data[0]["id"]
@@ -370,6 +382,8 @@ async def ingest_job_html(request: JobIngestionRequest, background_tasks: Backgr
                     "updated_at": datetime.utcnow().isoformat()
                 }
                 supabase.table("jobs").update(update).eq("id", str(job_id_local)).eq("user_id", uid).execute()
+                invalidate_job_suggestions(uid)
+                queue_job_embeddings(uid)
             except Exception as e:
                 print(f"Background enrichment failed for job {job_id_local}: {e}")
         
@@ -1,12 +1,19 @@
 """AI job match analysis routes"""
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Tuple
 from supabase_client import supabase
 from uuid import UUID
 from utils.dependencies import get_current_user
 from utils.openai_client import get_openai_client
-import json
-import re
+from utils.llm import structured_completion, tokens_used
+from utils.profile_snapshot import load_profile_snapshot
+from utils.ats_scorer import CORPUS_MAX_JOBS, rank_jobs, score_job_match, user_job_corpus
+from utils.cache import TTLCache
+from utils.embeddings import best_fit_jobs, similar_jobs
+from utils.skill_taxonomy import extract_skills, normalize_skill
+import asyncio
+import hashlib
 import sys
 from pathlib import Path
 
@@ -15,78 +22,112 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+# Job columns the scorer and narrative prompts read (never select("*"): it drags in search_vector)
+MATCH_JOB_COLUMNS = "id, job_title, company, location, salary, status, description"
+
+# Taxonomy matches needed before skill extraction skips the LLM
+LOCAL_SKILLS_MINIMUM = 3
+
+# Narratives generated ahead of time by the rank endpoint, keyed by (user_id, job_id)
+NARRATIVE_TTL_SECONDS = 30 * 60
+_narrative_cache = TTLCache(ttl_seconds=NARRATIVE_TTL_SECONDS, max_entries=4096)
+
 class GenerateSkillsRequest(BaseModel):
     description: str
     context: str = "resume"  # "resume" or "job"
+    enrich: bool = False  # also ask the LLM, e.g. for skills outside the taxonomy
 
-@router.post("/api/ai/job-match/{job_id}")
-async def analyze_job_match(job_id: UUID, user_id: str = Depends(get_current_user)):
-    """Analyze how well user's profile matches the job requirements"""
-    try:
-        # Get job details
-        job_response = supabase.table("jobs").select("*").eq("id", str(job_id)).eq("user_id", user_id).single().execute()
-        if not job_response.data:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
-        job = job_response.data
-        job_description = job.get("description", "") or ""
-        job_title = job.get("job_title", "")
-        company = job.get("company", "")
-        location = job.get("location", "")
-        salary = job.get("salary", "")
-        
-        # Check if job description is meaningful (more than just a few words or common non-descriptive text)
-        job_desc_cleaned = job_description.strip().lower()
-        minimal_descriptions = ["haha", "test", "n/a", "na", "none", "tbd", "tba", ""]
-        is_minimal_description = (
-            len(job_desc_cleaned) < 50 or 
-            job_desc_cleaned in minimal_descriptions or
-            len(job_desc_cleaned.split()) < 10
-        )
-        
-        # Get user profile data
-        profile_response = supabase.table("user_profile").select("*").eq("user_id", user_id).execute()
-        profile = profile_response.data[0] if profile_response.data else {}
-        
-        # Get user skills
-        skills_response = supabase.table("user_skills").select("*").eq("user_id", user_id).execute()
-        user_skills = [s.get("name", "") for s in (skills_response.data or [])]
-        
-        # Get work experience
-        experience_response = supabase.table("user_work_experience").select("*").eq("user_id", user_id).execute()
-        work_experience = experience_response.data or []
-        
-        # Get education
-        education_response = supabase.table("user_education").select("*").eq("user_id", user_id).execute()
-        education = education_response.data or []
-        
-        # Prepare detailed work experience summary
-        work_exp_details = []
-        for exp in work_experience[:5]:
-            exp_text = f"- {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')}"
-            if exp.get('start_date'):
-                exp_text += f" ({exp.get('start_date')}"
-                if exp.get('end_date'):
-                    exp_text += f" - {exp.get('end_date')}"
-                elif exp.get('is_current'):
-                    exp_text += " - Present"
-                exp_text += ")"
-            if exp.get('description'):
-                exp_text += f"\n  Description: {exp.get('description', '')[:300]}"
-            work_exp_details.append(exp_text)
-        
-        # Prepare detailed education summary
-        education_details = []
-        for edu in education[:3]:
-            edu_text = f"- {edu.get('degree', 'N/A')}"
-            if edu.get('school'):
-                edu_text += f" from {edu.get('school', 'N/A')}"
-            if edu.get('start_date') or edu.get('end_date'):
-                edu_text += f" ({edu.get('start_date', '')} - {edu.get('end_date', '')})"
-            education_details.append(edu_text)
-        
-        # Prepare user profile summary
-        user_profile_summary = f"""
+class JobMatchRankRequest(BaseModel):
+    statuses: Optional[List[str]] = None  # only rank jobs in these statuses
+    limit: int = Field(default=50, ge=1, le=CORPUS_MAX_JOBS)
+    narrate_top: int = Field(default=0, ge=0, le=5)  # queue LLM narratives for the N best matches
+
+class RankedJobMatch(BaseModel):
+    job_id: str
+    job_title: Optional[str] = None
+    company: Optional[str] = None
+    status: Optional[str] = None
+    matchScore: int
+    coverage: float
+    weightedMatch: float
+    titleMatch: float
+    matchedSkills: List[str]
+    missingSkills: List[str]
+    narrative: Optional[str] = None  # "ready", "queued", or None when not requested
+
+class SimilarJob(BaseModel):
+    id: str
+    job_title: Optional[str] = None
+    company: Optional[str] = None
+    status: Optional[str] = None
+    similarity: float  # cosine similarity of the embeddings, -1 to 1
+
+# Structured-output schemas for the AI responses below
+class JobMatchNarrative(BaseModel):
+    strengths: List[str] = Field(description="3-5 specific strengths referencing the job description")
+    improvements: List[str] = Field(description="3-5 actionable recommendations referencing the job description")
+
+class ResumeKeywords(BaseModel):
+    keywords: List[str]
+
+class GeneratedSkills(BaseModel):
+    skills: List[str]
+
+def _clean_terms(terms: List[str]) -> List[str]:
+    """Strip blanks and remove duplicates while preserving order"""
+    cleaned = [str(t).strip() for t in terms if t and str(t).strip()]
+    return list(dict.fromkeys(cleaned))
+
+def _merge_skills(local: List[str], generated: List[str]) -> List[str]:
+    """Taxonomy matches first, then LLM suggestions in canonical spelling"""
+    return _clean_terms(local + [normalize_skill(term) for term in generated])
+
+def _is_minimal_description(job_description: str) -> bool:
+    """True when the description is too short or generic to analyze"""
+    job_desc_cleaned = job_description.strip().lower()
+    minimal_descriptions = ["haha", "test", "n/a", "na", "none", "tbd", "tba", ""]
+    return (
+        len(job_desc_cleaned) < 50 or 
+        job_desc_cleaned in minimal_descriptions or
+        len(job_desc_cleaned.split()) < 10
+    )
+
+def _profile_titles(snapshot: Dict[str, Any]) -> List[str]:
+    profile = snapshot["profile"] or {}
+    return [profile.get("job_title") or ""] + [exp.get("title") or "" for exp in snapshot["work_experience"]]
+
+def _profile_summary(snapshot: Dict[str, Any]) -> str:
+    profile = snapshot["profile"] or {}
+    user_skills = [s.get("name", "") for s in snapshot["skills"]]
+    work_experience = snapshot["work_experience"]
+    education = snapshot["education"]
+    
+    # Prepare detailed work experience summary
+    work_exp_details = []
+    for exp in work_experience[:5]:
+        exp_text = f"- {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')}"
+        if exp.get('start_date'):
+            exp_text += f" ({exp.get('start_date')}"
+            if exp.get('end_date'):
+                exp_text += f" - {exp.get('end_date')}"
+            elif exp.get('is_current'):
+                exp_text += " - Present"
+            exp_text += ")"
+        if exp.get('description'):
+            exp_text += f"\n  Description: {exp.get('description', '')[:300]}"
+        work_exp_details.append(exp_text)
+    
+    # Prepare detailed education summary
+    education_details = []
+    for edu in education[:3]:
+        edu_text = f"- {edu.get('degree', 'N/A')}"
+        if edu.get('school'):
+            edu_text += f" from {edu.get('school', 'N/A')}"
+        if edu.get('start_date') or edu.get('end_date'):
+            edu_text += f" ({edu.get('start_date', '')} - {edu.get('end_date', '')})"
+        education_details.append(edu_text)
+    
+    return f"""
         User Profile:
         - Name: {profile.get('full_name', 'N/A')}
         - Current Role: {profile.get('job_title', 'N/A')}
@@ -100,35 +141,18 @@ async def analyze_job_match(job_id: UUID, user_id: str = Depends(get_current_use
         Education ({len(education)} entries):
         {chr(10).join(education_details) if education_details else 'No education listed'}
         """
-        
-        # Handle minimal job descriptions
-        if is_minimal_description:
-            return {
-                "matchScore": 0,
-                "strengths": [
-                    "Unable to analyze match - job description is too minimal",
-                    "Please add a detailed job description to get accurate match analysis"
-                ],
-                "improvements": [
-                    "Add a complete job description with requirements, skills, and responsibilities",
-                    "Include details about required experience and qualifications",
-                    "Add information about job duties and responsibilities"
-                ],
-                "missingSkills": [],
-                "matchedSkills": []
-            }
-        
-        # Use OpenAI to analyze match
-        client = get_openai_client()
-        
-        # Use full job description (up to 8000 chars to capture complete job posting)
-        job_desc_text = job_description[:8000]
-        
-        prompt = f"""You are an expert career counselor and job matching analyst. Your task is to analyze how well a candidate's profile matches a specific job posting.
+
+def _narrative_prompt(job: Dict[str, Any], user_profile_summary: str, ats: Dict[str, Any]) -> str:
+    location = job.get("location", "")
+    salary = job.get("salary", "")
+    # Use full job description (up to 8000 chars to capture complete job posting)
+    job_desc_text = (job.get("description") or "")[:8000]
+    
+    return f"""You are an expert career counselor and job matching analyst. A keyword scorer has already compared the candidate's profile with a job posting; your task is to explain the match.
 
 JOB POSTING DETAILS:
-- Job Title: {job_title}
-- Company: {company}
+- Job Title: {job.get("job_title", "")}
+- Company: {job.get("company", "")}
 - Location: {location if location else 'Not specified'}
 - Salary: {salary if salary else 'Not specified'}
 
@@ -138,76 +162,221 @@ FULL JOB DESCRIPTION AND REQUIREMENTS:
 CANDIDATE PROFILE:
 {user_profile_summary}
 
+KEYWORD MATCH (already computed, do not recompute):
+- Match score: {ats["matchScore"]}/100
+- Skills from the posting the candidate has: {', '.join(ats["matchedSkills"]) or 'None'}
+- Skills from the posting the candidate lacks: {', '.join(ats["missingSkills"]) or 'None'}
+
 ANALYSIS INSTRUCTIONS:
-1. Carefully read the ENTIRE job description above, paying special attention to:
-   - Required skills and technologies
-   - Required experience and qualifications
-   - Education requirements
-   - Job responsibilities and duties
-   - Preferred qualifications
-   - Any specific requirements mentioned
-
-2. Compare the candidate's profile against these requirements:
-   - Match their skills against required skills mentioned in the job description
-   - Compare their work experience against required experience mentioned in the job description
-   - Check if their education meets the requirements mentioned in the job description
-   - Identify gaps and strengths based on what's ACTUALLY mentioned in the job description
-
-3. Provide a detailed analysis in JSON format with this exact structure:
-{{
-    "matchScore": <number between 0-100, where 100 is perfect match>,
-    "strengths": [<array of 3-5 specific strengths where candidate matches well, be SPECIFIC about what from the job description they match - quote or reference actual requirements>],
-    "improvements": [<array of 3-5 actionable recommendations based on what's ACTUALLY missing from the job description - reference specific requirements>],
-    "missingSkills": [<array of specific skills/technologies that are EXPLICITLY mentioned in the job description but NOT in the candidate's profile>],
-    "matchedSkills": [<array of skills/technologies that are EXPLICITLY mentioned in the job description AND ARE in the candidate's profile>]
-}}
+1. Read the ENTIRE job description, paying attention to required experience, education, responsibilities and preferred qualifications.
+2. Compare the candidate's work experience and education against those requirements, using the keyword match above for skills.
+3. Provide:
+   - "strengths": 3-5 specific strengths where the candidate matches well - quote or reference actual requirements
+   - "improvements": 3-5 actionable recommendations based on what is ACTUALLY missing from the profile - reference specific requirements
 
 CRITICAL REQUIREMENTS:
 - Base your analysis STRICTLY and ONLY on what is actually written in the job description above
 - Do NOT make assumptions or add requirements that are not in the job description
-- Be specific - quote or reference actual text from the job description when possible
-- If a skill or requirement is not mentioned in the job description, do NOT include it in missingSkills
-- Only include skills in matchedSkills if they are explicitly mentioned in the job description AND in the candidate's profile
-- Return ONLY valid JSON, no other text or markdown formatting"""
+- Respond with the JSON object described above"""
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+def _cached_narrative(user_id: str, job_id: str, prompt: str) -> Optional[Tuple[List[str], List[str]]]:
+    """A narrative generated for exactly this prompt, if one is cached"""
+    cached = _narrative_cache.get((user_id, job_id))
+    if cached is not None and cached[0] == _prompt_key(prompt):
+        return cached[1]
+    return None
+
+def _generate_narrative(user_id: str, job_id: str, prompt: str) -> Tuple[List[str], List[str]]:
+    """(strengths, improvements) from the LLM; cached and logged as an AI event"""
+    client = get_openai_client()
+    parsed, response = structured_completion(
+        client,
+        JobMatchNarrative,
+        messages=[
+            {"role": "system", "content": "You are an expert career counselor and job matching analyst. You analyze job postings in detail and compare them against candidate profiles."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=1000,
+        temperature=0.3
+    )
+    narrative = (_clean_terms(parsed.strengths), _clean_terms(parsed.improvements))
+    _narrative_cache.set((user_id, job_id), (_prompt_key(prompt), narrative))
+    
+    # Log AI event
+    try:
+        supabase.table("ai_events").insert({
+            "user_id": user_id,
+            "event_type": "job_match_analysis",
+            "model": "gpt-4o-mini",
+            "tokens_used": tokens_used(response),
+            "metadata": {"job_id": job_id}
+        }).execute()
+    except Exception as e:
+        print(f"Warning: Could not log AI event: {str(e)}")
+    return narrative
+
+def _generate_narratives(user_id: str, prompts: List[Tuple[str, str]]) -> None:
+    """Background task: fill the narrative cache for the given (job_id, prompt) pairs"""
+    for job_id, prompt in prompts:
+        try:
+            _generate_narrative(user_id, job_id, prompt)
+        except Exception as e:
+            print(f"Background job match narrative failed for job {job_id}: {str(e)}")
+
+@router.post("/api/ai/job-match/rank", response_model=List[RankedJobMatch])
+async def rank_job_matches(
+    request: JobMatchRankRequest,
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user)
+):
+    """Rank the user's saved jobs by keyword match against their profile"""
+    try:
+        # Every saved job is scored so the IDF weights match the single-job endpoint
+        jobs_response = supabase.table("jobs")\
+            .select(MATCH_JOB_COLUMNS)\
+            .eq("user_id", user_id)\
+            .order("created_at", desc=True)\
+            .limit(CORPUS_MAX_JOBS)\
+            .execute()
+        jobs = jobs_response.data or []
+        if not jobs:
+            return []
+        
+        snapshot = load_profile_snapshot(user_id)
+        user_skills = [s.get("name", "") for s in snapshot["skills"]]
+        # NumPy scoring of every saved job is CPU-bound; keep it off the event loop
+        ranked = await asyncio.to_thread(rank_jobs, jobs, user_skills, _profile_titles(snapshot))
+        
+        jobs_by_id = {str(job["id"]): job for job in jobs}
+        if request.statuses:
+            ranked = [match for match in ranked if jobs_by_id[match["job_id"]].get("status") in request.statuses]
+        ranked = ranked[:request.limit]
+        
+        results = []
+        queued: List[Tuple[str, str]] = []
+        user_profile_summary = _profile_summary(snapshot) if request.narrate_top else ""
+        for position, match in enumerate(ranked):
+            job = jobs_by_id[match["job_id"]]
+            narrative = None
+            if position < request.narrate_top and not _is_minimal_description(job.get("description") or ""):
+                prompt = _narrative_prompt(job, user_profile_summary, match)
+                if _cached_narrative(user_id, match["job_id"], prompt) is not None:
+                    narrative = "ready"
+                else:
+                    narrative = "queued"
+                    queued.append((match["job_id"], prompt))
+            results.append(RankedJobMatch(
+                job_title=job.get("job_title"),
+                company=job.get("company"),
+                status=job.get("status"),
+                narrative=narrative,
+                **match
+            ))
+        
+        if queued:
+            background_tasks.add_task(_generate_narratives, user_id, queued)
+        print(f"🎯 JOB MATCH: Ranked {len(jobs)} jobs, queued {len(queued)} narrative(s)")
+        return results
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert career counselor and job matching analyst. You analyze job postings in detail and compare them against candidate profiles. Always return only valid JSON without any markdown formatting or additional text."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error ranking job matches: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to rank job matches: {str(e)}")
+
+@router.get("/api/ai/job-match/best-fit", response_model=List[SimilarJob])
+async def get_best_fit_jobs(limit: int = Query(10, ge=1, le=50), user_id: str = Depends(get_current_user)):
+    """Saved jobs whose descriptions are semantically closest to the user's profile"""
+    try:
+        snapshot = load_profile_snapshot(user_id)
+        return best_fit_jobs(user_id, snapshot, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error finding best fit jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to find best fit jobs: {str(e)}")
+
+@router.get("/api/ai/job-match/{job_id}/similar", response_model=List[SimilarJob])
+async def get_similar_jobs(job_id: UUID, limit: int = Query(10, ge=1, le=50), user_id: str = Depends(get_current_user)):
+    """Saved jobs most similar to one of the user's saved jobs"""
+    try:
+        matches = similar_jobs(user_id, str(job_id), limit)
+        if matches is None:
+            raise HTTPException(status_code=404, detail="Job not found or has no description to compare")
+        return matches
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error finding similar jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to find similar jobs: {str(e)}")
+
+@router.post("/api/ai/job-match/{job_id}")
+async def analyze_job_match(job_id: UUID, user_id: str = Depends(get_current_user)):
+    """Analyze how well user's profile matches the job requirements"""
+    try:
+        # Get job details
+        job_response = supabase.table("jobs").select(MATCH_JOB_COLUMNS).eq("id", str(job_id)).eq("user_id", user_id).single().execute()
+        if not job_response.data:
+            raise HTTPException(status_code=404, detail="Job not found")
         
-        content = response.choices[0].message.content.strip()
+        job = job_response.data
+        job_description = job.get("description", "") or ""
         
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            analysis = json.loads(json_match.group())
-        else:
-            # Fallback if JSON parsing fails
-            analysis = {
-                "matchScore": 50,
-                "strengths": ["Profile analysis in progress"],
-                "improvements": ["Complete your profile for better analysis"],
+        # Handle minimal job descriptions
+        if _is_minimal_description(job_description):
+            return {
+                "matchScore": 0,
+                "strengths": [
+                    "Unable to analyze match - job description is too minimal",
+                    "Please add a detailed job description to get accurate match analysis"
+                ],
+                "improvements": [
+                    "Add a complete job description with requirements, skills, and responsibilities",
+                    "Include details about required experience and qualifications",
+                    "Add information about job duties and responsibilities"
+                ],
                 "missingSkills": [],
                 "matchedSkills": []
             }
         
-        # Log AI event
-        try:
-            supabase.table("ai_events").insert({
-                "user_id": user_id,
-                "event_type": "job_match_analysis",
-                "model": "gpt-4o-mini",
-                "tokens_used": getattr(response.usage, 'total_tokens', 0) if hasattr(response, 'usage') else 0,
-                "metadata": {"job_id": str(job_id)}
-            }).execute()
-        except Exception as e:
-            print(f"Warning: Could not log AI event: {str(e)}")
+        # Get user profile, skills, work experience and education in one round trip
+        snapshot = load_profile_snapshot(user_id)
+        user_skills = [s.get("name", "") for s in snapshot["skills"]]
+        
+        # Score, matched and missing skills come from the local keyword scorer
+        doc_count, document_frequency = await asyncio.to_thread(user_job_corpus, user_id, user_skills)
+        ats = score_job_match(job.get("job_title", ""), job_description, user_skills, _profile_titles(snapshot), doc_count, document_frequency)
+        analysis = {
+            "matchScore": ats["matchScore"],
+            "strengths": [],
+            "improvements": [],
+            "missingSkills": ats["missingSkills"],
+            "matchedSkills": ats["matchedSkills"],
+            "coverage": ats["coverage"],
+            "weightedMatch": ats["weightedMatch"],
+        }
         
+        # Use OpenAI only for the narrative around the computed match
+        prompt = _narrative_prompt(job, _profile_summary(snapshot), ats)
+        narrative = _cached_narrative(user_id, str(job_id), prompt)
+        if narrative is None:
+            try:
+                narrative = _generate_narrative(user_id, str(job_id), prompt)
+            except Exception as e:
+                # The computed match stands on its own; describe it without the narrative
+                print(f"Warning: Job match narrative failed, returning keyword match only: {str(e)}")
+                # Flag the keyword-only fallback so clients can say the AI analysis is missing
+                analysis["narrativeError"] = e.detail if isinstance(e, HTTPException) else "AI analysis is unavailable right now"
+                if ats["matchedSkills"]:
+                    analysis["strengths"] = [f"Matches {len(ats['matchedSkills'])} of the skills this job asks for: {', '.join(ats['matchedSkills'][:8])}"]
+                if ats["missingSkills"]:
+                    analysis["improvements"] = [f"Add experience with {skill} if you have it" for skill in ats["missingSkills"][:5]]
+                return analysis
+        
+        analysis["strengths"], analysis["improvements"] = narrative
         return analysis
         
     except HTTPException:
@@ -217,11 +386,11 @@ CRITICAL REQUIREMENTS:
         raise HTTPException(status_code=500, detail=f"Failed to analyze job match: {str(e)}")
 
 @router.post("/api/ai/extract-resume-keywords/{job_id}")
-async def extract_resume_keywords(job_id: UUID, user_id: str = Depends(get_current_user)):
-    """Extract resume-relevant keywords from job description using AI"""
+async def extract_resume_keywords(job_id: UUID, enrich: bool = False, user_id: str = Depends(get_current_user)):
+    """Extract resume-relevant keywords from job description, using AI only when the taxonomy falls short"""
     try:
         # Get job details
-        job_response = supabase.table("jobs").select("*").eq("id", str(job_id)).eq("user_id", user_id).single().execute()
+        job_response = supabase.table("jobs").select(MATCH_JOB_COLUMNS).eq("id", str(job_id)).eq("user_id", user_id).single().execute()
         if not job_response.data:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -234,6 +403,15 @@ async def extract_resume_keywords(job_id: UUID, user_id: str = Depends(get_curre
                 "message": "Job description is too short to extract meaningful keywords"
             }
         
+        # The skill taxonomy covers the common case without an API call
+        local_keywords = extract_skills(job_description, include_soft_skills=False, limit=30)
+        if len(local_keywords) >= LOCAL_SKILLS_MINIMUM and not enrich:
+            return {
+                "keywords": local_keywords,
+                "message": "Keywords extracted successfully",
+                "source": "taxonomy"
+            }
+        
         # Use OpenAI to extract resume-relevant keywords
         client = get_openai_client()
         
@@ -258,45 +436,26 @@ INSTRUCTIONS:
    - Software and applications (e.g., "Figma", "Tableau", "Salesforce")
 4. DO NOT include generic terms like "communication", "teamwork" unless they are specifically mentioned as required technical competencies
 5. Prioritize specific technical terms over generic ones
-6. Return a JSON array of skills (strings only, no duplicates)
+6. Return the skills in the "keywords" array (strings only, no duplicates)
 7. Limit to 30 most important skills
 8. Format each skill in a professional, resume-appropriate way (e.g., "React.js" not "react" or "REACT", "Node.js" not "node")
 
-Return ONLY a valid JSON array, no other text or markdown formatting. Example format:
+Example "keywords" value:
 ["JavaScript", "React", "Node.js", "AWS", "PostgreSQL", "Docker", "Agile", "REST APIs"]"""
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        parsed, response = structured_completion(
+            client,
+            ResumeKeywords,
             messages=[
-                {"role": "system", "content": "You are an expert resume writer and career advisor. Extract resume-relevant keywords from job descriptions. Always return only valid JSON arrays without any markdown formatting or additional text."},
+                {"role": "system", "content": "You are an expert resume writer and career advisor. Extract resume-relevant keywords from job descriptions."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=1000,
             temperature=0.3
         )
         
-        content = response.choices[0].message.content.strip()
-        print(f"OpenAI response content: {content[:200]}...")  # Log first 200 chars
-        
-        # Extract JSON array from response
-        json_match = re.search(r'\[.*\]', content, re.DOTALL)
-        if json_match:
-            try:
-                keywords = json.loads(json_match.group())
-                # Ensure it's a list and clean up
-                if isinstance(keywords, list):
-                    keywords = [str(k).strip() for k in keywords if k and str(k).strip()]
-                    keywords = list(dict.fromkeys(keywords))  # Remove duplicates while preserving order
-                    print(f"Extracted {len(keywords)} keywords: {keywords[:5]}...")  # Log first 5
-                else:
-                    keywords = []
-                    print("Warning: OpenAI returned non-list response")
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error: {e}")
-                keywords = []
-        else:
-            print("Warning: No JSON array found in OpenAI response")
-            keywords = []
+        keywords = _merge_skills(local_keywords, parsed.keywords)
+        print(f"Extracted {len(keywords)} keywords: {keywords[:5]}...")  # Log first 5
         
         # Log AI event
         try:
@@ -304,7 +463,7 @@ Return ONLY a valid JSON array, no other text or markdown formatting. Example fo
                 "user_id": user_id,
                 "event_type": "resume_keyword_extraction",
                 "model": "gpt-4o-mini",
-                "tokens_used": getattr(response.usage, 'total_tokens', 0) if hasattr(response, 'usage') else 0,
+                "tokens_used": tokens_used(response),
                 "metadata": {"job_id": str(job_id)}
             }).execute()
         except Exception as e:
@@ -312,7 +471,8 @@ Return ONLY a valid JSON array, no other text or markdown formatting. Example fo
         
         return {
             "keywords": keywords[:30],  # Limit to 30
-            "message": "Keywords extracted successfully"
+            "message": "Keywords extracted successfully",
+            "source": "taxonomy+ai"
         }
         
     except HTTPException:
@@ -331,6 +491,15 @@ async def generate_skills_from_description(
         if not request.description or len(request.description.strip()) < 20:
             raise HTTPException(status_code=400, detail="Description must be at least 20 characters")
         
+        # The skill taxonomy covers the common case without an API call
+        local_skills = extract_skills(request.description, include_soft_skills=False, limit=40)
+        if len(local_skills) >= LOCAL_SKILLS_MINIMUM and not request.enrich:
+            return {
+                "skills": local_skills,
+                "message": f"Successfully generated {len(local_skills)} skills",
+                "source": "taxonomy"
+            }
+        
         # Use OpenAI to extract skills from description
         client = get_openai_client()
         
@@ -361,46 +530,27 @@ INSTRUCTIONS:
    - Soft skills ONLY if they are technical competencies (e.g., "Project Management", "Technical Writing")
 3. DO NOT include generic soft skills like "communication", "teamwork", "leadership" unless specifically mentioned as technical competencies
 4. Prioritize specific technical terms over generic ones
-5. Return a JSON array of skills (strings only, no duplicates)
+5. Return the skills in the "skills" array (strings only, no duplicates)
 6. Limit to 40 most important skills
 7. Format each skill in a professional, resume-appropriate way (e.g., "React.js" not "react" or "REACT", "Node.js" not "node")
 8. Include both explicit skills mentioned AND skills that can be inferred from the description
 
-Return ONLY a valid JSON array, no other text or markdown formatting. Example format:
+Example "skills" value:
 ["JavaScript", "React", "Node.js", "AWS", "PostgreSQL", "Docker", "Agile", "REST APIs", "Git", "TypeScript"]"""
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        parsed, response = structured_completion(
+            client,
+            GeneratedSkills,
             messages=[
-                {"role": "system", "content": "You are an expert resume writer and career advisor. Extract relevant skills from descriptions. Always return only valid JSON arrays without any markdown formatting or additional text."},
+                {"role": "system", "content": "You are an expert resume writer and career advisor. Extract relevant skills from descriptions."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=1500,
             temperature=0.3
         )
         
-        content = response.choices[0].message.content.strip()
-        print(f"AI Skills Generation response: {content[:200]}...")
-        
-        # Extract JSON array from response
-        json_match = re.search(r'\[.*\]', content, re.DOTALL)
-        if json_match:
-            try:
-                skills = json.loads(json_match.group())
-                # Ensure it's a list and clean up
-                if isinstance(skills, list):
-                    skills = [str(s).strip() for s in skills if s and str(s).strip()]
-                    skills = list(dict.fromkeys(skills))  # Remove duplicates while preserving order
-                    print(f"Generated {len(skills)} skills: {skills[:10]}...")
-                else:
-                    skills = []
-                    print("Warning: OpenAI returned non-list response")
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error: {e}")
-                skills = []
-        else:
-            print("Warning: No JSON array found in OpenAI response")
-            skills = []
+        skills = _merge_skills(local_skills, parsed.skills)
+        print(f"Generated {len(skills)} skills: {skills[:10]}...")
         
         # Log AI event
         try:
@@ -408,7 +558,7 @@ Return ONLY a valid JSON array, no other text or markdown formatting. Example fo
                 "user_id": user_id,
                 "event_type": "skill_generation",
                 "model": "gpt-4o-mini",
-                "tokens_used": getattr(response.usage, 'total_tokens', 0) if hasattr(response, 'usage') else 0,
+                "tokens_used": tokens_used(response),
                 "metadata": {"context": request.context, "description_length": len(request.description)}
             }).execute()
         except Exception as e:
@@ -416,7 +566,8 @@ Return ONLY a valid JSON array, no other text or markdown formatting. Example fo
         
         return {
             "skills": skills[:40],  # Limit to 40
-            "message": f"Successfully generated {len(skills)} skills"
+            "message": f"Successfully generated {len(skills)} skills",
+            "source": "taxonomy+ai"
         }
         
     except HTTPException:
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Awaitable, AsyncIterator
+import asyncio
 import openai
 import os
 import sys
@@ -14,7 +15,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from supabase_client import supabase
-from models import ResumeBuilderData, SaveResumeRequest, UpdateResumeRequest, ResumeBuilderItem, SaveResumeResponse
+from models import ResumeBuilderData, SaveResumeRequest, UpdateResumeRequest, PatchResumeRequest, ResumeBuilderItem, SaveResumeResponse, ResumeRevision, ResumeRevisionDocument, ResumeRevisionDiff
+from utils.openai_client import get_async_openai_client
+from utils.sse import sse_event, sse_response
+from utils.etag import ETAG_CACHE_CONTROL, etag_matches
+from utils.template_registry import template_list, find_template, template_slug
+from utils.json_patch import JsonPatchError, apply_json_patch, apply_merge_patch, create_json_patch
+from utils.resume_revisions import record_revision, list_revisions, load_revision
+from utils.resume_render import render_key, render_resume
+from utils.profile_snapshot import load_profile_snapshot
 
 router = APIRouter()
 
@@ -167,45 +176,46 @@ def get_openai_client():
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
     return openai.OpenAI(api_key=api_key)
 
-def generate_professional_summary(personal_info: PersonalInfo, work_experience: List[WorkExperience], 
-                                education: List[Education], skills: List[Skill]) -> str:
-    """Generate a professional summary using AI"""
-    client = get_openai_client()
-    
+BULLET_SYMBOLS = r'[\u2022\u2023\u25E6\u2043\u2219•]'
+MAX_TAILORED_BULLETS = 3
+
+def _summary_messages(personal_info: PersonalInfo, work_experience: List[WorkExperience],
+                      education: List[Education], skills: List[Skill]) -> List[Dict[str, str]]:
+    """Build the chat messages for a professional summary"""
     # Prepare context for AI
     experience_text = ""
     for exp in work_experience:
         experience_text += f"- {exp.title} at {exp.company} ({exp.startDate} - {exp.endDate if not exp.isCurrent else 'Present'})\n"
         if exp.description:
             experience_text += f"  {exp.description}\n"
-    
+
     education_text = ""
     for edu in education:
         if edu.field:
             education_text += f"- {edu.degree} in {edu.field} from {edu.school}\n"
         else:
             education_text += f"- {edu.degree} from {edu.school}\n"
-    
+
     skills_text = ", ".join([skill.name for skill in skills])
-    
+
     prompt = f"""
     Create a compelling professional summary for a resume based on the following information:
-    
+
     Name: {personal_info.firstName} {personal_info.lastName}
     Job Title: {personal_info.jobTitle or 'Professional'}
-    
+
     Work Experience:
     {experience_text}
-    
+
     Education:
     {education_text}
-    
+
     Skills: {skills_text}
-    
+
     Write a concise 2-sentence professional summary that:
     1. Highlights your most relevant experience and key achievements that align with the job description (first sentence)
     2. Shows your top skills and value proposition that match the job requirements (second sentence)
-    
+
     Requirements:
     - Maximum 2 sentences
     - Each sentence should be clear and impactful
@@ -214,130 +224,237 @@ def generate_professional_summary(personal_info: PersonalInfo, work_experience:
     - Keep total length under 150 words
     - Do not exceed 2 sentences under any circumstances
     - If job description is provided, tailor the summary to match the specific requirements and terminology used in the job posting
-    
+
     Keep it concise, professional, and impactful.
     """
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer. Create concise professional summaries that are exactly 2 sentences long. Be direct and impactful."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=120,
-            temperature=0.7
-        )
-        
-        summary = response.choices[0].message.content.strip()
-        # Remove any asterisks from summary
-        summary = re.sub(r'[\*\u2022\u2023\u25E6\u2043\u2219•]', '', summary)
-        return summary
-    except Exception as e:
-        print(f"Error generating summary: {str(e)}")
-        return f"Experienced {personal_info.jobTitle or 'professional'} with expertise in {', '.join([skill.name for skill in skills[:3]])}."
 
-def enhance_work_experience(work_experience: List[WorkExperience]) -> List[WorkExperience]:
-    """Enhance work experience descriptions using AI"""
-    client = get_openai_client()
-    enhanced_experience = []
-    
-    for exp in work_experience:
-        if not exp.description or len(exp.description.strip()) < 20:
-            # Generate description if missing or too short
-            prompt = f"""
+    return [
+        {"role": "system", "content": "You are an expert resume writer. Create concise professional summaries that are exactly 2 sentences long. Be direct and impactful."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _clean_summary(summary: str) -> str:
+    """Remove any asterisks or bullet symbols from a generated summary"""
+    return re.sub(r'[\*\u2022\u2023\u25E6\u2043\u2219•]', '', summary.strip())
+
+def _fallback_summary(personal_info: PersonalInfo, skills: List[Skill]) -> str:
+    return f"Experienced {personal_info.jobTitle or 'professional'} with expertise in {', '.join([skill.name for skill in skills[:3]])}."
+
+def _clean_description(description: str, strip_numbering: bool = False) -> str:
+    """Remove asterisks, bullet symbols and leading dashes line by line"""
+    # Remove ALL asterisks completely - no asterisks should remain
+    description = re.sub(r'\*', '', description)
+    # Remove bullet symbols
+    description = re.sub(BULLET_SYMBOLS, '', description)
+    # Remove leading dashes
+    description = re.sub(r'^\s*[-]\s*', '', description, flags=re.MULTILINE)
+    # Split by newlines and clean each line thoroughly
+    cleaned_lines = []
+    for line in description.split('\n'):
+        cleaned = line.strip()
+        cleaned = re.sub(r'\*', '', cleaned)
+        cleaned = re.sub(BULLET_SYMBOLS, '', cleaned)
+        cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
+        if strip_numbering:
+            # Remove numbered prefixes (1., 2., 3., etc.)
+            cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
+        if cleaned:
+            cleaned_lines.append(cleaned)
+    return '\n'.join(cleaned_lines)
+
+def _needs_enhancement(exp: WorkExperience) -> bool:
+    return not exp.description or len(exp.description.strip()) < 20
+
+def _enhance_messages(exp: WorkExperience) -> List[Dict[str, str]]:
+    """Build the chat messages that write a missing or too-short job description"""
+    prompt = f"""
             Create a professional job description.
-            
+
             Job Title: {exp.title}
             Company: {exp.company}
             Duration: {exp.startDate} - {exp.endDate if not exp.isCurrent else 'Present'}
             Current Description: {exp.description or 'No description provided'}
-            
+
             Write 3-4 sentences that:
             1. Use strong action verbs
             2. Highlight skills and responsibilities
             3. Show impact and results (if mentioned in current description)
             4. Use professional terminology
             5. Sound professional and compelling
-            
+
             CRITICAL: Do NOT use asterisks (*), bullet symbols (•), or dashes (-) at the start of lines. Write as plain text sentences separated by newlines.
             """
-            
-            system_message = "You are an expert resume writer. Create compelling job descriptions."
-            
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7
-                )
-                
-                enhanced_description = response.choices[0].message.content.strip()
-                # Remove ALL asterisks completely - no asterisks should remain
-                enhanced_description = re.sub(r'\*', '', enhanced_description)  # Remove all asterisks first
-                # Remove bullet symbols
-                enhanced_description = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', enhanced_description)
-                # Remove leading dashes
-                enhanced_description = re.sub(r'^\s*[-]\s*', '', enhanced_description, flags=re.MULTILINE)
-                # Split by newlines and clean each line thoroughly
-                lines = enhanced_description.split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    cleaned = line.strip()
-                    # Remove any remaining asterisks (double check)
-                    cleaned = re.sub(r'\*', '', cleaned)
-                    # Remove any bullet symbols
-                    cleaned = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', cleaned)
-                    # Remove leading dashes
-                    cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
-                    if cleaned:
-                        cleaned_lines.append(cleaned)
-                enhanced_description = '\n'.join(cleaned_lines)
-            except Exception as e:
-                print(f"Error enhancing experience: {str(e)}")
-                enhanced_description = exp.description or "Responsible for key duties and achieved measurable results"
+
+    return [
+        {"role": "system", "content": "You are an expert resume writer. Create compelling job descriptions."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _tailor_messages(exp: WorkExperience, valid_skills: List[Skill]) -> List[Dict[str, str]]:
+    """Build the chat messages that rewrite a work experience as 3 bullet points"""
+    tailor_prompt = f"""
+            You are an expert resume writer. Create professional work experience descriptions.
+
+            CURRENT WORK EXPERIENCE:
+            Job Title: {exp.title}
+            Company: {exp.company}
+            Duration: {exp.startDate} - {exp.endDate if not exp.isCurrent else 'Present'}
+            Current Description: {exp.description or 'No description provided'}
+
+            USER'S SKILLS:
+            {', '.join([skill.name for skill in valid_skills[:15]])}
+
+            INSTRUCTIONS:
+            Generate EXACTLY 3 bullet points (one per line, separated by newlines) that describe this work experience:
+
+            1. First bullet: What they did - Describe their main responsibilities and daily tasks using strong action verbs
+            2. Second bullet: What they helped with - Describe how they contributed to team goals, projects, or initiatives
+            3. Third bullet: How they improved efficiency/sales/performance - Describe measurable impact, improvements, or results they achieved
+
+            CRITICAL REQUIREMENTS:
+            - Generate EXACTLY 3 bullet points, no more, no less
+            - Each bullet should be 15-25 words
+            - Use powerful action verbs (Led, Developed, Implemented, Optimized, Increased, Reduced, etc.)
+            - Focus on achievements and impact, especially in the third bullet
+            - Write in past tense (unless current role)
+            - Do NOT use asterisks (*), bullet symbols (•), or dashes (-) at the start of lines
+            - Write as plain text, one sentence per line (3 lines total)
+
+            FORMAT:
+            Line 1: [Action verb] [what they did] [relevant details]
+            Line 2: [Action verb] [what they helped with] [how they contributed]
+            Line 3: [Action verb] [how they improved efficiency/sales/performance] [measurable impact if possible]
+
+            Generate the 3 bullet points now:
+            """
+
+    return [
+        {"role": "system", "content": "You are an expert resume writer. Generate exactly 3 professional bullet points for work experience descriptions. Do not use asterisks, bullet symbols, or dashes."},
+        {"role": "user", "content": tailor_prompt}
+    ]
+
+def _finalize_tailored_description(generated: str, exp: WorkExperience) -> str:
+    """Clean generated bullets and pin them to exactly 3 lines"""
+    cleaned_lines = [line for line in _clean_description(generated, strip_numbering=True).split('\n') if line]
+
+    # Limit to exactly 3 bullet points
+    if len(cleaned_lines) > MAX_TAILORED_BULLETS:
+        cleaned_lines = cleaned_lines[:MAX_TAILORED_BULLETS]
+    elif 0 < len(cleaned_lines) < MAX_TAILORED_BULLETS:
+        # If we have fewer than 3, pad with generic descriptions
+        while len(cleaned_lines) < MAX_TAILORED_BULLETS:
+            cleaned_lines.append(f"Contributed to key initiatives and achieved measurable results at {exp.company}")
+
+    return '\n'.join(cleaned_lines)
+
+def _filter_valid_skills(skills: List[Skill], user_skills_from_db: List[str]) -> List[Skill]:
+    """Keep only resume skills that exist (or partially match) in the user's profile"""
+    valid_skills = []
+    for skill in skills:
+        skill_name_lower = skill.name.lower().strip()
+        # Check if skill exists in user's profile skills
+        if skill_name_lower in user_skills_from_db or any(
+            user_skill in skill_name_lower or skill_name_lower in user_skill
+            for user_skill in user_skills_from_db
+        ):
+            valid_skills.append(skill)
         else:
-            enhanced_description = exp.description
-        
-        # Clean any asterisks from existing descriptions - remove ALL asterisks completely
-        if enhanced_description:
-            # Remove ALL asterisks first (most important - no asterisks should remain anywhere)
-            enhanced_description = re.sub(r'\*', '', enhanced_description)
-            # Remove bullet symbols
-            enhanced_description = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', enhanced_description)
-            # Remove leading dashes
-            enhanced_description = re.sub(r'^\s*[-]\s*', '', enhanced_description, flags=re.MULTILINE)
-            # Split by newlines and clean each line thoroughly
-            lines = enhanced_description.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                cleaned = line.strip()
-                # Remove any remaining asterisks (double check - no asterisks should remain)
-                cleaned = re.sub(r'\*', '', cleaned)
-                # Remove any bullet symbols
-                cleaned = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', cleaned)
-                # Remove leading dashes
-                cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
-                if cleaned:
-                    cleaned_lines.append(cleaned)
-            enhanced_description = '\n'.join(cleaned_lines)
-        
-        enhanced_experience.append(WorkExperience(
-            id=exp.id,
-            title=exp.title,
-            company=exp.company,
-            location=exp.location,
-            startDate=exp.startDate,
-            endDate=exp.endDate,
-            isCurrent=exp.isCurrent,
-            description=enhanced_description
-        ))
-    
-    return enhanced_experience
+            print(f"⚠️ Skipping skill '{skill.name}' - not in user's profile")
+    return valid_skills
+
+def _fetch_user_skill_names(user_id: str) -> List[str]:
+    """Skill names from the user's profile snapshot, empty on failure"""
+    try:
+        skills = load_profile_snapshot(user_id)["skills"]
+        return [skill.get("name", "") for skill in skills if skill.get("name")]
+    except Exception as e:
+        print(f"⚠️ Could not fetch user skills: {str(e)}")
+        return []
+
+def generate_professional_summary(personal_info: PersonalInfo, work_experience: List[WorkExperience],
+                                education: List[Education], skills: List[Skill]) -> str:
+    """Generate a professional summary using AI"""
+    client = get_openai_client()
+
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_summary_messages(personal_info, work_experience, education, skills),
+            max_tokens=120,
+            temperature=0.7
+        )
+        return _clean_summary(response.choices[0].message.content)
+    except Exception as e:
+        print(f"Error generating summary: {str(e)}")
+        return _fallback_summary(personal_info, skills)
+
+async def agenerate_professional_summary(client, personal_info: PersonalInfo, work_experience: List[WorkExperience],
+                                         education: List[Education], skills: List[Skill]) -> str:
+    """Async variant of generate_professional_summary for concurrent fan-out"""
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_summary_messages(personal_info, work_experience, education, skills),
+            max_tokens=120,
+            temperature=0.7
+        )
+        return _clean_summary(response.choices[0].message.content)
+    except Exception as e:
+        print(f"Error generating summary: {str(e)}")
+        return _fallback_summary(personal_info, skills)
+
+async def aenhance_experience(client, exp: WorkExperience) -> WorkExperience:
+    """Write a description for an experience that lacks one, otherwise just clean it"""
+    enhanced_description = exp.description
+    if _needs_enhancement(exp):
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=_enhance_messages(exp),
+                max_tokens=300,
+                temperature=0.7
+            )
+            enhanced_description = response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error enhancing experience: {str(e)}")
+            enhanced_description = exp.description or "Responsible for key duties and achieved measurable results"
+
+    if enhanced_description:
+        enhanced_description = _clean_description(enhanced_description)
+
+    return exp.model_copy(update={"description": enhanced_description})
+
+async def atailor_experience(client, exp: WorkExperience, valid_skills: List[Skill]) -> WorkExperience:
+    """Rewrite one experience as exactly 3 tailored bullet points"""
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_tailor_messages(exp, valid_skills),
+            max_tokens=250,
+            temperature=0.7
+        )
+        tailored_description = _finalize_tailored_description(response.choices[0].message.content.strip(), exp)
+    except Exception as e:
+        print(f"⚠️ Error tailoring work experience for {exp.title}: {str(e)}")
+        # Fallback: use existing description or create a simple one
+        tailored_description = exp.description or f"Responsible for key duties and achieved measurable results at {exp.company}"
+
+    return exp.model_copy(update={"description": tailored_description})
+
+async def _labeled(label: Tuple[str, int], coro: Awaitable[Any]) -> Tuple[Tuple[str, int], Any]:
+    return label, await coro
+
+async def _as_completed(jobs: List[Tuple[Tuple[str, int], Awaitable[Any]]]) -> AsyncIterator[Tuple[Tuple[str, int], Any]]:
+    """Run labeled coroutines concurrently and yield (label, result) in completion order"""
+    tasks = [asyncio.create_task(_labeled(label, coro)) for label, coro in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client disconnected or a job failed: stop paying for the remaining completions
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
 @router.post("/api/ai/generate-resume", response_model=AIGenerateResponse)
 async def generate_resume(request: AIGenerateRequest, user_id: str = Depends(get_current_user)):
@@ -345,27 +462,30 @@ async def generate_resume(request: AIGenerateRequest, user_id: str = Depends(get
     try:
         print(f"🤖 AI RESUME: Generating resume for user {user_id}")
         print(f"🤖 AI RESUME: Template: {request.templateId}")
-        print(f"🤖 AI RESUME: Job description provided: {bool(request.jobDescription)}")
-        
-        # Generate professional summary
+
+        client = get_async_openai_client()
+
+        # Summary and every experience run concurrently
         summary = request.summary
+        summary_task = None
         if not summary or len(summary.strip()) < 20:
-            summary = generate_professional_summary(
+            summary_task = agenerate_professional_summary(
+                client,
                 request.personalInfo,
                 request.workExperience,
                 request.education,
-                request.skills,
-                request.targetRole,
-                request.jobDescription
+                request.skills
             )
-        
-        # Enhance work experience descriptions
-        enhanced_experience = enhance_work_experience(
-            request.workExperience, 
-            request.targetRole,
-            request.jobDescription
+
+        results = await asyncio.gather(
+            *([summary_task] if summary_task else []),
+            *[aenhance_experience(client, exp) for exp in request.workExperience]
         )
-        
+        if summary_task:
+            summary, enhanced_experience = results[0], list(results[1:])
+        else:
+            enhanced_experience = list(results)
+
         # Create the resume data
         resume_data = ResumeData(
             personalInfo=request.personalInfo,
@@ -375,19 +495,66 @@ async def generate_resume(request: AIGenerateRequest, user_id: str = Depends(get
             skills=request.skills,
             languages=request.languages
         )
-        
+
         print(f"🤖 AI RESUME: Resume generated successfully")
-        
+
         return AIGenerateResponse(
             resumeData=resume_data,
             success=True,
             message="Resume generated successfully with AI enhancement"
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ AI RESUME: Error generating resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate resume: {str(e)}")
 
+@router.post("/api/ai/generate-resume/stream")
+async def generate_resume_stream(request: AIGenerateRequest, user_id: str = Depends(get_current_user)):
+    """Stream a generated resume as SSE: one event per finished section, then `done`"""
+    print(f"🤖 AI RESUME: Streaming resume for user {user_id}")
+    client = get_async_openai_client()
+
+    async def events():
+        summary = request.summary
+        experience = list(request.workExperience)
+        jobs = []
+        if not summary or len(summary.strip()) < 20:
+            jobs.append((("summary", 0), agenerate_professional_summary(
+                client, request.personalInfo, request.workExperience, request.education, request.skills
+            )))
+        for index, exp in enumerate(request.workExperience):
+            jobs.append((("experience", index), aenhance_experience(client, exp)))
+
+        try:
+            async for (kind, index), result in _as_completed(jobs):
+                if kind == "summary":
+                    summary = result
+                    yield sse_event("summary", {"summary": summary})
+                else:
+                    experience[index] = result
+                    yield sse_event("experience", {"index": index, "workExperience": result})
+
+            resume_data = ResumeData(
+                personalInfo=request.personalInfo,
+                summary=summary,
+                workExperience=experience,
+                education=request.education,
+                skills=request.skills,
+                languages=request.languages
+            )
+            yield sse_event("done", AIGenerateResponse(
+                resumeData=resume_data,
+                success=True,
+                message="Resume generated successfully with AI enhancement"
+            ))
+        except Exception as e:
+            print(f"❌ AI RESUME: Error streaming resume: {str(e)}")
+            yield sse_event("error", {"detail": f"Failed to generate resume: {str(e)}"})
+
+    return sse_response(events())
+
 class ResumeSummaryRequest(BaseModel):
     resumeData: ResumeData
 
@@ -411,16 +578,16 @@ async def generate_profile_summary_from_resume(
     """Generate a professional summary from resume data"""
     try:
         print(f"🤖 AI SUMMARY: Generating summary for user {user_id}")
-        
+
         summary = generate_professional_summary(
             request.resumeData.personalInfo,
             request.resumeData.workExperience,
             request.resumeData.education,
             request.resumeData.skills
         )
-        
+
         print(f"🤖 AI SUMMARY: Summary generated successfully")
-        
+
         return ResumeSummaryResponse(
             summary=summary,
             success=True
@@ -429,36 +596,15 @@ async def generate_profile_summary_from_resume(
         print(f"❌ AI SUMMARY: Error generating summary: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate summary: {str(e)}")
 
-@router.post("/api/ai/generate-work-description", response_model=WorkDescriptionResponse)
-async def generate_work_description(
-    questionnaire: WorkDescriptionQuestionnaire, 
-    user_id: str = Depends(get_current_user)
-):
-    """Generate professional work experience description from questionnaire answers"""
-    try:
-        print(f"🤖 AI WORK DESC: Generating description for user {user_id}")
-        print(f"🤖 AI WORK DESC: Job: {questionnaire.job_title} at {questionnaire.company}")
-        
-        # Fetch user skills from database
-        try:
-            skills_response = supabase.table("user_skills").select("name").eq("user_id", user_id).execute()
-            user_skills = [skill.get("name", "") for skill in (skills_response.data or []) if skill.get("name")]
-            print(f"🤖 AI WORK DESC: Found {len(user_skills)} skills: {', '.join(user_skills[:5])}")
-        except Exception as e:
-            print(f"⚠️ Could not fetch user skills: {str(e)}")
-            user_skills = []
-        
-        client = get_openai_client()
-        
-        skills_context = f"User's skills from profile: {', '.join(user_skills) if user_skills else 'None listed'}"
-        
-        # Check if user included impact/metrics in their single-field input (they may have pasted both responsibilities and results)
-        user_text = (questionnaire.what_did_you_do or "").strip()
-        has_impact = bool(
-            questionnaire.impact_results and questionnaire.impact_results.strip() and questionnaire.impact_results.lower() not in ['none', 'none provided', 'n/a', 'na']
-        ) or bool(re.search(r'\d+%|\d+\s*(percent|%)|\b(increased|reduced|improved|delivered|achieved)\s+', user_text, re.IGNORECASE))
-        
-        system_message = """You are a resume editor. Your job is to polish the user's work description into 2-3 clear, professional sentences.
+def _work_description_messages(questionnaire: WorkDescriptionQuestionnaire) -> Tuple[List[Dict[str, str]], bool]:
+    """Build the polishing prompt; also reports whether the user supplied metrics"""
+    # Check if user included impact/metrics in their single-field input (they may have pasted both responsibilities and results)
+    user_text = (questionnaire.what_did_you_do or "").strip()
+    has_impact = bool(
+        questionnaire.impact_results and questionnaire.impact_results.strip() and questionnaire.impact_results.lower() not in ['none', 'none provided', 'n/a', 'na']
+    ) or bool(re.search(r'\d+%|\d+\s*(percent|%)|\b(increased|reduced|improved|delivered|achieved)\s+', user_text, re.IGNORECASE))
+
+    system_message = """You are a resume editor. Your job is to polish the user's work description into 2-3 clear, professional sentences.
 
 STRICT RULES - YOU MUST FOLLOW THESE:
 1. USE ONLY information the user wrote. Do not add any facts, metrics, numbers, technologies, team sizes, or achievements they did not mention.
@@ -468,7 +614,7 @@ STRICT RULES - YOU MUST FOLLOW THESE:
 5. Keep a similar length to the user's input. If they wrote 2 short sentences, output 2-3 polished sentences—do not turn it into a long list of invented bullet points.
 6. Write in past tense, third person. No bullet symbols (•), asterisks (*), or dashes at the start of lines. Plain text sentences separated by newlines."""
 
-        prompt = f"""Job title: {questionnaire.job_title}
+    prompt = f"""Job title: {questionnaire.job_title}
 Company: {questionnaire.company}
 
 User's description (polish this only - do not add anything they did not write):
@@ -480,60 +626,77 @@ User's description (polish this only - do not add anything they did not write):
 
 Output 2-3 professional sentences that stay strictly faithful to the user's description. No bullets, no asterisks, no leading dashes. Plain text only."""
 
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": prompt}
+    ]
+    return messages, has_impact
+
+def _polish_work_description(description: str, has_impact: bool) -> str:
+    """Post-process a generated work description: strip symbols, drop invented metrics, cap at 3 lines"""
+    # Get all non-empty lines and remove bullet symbols/asterisks
+    cleaned_lines = []
+    for line in description.strip().split('\n'):
+        cleaned = line.strip()
+        if cleaned:
+            # Remove ALL asterisks first (most important - no asterisks should remain)
+            cleaned = re.sub(r'\*', '', cleaned)
+            # Remove bullet symbols
+            cleaned = re.sub(BULLET_SYMBOLS, '', cleaned)
+            # Remove leading dashes and bullet markers
+            cleaned = re.sub(r'^[\u2022\u2023\u25E6\u2043\u2219\-\•]\s*', '', cleaned)
+            cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
+            if cleaned:
+                cleaned_lines.append(cleaned)
+
+    # If impact wasn't provided, remove any metrics/percentages that might have been hallucinated
+    if not has_impact:
+        final_lines = []
+        for line in cleaned_lines:
+            # Remove percentage patterns unless they're part of skill names (like "C++")
+            cleaned = re.sub(r'\b\d+%', '', line)
+            cleaned = re.sub(r'\b\d+\s*(percent|percentage)', '', cleaned, flags=re.IGNORECASE)
+            cleaned = re.sub(r'\b(increased|decreased|reduced|improved|enhanced)\s+by\s+\d+', '', cleaned, flags=re.IGNORECASE)
+            cleaned = re.sub(r'\b(resulting in|leading to|contributing to)\s+[^,]+', '', cleaned, flags=re.IGNORECASE)
+            cleaned = re.sub(r'\s+', ' ', cleaned).strip()  # Clean up extra spaces
+            if cleaned:
+                final_lines.append(cleaned)
+        cleaned_lines = final_lines
+
+    if len(cleaned_lines) > 3:
+        # Take only the first 3 lines
+        print(f"⚠️ AI WORK DESC: Generated {len(cleaned_lines)} lines, truncated to 3")
+        return '\n'.join(cleaned_lines[:3])
+    return '\n'.join(cleaned_lines)
+
+@router.post("/api/ai/generate-work-description", response_model=WorkDescriptionResponse)
+async def generate_work_description(
+    questionnaire: WorkDescriptionQuestionnaire,
+    user_id: str = Depends(get_current_user)
+):
+    """Generate professional work experience description from questionnaire answers"""
+    try:
+        print(f"🤖 AI WORK DESC: Generating description for user {user_id}")
+        print(f"🤖 AI WORK DESC: Job: {questionnaire.job_title} at {questionnaire.company}")
+
+        # Fetch user skills from database
+        user_skills = _fetch_user_skill_names(user_id)
+        print(f"🤖 AI WORK DESC: Found {len(user_skills)} skills: {', '.join(user_skills[:5])}")
+
+        client = get_openai_client()
+        messages, has_impact = _work_description_messages(questionnaire)
+
         response = client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             max_tokens=250,
             temperature=0.2
         )
-        
-        description = response.choices[0].message.content.strip()
-        
-        # Post-process to remove all asterisks and bullet symbols, clean up formatting
-        lines = description.split('\n')
-        # Get all non-empty lines and remove bullet symbols/asterisks
-        cleaned_lines = []
-        for line in lines:
-            cleaned = line.strip()
-            if cleaned:
-                # Remove ALL asterisks first (most important - no asterisks should remain)
-                cleaned = re.sub(r'\*', '', cleaned)
-                # Remove bullet symbols
-                cleaned = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', cleaned)
-                # Remove leading dashes and bullet markers
-                cleaned = re.sub(r'^[\u2022\u2023\u25E6\u2043\u2219\-\•]\s*', '', cleaned)
-                cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
-                # Double check for any remaining asterisks
-                cleaned = re.sub(r'\*', '', cleaned)
-                if cleaned:
-                    cleaned_lines.append(cleaned)
-        
-        # If impact wasn't provided, remove any metrics/percentages that might have been hallucinated
-        if not has_impact:
-            final_lines = []
-            for line in cleaned_lines:
-                # Remove percentage patterns unless they're part of skill names (like "C++")
-                cleaned = re.sub(r'\b\d+%', '', line)
-                cleaned = re.sub(r'\b\d+\s*(percent|percentage)', '', cleaned, flags=re.IGNORECASE)
-                cleaned = re.sub(r'\b(increased|decreased|reduced|improved|enhanced)\s+by\s+\d+', '', cleaned, flags=re.IGNORECASE)
-                cleaned = re.sub(r'\b(resulting in|leading to|contributing to)\s+[^,]+', '', cleaned, flags=re.IGNORECASE)
-                cleaned = re.sub(r'\s+', ' ', cleaned).strip()  # Clean up extra spaces
-                if cleaned:
-                    final_lines.append(cleaned)
-            cleaned_lines = final_lines
-        
-        if len(cleaned_lines) > 3:
-            # Take only the first 3 lines
-            description = '\n'.join(cleaned_lines[:3])
-            print(f"⚠️ AI WORK DESC: Generated {len(cleaned_lines)} lines, truncated to 3")
-        else:
-            description = '\n'.join(cleaned_lines)
-        
+
+        description = _polish_work_description(response.choices[0].message.content, has_impact)
+
         print(f"🤖 AI WORK DESC: Description generated successfully")
-        
+
         return WorkDescriptionResponse(
             description=description,
             success=True
@@ -542,6 +705,43 @@ Output 2-3 professional sentences that stay strictly faithful to the user's desc
         print(f"❌ AI WORK DESC: Error generating description: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate description: {str(e)}")
 
+@router.post("/api/ai/generate-work-description/stream")
+async def generate_work_description_stream(
+    questionnaire: WorkDescriptionQuestionnaire,
+    user_id: str = Depends(get_current_user)
+):
+    """Stream a work description as SSE `delta` tokens; `done` carries the polished text.
+
+    Deltas are the raw model output - clients should replace them with the `done` description.
+    """
+    print(f"🤖 AI WORK DESC: Streaming description for user {user_id}")
+    client = get_async_openai_client()
+    messages, has_impact = _work_description_messages(questionnaire)
+
+    async def events():
+        try:
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                max_tokens=250,
+                temperature=0.2,
+                stream=True
+            )
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield sse_event("delta", {"text": delta})
+
+            description = _polish_work_description("".join(parts), has_impact)
+            yield sse_event("done", WorkDescriptionResponse(description=description, success=True))
+        except Exception as e:
+            print(f"❌ AI WORK DESC: Error streaming description: {str(e)}")
+            yield sse_event("error", {"detail": f"Failed to generate description: {str(e)}"})
+
+    return sse_response(events())
+
 @router.post("/api/ai/tailor-resume", response_model=TailorResumeResponse)
 async def tailor_resume(
     request: TailorResumeRequest,
@@ -550,149 +750,33 @@ async def tailor_resume(
     """Enhance an existing resume"""
     try:
         print(f"🎯 AI TAILOR: Enhancing resume for user {user_id}")
-        
+
         # Fetch user skills from database to ensure we only use skills the user actually has
-        try:
-            skills_response = supabase.table("user_skills").select("name").eq("user_id", user_id).execute()
-            user_skills_from_db = [skill.get("name", "").lower().strip() for skill in (skills_response.data or []) if skill.get("name")]
-            print(f"🎯 AI TAILOR: Found {len(user_skills_from_db)} user skills: {', '.join(user_skills_from_db[:10])}")
-        except Exception as e:
-            print(f"⚠️ Could not fetch user skills: {str(e)}")
-            user_skills_from_db = []
-        
+        user_skills_from_db = [name.lower().strip() for name in _fetch_user_skill_names(user_id)]
+        print(f"🎯 AI TAILOR: Found {len(user_skills_from_db)} user skills: {', '.join(user_skills_from_db[:10])}")
+
         # Filter resume skills to only include what user actually has
-        resume_skill_names = [skill.name.lower().strip() for skill in request.resumeData.skills]
-        valid_skills = []
-        for skill in request.resumeData.skills:
-            skill_name_lower = skill.name.lower().strip()
-            # Check if skill exists in user's profile skills
-            if skill_name_lower in user_skills_from_db or any(
-                user_skill in skill_name_lower or skill_name_lower in user_skill 
-                for user_skill in user_skills_from_db
-            ):
-                valid_skills.append(skill)
-            else:
-                print(f"⚠️ Skipping skill '{skill.name}' - not in user's profile")
-        
+        valid_skills = _filter_valid_skills(request.resumeData.skills, user_skills_from_db)
         print(f"🎯 AI TAILOR: Filtered to {len(valid_skills)} valid skills from {len(request.resumeData.skills)} total")
-        
-        # Generate professional summary
-        tailored_summary = generate_professional_summary(
-            request.resumeData.personalInfo,
-            request.resumeData.workExperience,
-            request.resumeData.education,
-            valid_skills
+
+        # Summary and tailored work experience (max 3 bullets per job) run concurrently
+        client = get_async_openai_client()
+        tailored_summary, *tailored_experience = await asyncio.gather(
+            agenerate_professional_summary(
+                client,
+                request.resumeData.personalInfo,
+                request.resumeData.workExperience,
+                request.resumeData.education,
+                valid_skills
+            ),
+            *[atailor_experience(client, exp, valid_skills) for exp in request.resumeData.workExperience]
         )
-        
-        # Generate tailored work experience descriptions with bullet points (max 3 per job)
-        client = get_openai_client()
-        tailored_experience = []
-        
-        for exp in request.resumeData.workExperience:
-            # Create a comprehensive prompt for generating work experience
-            tailor_prompt = f"""
-            You are an expert resume writer. Create professional work experience descriptions.
-            
-            CURRENT WORK EXPERIENCE:
-            Job Title: {exp.title}
-            Company: {exp.company}
-            Duration: {exp.startDate} - {exp.endDate if not exp.isCurrent else 'Present'}
-            Current Description: {exp.description or 'No description provided'}
-            
-            USER'S SKILLS:
-            {', '.join([skill.name for skill in valid_skills[:15]])}
-            
-            INSTRUCTIONS:
-            Generate EXACTLY 3 bullet points (one per line, separated by newlines) that describe this work experience:
-            
-            1. First bullet: What they did - Describe their main responsibilities and daily tasks using strong action verbs
-            2. Second bullet: What they helped with - Describe how they contributed to team goals, projects, or initiatives
-            3. Third bullet: How they improved efficiency/sales/performance - Describe measurable impact, improvements, or results they achieved
-            
-            CRITICAL REQUIREMENTS:
-            - Generate EXACTLY 3 bullet points, no more, no less
-            - Each bullet should be 15-25 words
-            - Use powerful action verbs (Led, Developed, Implemented, Optimized, Increased, Reduced, etc.)
-            - Focus on achievements and impact, especially in the third bullet
-            - Write in past tense (unless current role)
-            - Do NOT use asterisks (*), bullet symbols (•), or dashes (-) at the start of lines
-            - Write as plain text, one sentence per line (3 lines total)
-            
-            FORMAT:
-            Line 1: [Action verb] [what they did] [relevant details]
-            Line 2: [Action verb] [what they helped with] [how they contributed]
-            Line 3: [Action verb] [how they improved efficiency/sales/performance] [measurable impact if possible]
-            
-            Generate the 3 bullet points now:
-            """
-            
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "You are an expert resume writer. Generate exactly 3 professional bullet points for work experience descriptions. Do not use asterisks, bullet symbols, or dashes."},
-                        {"role": "user", "content": tailor_prompt}
-                    ],
-                    max_tokens=250,
-                    temperature=0.7
-                )
-                
-                generated_description = response.choices[0].message.content.strip()
-                
-                # Remove ALL asterisks completely
-                generated_description = re.sub(r'\*', '', generated_description)
-                # Remove bullet symbols
-                generated_description = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', generated_description)
-                # Remove leading dashes
-                generated_description = re.sub(r'^\s*[-]\s*', '', generated_description, flags=re.MULTILINE)
-                
-                # Split by newlines and clean each line
-                lines = generated_description.split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    cleaned = line.strip()
-                    # Remove any remaining asterisks
-                    cleaned = re.sub(r'\*', '', cleaned)
-                    # Remove any bullet symbols
-                    cleaned = re.sub(r'[\u2022\u2023\u25E6\u2043\u2219•]', '', cleaned)
-                    # Remove leading dashes
-                    cleaned = re.sub(r'^\s*[-]\s*', '', cleaned)
-                    # Remove numbered prefixes (1., 2., 3., etc.)
-                    cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
-                    if cleaned:
-                        cleaned_lines.append(cleaned)
-                
-                # Limit to exactly 3 bullet points
-                if len(cleaned_lines) > 3:
-                    cleaned_lines = cleaned_lines[:3]
-                elif len(cleaned_lines) < 3 and len(cleaned_lines) > 0:
-                    # If we have fewer than 3, pad with generic descriptions
-                    while len(cleaned_lines) < 3:
-                        cleaned_lines.append(f"Contributed to key initiatives and achieved measurable results at {exp.company}")
-                
-                tailored_description = '\n'.join(cleaned_lines[:3])
-                
-            except Exception as e:
-                print(f"⚠️ Error tailoring work experience for {exp.title}: {str(e)}")
-                # Fallback: use existing description or create a simple one
-                tailored_description = exp.description or f"Responsible for key duties and achieved measurable results at {exp.company}"
-            
-            tailored_experience.append(WorkExperience(
-                id=exp.id,
-                title=exp.title,
-                company=exp.company,
-                location=exp.location,
-                startDate=exp.startDate,
-                endDate=exp.endDate,
-                isCurrent=exp.isCurrent,
-                description=tailored_description
-            ))
-        
+
         print(f"🎯 AI TAILOR: Generated descriptions for {len(tailored_experience)} work experiences")
-        
+
         # Use all valid skills
         final_skills = valid_skills[:20]  # Limit to 20
-        
+
         # Create tailored resume data
         tailored_resume_data = ResumeData(
             personalInfo=request.resumeData.personalInfo,
@@ -702,21 +786,72 @@ async def tailor_resume(
             skills=final_skills,
             languages=request.resumeData.languages
         )
-        
+
         print(f"🎯 AI TAILOR: Resume tailored successfully")
-        
+
         return TailorResumeResponse(
             resumeData=tailored_resume_data,
             success=True,
             message="Resume enhanced successfully"
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
         print(f"❌ AI TAILOR: Error tailoring resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to tailor resume: {str(e)}")
 
+@router.post("/api/ai/tailor-resume/stream")
+async def tailor_resume_stream(
+    request: TailorResumeRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Stream a tailored resume as SSE: summary and each experience as soon as ready, then `done`"""
+    print(f"🎯 AI TAILOR: Streaming tailored resume for user {user_id}")
+    client = get_async_openai_client()
+
+    user_skills_from_db = [name.lower().strip() for name in _fetch_user_skill_names(user_id)]
+    valid_skills = _filter_valid_skills(request.resumeData.skills, user_skills_from_db)
+
+    async def events():
+        resume = request.resumeData
+        summary = resume.summary
+        experience = list(resume.workExperience)
+        jobs = [(("summary", 0), agenerate_professional_summary(
+            client, resume.personalInfo, resume.workExperience, resume.education, valid_skills
+        ))]
+        for index, exp in enumerate(resume.workExperience):
+            jobs.append((("experience", index), atailor_experience(client, exp, valid_skills)))
+
+        try:
+            yield sse_event("skills", {"skills": valid_skills[:20]})
+            async for (kind, index), result in _as_completed(jobs):
+                if kind == "summary":
+                    summary = result
+                    yield sse_event("summary", {"summary": summary})
+                else:
+                    experience[index] = result
+                    yield sse_event("experience", {"index": index, "workExperience": result})
+
+            tailored_resume_data = ResumeData(
+                personalInfo=resume.personalInfo,
+                summary=summary,
+                workExperience=experience,
+                education=resume.education,
+                skills=valid_skills[:20],
+                languages=resume.languages
+            )
+            yield sse_event("done", TailorResumeResponse(
+                resumeData=tailored_resume_data,
+                success=True,
+                message="Resume enhanced successfully"
+            ))
+        except Exception as e:
+            print(f"❌ AI TAILOR: Error streaming tailored resume: {str(e)}")
+            yield sse_event("error", {"detail": f"Failed to tailor resume: {str(e)}"})
+
+    return sse_response(events())
+
 @router.get("/api/ai/health")
 async def ai_health_check():
     """Health check for AI services"""
@@ -773,7 +908,7 @@ async def save_resume(request: SaveResumeRequest, user_id: str = Depends(get_cur
             "user_id": user_id,
             "template_id": request.template_id,
             "title": request.title or "My Resume",
-            "resume_data": json.dumps(request.resume_data),  # Convert to JSON string for JSONB
+            "resume_data": request.resume_data,
             "is_current": False
         }
         
@@ -784,6 +919,7 @@ async def save_resume(request: SaveResumeRequest, user_id: str = Depends(get_cur
             raise HTTPException(status_code=400, detail="Failed to save resume")
         
         saved_resume = response.data[0]
+        record_revision(saved_resume['id'], user_id, saved_resume.get('version') or 1, saved_resume['title'], request.resume_data)
         print(f"💾 RESUME BUILDER: Resume saved successfully with ID: {saved_resume['id']}")
         
         return SaveResumeResponse(
@@ -798,48 +934,67 @@ async def save_resume(request: SaveResumeRequest, user_id: str = Depends(get_cur
         print(f"❌ RESUME BUILDER: Error saving resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save resume: {str(e)}")
 
-@router.get("/api/resume-builder/list")
-async def list_resumes(user_id: str = Depends(get_current_user)):
-    """Get all saved resumes for current user"""
+def _resume_data(value: Any) -> Dict[str, Any]:
+    """resume_data as a dict; rows not yet backfilled still hold a JSON-encoded string"""
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+def _resume_response(item: Dict[str, Any], template_id: Optional[str] = None) -> ResumeBuilderData:
+    return ResumeBuilderData(
+        id=UUID(item['id']),
+        user_id=UUID(item['user_id']),
+        template_id=template_id or item['template_id'],
+        title=item['title'],
+        resume_data=_resume_data(item['resume_data']),
+        is_current=item.get('is_current') or False,
+        version=item.get('version') or 1,
+        created_at=datetime.fromisoformat(item['created_at'].replace('Z', '+00:00')) if item.get('created_at') else None,
+        updated_at=datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00')) if item.get('updated_at') else None
+    )
+
+def _version_conflict(resume_id: UUID, user_id: str) -> HTTPException:
+    """409 when the resume still exists (someone else saved first), otherwise 404"""
+    current = supabase.table("resume_builder_data")\
+        .select("version")\
+        .eq("id", str(resume_id))\
+        .eq("user_id", user_id)\
+        .execute()
+    if not current.data:
+        return HTTPException(status_code=404, detail="Resume not found")
+    return HTTPException(
+        status_code=409,
+        detail=f"Resume was changed elsewhere (now at version {current.data[0]['version']}). Reload it and try again."
+    )
+
+RESUME_LIST_COLUMNS = "id, template_id, title, preview, created_at, updated_at, is_current"
+
+@router.get("/api/resume-builder/list", response_model=List[ResumeBuilderItem])
+async def list_resumes(limit: int = Query(50, ge=1, le=100), user_id: str = Depends(get_current_user)):
+    """Get the user's saved resumes, newest first, with a preview summary instead of the full resume data"""
     try:
         print(f"📋 RESUME BUILDER: Listing resumes for user {user_id}")
         
-        # Query database with resume_data included for preview
         response = supabase.table("resume_builder_data")\
-            .select("id, template_id, title, resume_data, created_at, updated_at, is_current")\
+            .select(RESUME_LIST_COLUMNS)\
             .eq("user_id", user_id)\
-            .order("updated_at", desc=False)\
+            .order("updated_at", desc=True)\
+            .limit(limit)\
             .execute()
         
-        # Reverse to get newest first
-        if response.data:
-            response.data.reverse()
-        
         if not response.data:
             return []
         
-        # Get all templates to map UUID to slug
-        templates_res = supabase.table("templates").select("id, slug").execute()
-        template_map = {}
-        if templates_res.data:
-            for t in templates_res.data:
-                template_map[t['id']] = t['slug']
-        
-        # Convert to response with template slug
         resumes = []
         for item in response.data:
-            template_uuid = item['template_id']
-            # Convert UUID to slug if possible
-            template_slug = template_map.get(template_uuid, template_uuid)
-            
             resumes.append({
                 "id": item['id'],
-                "template_id": template_slug,  # Return slug instead of UUID
+                "template_id": template_slug(item['template_id']),  # Return slug instead of UUID
                 "title": item['title'],
-                "resume_data": item.get('resume_data', {}),
+                "preview": item.get('preview') or {},
                 "created_at": item['created_at'],
                 "updated_at": item['updated_at'],
-                "is_current": item.get('is_current', False)
+                "is_current": item.get('is_current') or False
             })
         
         print(f"📋 RESUME BUILDER: Found {len(resumes)} resumes")
@@ -867,34 +1022,16 @@ async def get_resume(resume_id: UUID, user_id: str = Depends(get_current_user)):
         
         item = response.data[0]
         
-        # Parse resume_data from JSON string
-        resume_data_dict = json.loads(item['resume_data']) if isinstance(item['resume_data'], str) else item['resume_data']
-        
         # Convert template_id from UUID to slug if it's a UUID
         template_id = item['template_id']
         try:
-            # Check if it's a UUID (has dashes and is 36 chars)
-            if len(template_id) == 36 and '-' in template_id:
-                # Try to fetch slug from templates table
-                tpl = supabase.table("templates").select("slug").eq("id", template_id).maybe_single().execute()
-                if tpl and hasattr(tpl, 'data') and tpl.data and tpl.data.get("slug"):
-                    template_id = tpl.data["slug"]
-                    print(f"📄 RESUME BUILDER: Converted template UUID to slug: {template_id}")
+            template_id = template_slug(template_id)
         except Exception as e:
             print(f"⚠️ RESUME BUILDER: Could not convert template UUID to slug: {e}")
             # Continue with original template_id
         
         print(f"📄 RESUME BUILDER: Resume loaded successfully")
-        return ResumeBuilderData(
-            id=UUID(item['id']),
-            user_id=UUID(item['user_id']),
-            template_id=template_id,
-            title=item['title'],
-            resume_data=resume_data_dict,
-            is_current=item.get('is_current', False),
-            created_at=datetime.fromisoformat(item['created_at'].replace('Z', '+00:00')) if item.get('created_at') else None,
-            updated_at=datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00')) if item.get('updated_at') else None
-        )
+        return _resume_response(item, template_id)
         
     except HTTPException:
         raise
@@ -913,37 +1050,55 @@ async def update_resume(resume_id: UUID, request: UpdateResumeRequest, user_id:
         if request.title is not None:
             update_data['title'] = request.title
         if request.resume_data is not None:
-            update_data['resume_data'] = json.dumps(request.resume_data)
+            update_data['resume_data'] = request.resume_data
         
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        # Update in database
+        # Read the stored document so the revision can be stored as a delta from it
+        current = supabase.table("resume_builder_data")\
+            .select("resume_data, version")\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .execute()
+        if not current.data:
+            raise HTTPException(status_code=404, detail="Resume not found or no changes made")
+        stored_version = current.data[0].get('version') or 1
+        if request.version is not None and request.version != stored_version:
+            raise _version_conflict(resume_id, user_id)
+        previous = _resume_data(current.data[0]['resume_data'])
+        
+        # Compare-and-swap on the version just read, so `previous` is the revision this one replaces
         response = supabase.table("resume_builder_data")\
             .update(update_data)\
             .eq("id", str(resume_id))\
             .eq("user_id", user_id)\
+            .eq("version", stored_version)\
             .execute()
         
-        if not response.data or len(response.data) == 0:
-            raise HTTPException(status_code=404, detail="Resume not found or no changes made")
+        if not response.data:
+            if request.version is not None:
+                raise _version_conflict(resume_id, user_id)
+            # Unversioned saves keep last-write-wins: another save landed since the read,
+            # so write anyway and store this revision as a snapshot
+            previous = None
+            response = supabase.table("resume_builder_data")\
+                .update(update_data)\
+                .eq("id", str(resume_id))\
+                .eq("user_id", user_id)\
+                .execute()
+            if not response.data:
+                raise HTTPException(status_code=404, detail="Resume not found or no changes made")
         
         item = response.data[0]
-        
-        # Parse resume_data
-        resume_data_dict = json.loads(item['resume_data']) if isinstance(item['resume_data'], str) else item['resume_data']
+        version = item.get('version') or 1
+        # An unchanged save keeps the version; `previous` only applies to a bump of exactly one
+        if version != stored_version + 1:
+            previous = None
+        record_revision(item['id'], user_id, version, item['title'], _resume_data(item['resume_data']), previous=previous)
         
         print(f"✏️ RESUME BUILDER: Resume updated successfully")
-        return ResumeBuilderData(
-            id=UUID(item['id']),
-            user_id=UUID(item['user_id']),
-            template_id=item['template_id'],
-            title=item['title'],
-            resume_data=resume_data_dict,
-            is_current=item.get('is_current', False),
-            created_at=datetime.fromisoformat(item['created_at'].replace('Z', '+00:00')) if item.get('created_at') else None,
-            updated_at=datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00')) if item.get('updated_at') else None
-        )
+        return _resume_response(item)
         
     except HTTPException:
         raise
@@ -951,6 +1106,208 @@ async def update_resume(resume_id: UUID, request: UpdateResumeRequest, user_id:
         print(f"❌ RESUME BUILDER: Error updating resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to update resume: {str(e)}")
 
+@router.patch("/api/resume-builder/{resume_id}", response_model=ResumeBuilderData)
+async def patch_resume(resume_id: UUID, request: PatchResumeRequest, user_id: str = Depends(get_current_user)):
+    """Apply a JSON Patch or merge patch to resume_data, only if the resume is still at `version`"""
+    if request.patch is not None and request.merge_patch is not None:
+        raise HTTPException(status_code=400, detail="Send either patch or merge_patch, not both")
+    if request.patch is None and request.merge_patch is None and request.title is None:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    try:
+        response = supabase.table("resume_builder_data")\
+            .select("*")\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .execute()
+        
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        
+        item = response.data[0]
+        if item.get('version', 1) != request.version:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Resume was changed elsewhere (now at version {item.get('version', 1)}). Reload it and try again."
+            )
+        
+        resume_data = _resume_data(item['resume_data'])
+        try:
+            if request.patch is not None:
+                patched = apply_json_patch(resume_data, request.patch)
+            elif request.merge_patch is not None:
+                patched = apply_merge_patch(resume_data, request.merge_patch)
+            else:
+                patched = resume_data
+        except JsonPatchError as e:
+            raise HTTPException(status_code=422, detail=f"Could not apply patch: {str(e)}")
+        if not isinstance(patched, dict):
+            raise HTTPException(status_code=422, detail="Could not apply patch: resume data must stay an object")
+        
+        update_data = {}
+        # Not patched != resume_data: == would drop a change from 1 to true
+        if create_json_patch(resume_data, patched):
+            update_data['resume_data'] = patched
+        if request.title is not None and request.title != item['title']:
+            update_data['title'] = request.title
+        if not update_data:
+            return _resume_response(item)
+        
+        # Compare-and-swap on version: a save that landed since the read makes this match nothing
+        updated = supabase.table("resume_builder_data")\
+            .update(update_data)\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .eq("version", request.version)\
+            .execute()
+        
+        if not updated.data:
+            raise _version_conflict(resume_id, user_id)
+        
+        item = updated.data[0]
+        record_revision(item['id'], user_id, item['version'], item['title'], patched, previous=resume_data)
+        return _resume_response(item)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error patching resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to patch resume: {str(e)}")
+
+@router.get("/api/resume-builder/{resume_id}/revisions", response_model=List[ResumeRevision])
+async def get_resume_revisions(resume_id: UUID, limit: int = Query(50, ge=1, le=200), user_id: str = Depends(get_current_user)):
+    """List saved revisions of a resume, newest first"""
+    try:
+        return list_revisions(str(resume_id), user_id, limit)
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error listing revisions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to list revisions: {str(e)}")
+
+def _load_revision_or_404(resume_id: UUID, user_id: str, revision: int) -> Dict[str, Any]:
+    try:
+        loaded = load_revision(str(resume_id), user_id, revision)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=f"Revision {revision} cannot be rebuilt: {str(e)}")
+    if loaded is None:
+        raise HTTPException(status_code=404, detail=f"Revision {revision} not found")
+    return loaded
+
+@router.get("/api/resume-builder/{resume_id}/revisions/diff", response_model=ResumeRevisionDiff)
+async def diff_resume_revisions(
+    resume_id: UUID,
+    from_revision: int = Query(..., alias="from", ge=1),
+    to_revision: int = Query(..., alias="to", ge=1),
+    user_id: str = Depends(get_current_user)
+):
+    """JSON Patch between two revisions of a resume"""
+    try:
+        before = _load_revision_or_404(resume_id, user_id, from_revision)
+        after = _load_revision_or_404(resume_id, user_id, to_revision)
+        return {
+            "from_revision": from_revision,
+            "to_revision": to_revision,
+            "patch": create_json_patch(before['resume_data'], after['resume_data'])
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error diffing revisions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to diff revisions: {str(e)}")
+
+@router.get("/api/resume-builder/{resume_id}/revisions/{revision}", response_model=ResumeRevisionDocument)
+async def get_resume_revision(resume_id: UUID, revision: int, user_id: str = Depends(get_current_user)):
+    """The resume document as it was at a revision"""
+    try:
+        return _load_revision_or_404(resume_id, user_id, revision)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error loading revision: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to load revision: {str(e)}")
+
+@router.post("/api/resume-builder/{resume_id}/revisions/{revision}/restore", response_model=ResumeBuilderData)
+async def restore_resume_revision(resume_id: UUID, revision: int, user_id: str = Depends(get_current_user)):
+    """Make an earlier revision the current resume; this is saved as a new revision"""
+    try:
+        restored = _load_revision_or_404(resume_id, user_id, revision)
+        
+        current = supabase.table("resume_builder_data")\
+            .select("*")\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .execute()
+        if not current.data:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        item = current.data[0]
+        previous = _resume_data(item['resume_data'])
+        
+        update_data = {"resume_data": restored['resume_data']}
+        if restored['title']:
+            update_data['title'] = restored['title']
+        
+        updated = supabase.table("resume_builder_data")\
+            .update(update_data)\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .eq("version", item['version'])\
+            .execute()
+        if not updated.data:
+            raise _version_conflict(resume_id, user_id)
+        
+        item = updated.data[0]
+        record_revision(item['id'], user_id, item['version'], item['title'], restored['resume_data'], previous=previous)
+        print(f"↩️ RESUME BUILDER: Restored resume {resume_id} to revision {revision}")
+        return _resume_response(item)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error restoring revision: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to restore revision: {str(e)}")
+
+@router.get("/api/resume-builder/{resume_id}/render")
+async def render_saved_resume(
+    resume_id: UUID,
+    request: Request,
+    format: str = Query("pdf", pattern="^(pdf|html)$"),
+    user_id: str = Depends(get_current_user)
+):
+    """Render a saved resume to PDF or HTML with its template"""
+    try:
+        response = supabase.table("resume_builder_data")\
+            .select("template_id, title, resume_data")\
+            .eq("id", str(resume_id))\
+            .eq("user_id", user_id)\
+            .execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        item = response.data[0]
+        
+        template = find_template(item['template_id'])
+        if template is None:
+            raise HTTPException(status_code=404, detail=f"Template '{item['template_id']}' not found")
+        
+        resume_data = _resume_data(item['resume_data'])
+        title = item.get('title') or "Resume"
+        # The output is fully determined by its inputs, so their hash is the ETag
+        etag = f'"{render_key(format, template.etag, resume_data, title)}"'
+        headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        _, output = await render_resume(format, template.etag, template.schema, resume_data, title)
+        if format == "pdf":
+            filename = re.sub(r"[^A-Za-z0-9._-]+", "_", title).strip("_") or "resume"
+            headers["Content-Disposition"] = f'inline; filename="{filename}.pdf"'
+            return Response(content=output, media_type="application/pdf", headers=headers)
+        return Response(content=output, media_type="text/html; charset=utf-8", headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ RESUME BUILDER: Error rendering resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to render resume: {str(e)}")
+
 @router.delete("/api/resume-builder/{resume_id}")
 async def delete_resume(resume_id: UUID, user_id: str = Depends(get_current_user)):
     """Delete saved resume"""
@@ -976,112 +1333,34 @@ async def delete_resume(resume_id: UUID, user_id: str = Depends(get_current_user
 
 # Templates API Endpoints
 
+def _cached_json(request: Request, body: bytes, etag: str) -> Response:
+    """Serve a pre-serialized registry body, or 304 when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/api/templates")
-async def list_templates(user_id: str = Depends(get_current_user)):
+async def list_templates(request: Request, user_id: str = Depends(get_current_user)):
     """List all available resume templates"""
     try:
-        print(f"📋 TEMPLATES: Listing templates for user {user_id}")
-        
-        # Get all active templates from database
-        response = supabase.table("templates")\
-            .select("id, name, slug, schema, preview_url, is_active, created_at, updated_at")\
-            .eq("is_active", True)\
-            .execute()
-        
-        if not response.data:
-            print(f"📋 TEMPLATES: No templates found")
-            return []
-        
-        # Format templates for frontend
-        templates = []
-        for template in response.data:
-            schema = template.get("schema", {})
-            if isinstance(schema, str):
-                try:
-                    schema = json.loads(schema)
-                except:
-                    schema = {}
-            
-            # Extract metadata from schema if available
-            metadata = schema.get("metadata", {}) if isinstance(schema, dict) else {}
-            
-            templates.append({
-                "id": template.get("id"),
-                "slug": template.get("slug"),
-                "name": template.get("name") or metadata.get("name", "Untitled Template"),
-                "description": metadata.get("description", ""),
-                "category": metadata.get("category", "professional"),
-                "badge": metadata.get("badge"),
-                "preview_url": template.get("preview_url"),
-                "colors": metadata.get("colors", []),
-                "is_active": template.get("is_active", True),
-            })
-        
-        print(f"📋 TEMPLATES: Found {len(templates)} template(s)")
-        return templates
-        
+        body, etag = template_list()
+        return _cached_json(request, body, etag)
     except Exception as e:
         print(f"❌ TEMPLATES: Error listing templates: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list templates: {str(e)}")
 
 @router.get("/api/templates/{template_id}")
-async def get_template(template_id: str, user_id: str = Depends(get_current_user)):
+async def get_template(template_id: str, request: Request, user_id: str = Depends(get_current_user)):
     """Get template details by slug or ID"""
     try:
-        print(f"📋 TEMPLATES: Getting template {template_id} for user {user_id}")
-        
-        # Try to find template by slug first (most common case)
-        response = supabase.table("templates")\
-            .select("id, name, slug, schema, preview_url, is_active, created_at, updated_at")\
-            .eq("slug", template_id)\
-            .eq("is_active", True)\
-            .maybe_single()\
-            .execute()
-        
-        # If not found by slug, try by ID (UUID)
-        if not response.data:
-            try:
-                # Check if template_id is a valid UUID
-                UUID(template_id)
-                response = supabase.table("templates")\
-                    .select("id, name, slug, schema, preview_url, is_active, created_at, updated_at")\
-                    .eq("id", template_id)\
-                    .eq("is_active", True)\
-                    .maybe_single()\
-                    .execute()
-            except ValueError:
-                # Not a valid UUID, continue with slug search result (which is None)
-                pass
-        
-        if not response.data:
-            print(f"❌ TEMPLATES: Template {template_id} not found")
-            raise HTTPException(status_code=404, detail=f"Template '{template_id}' not found")
-        
-        template = response.data
-        
-        # Parse schema if it's a string
-        schema = template.get("schema", {})
-        if isinstance(schema, str):
-            try:
-                schema = json.loads(schema)
-            except:
-                schema = {}
-        
-        # Return template with schema
-        result = {
-            "id": template.get("id"),
-            "slug": template.get("slug"),
-            "name": template.get("name"),
-            "schema": schema,
-            "preview_url": template.get("preview_url"),
-            "is_active": template.get("is_active", True),
-        }
-        
-        print(f"📋 TEMPLATES: Template {template_id} found successfully")
-        return result
-        
-    except HTTPException:
-        raise
+        template = find_template(template_id)
     except Exception as e:
         print(f"❌ TEMPLATES: Error getting template {template_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get template: {str(e)}")
+    
+    if template is None:
+        print(f"❌ TEMPLATES: Template {template_id} not found")
+        raise HTTPException(status_code=404, detail=f"Template '{template_id}' not found")
+    
+    return _cached_json(request, template.body, template.etag)
@@ -1,8 +1,12 @@
 """Education management routes"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from supabase_client import supabase
-from models import CreateEducation, UpdateEducation
+from models import CreateEducation, UpdateEducation, BulkEducation, BulkDelete
 from utils.dependencies import get_current_user
+from utils.etag import check_not_modified
+from utils.profile_snapshot import invalidate_profile_snapshot
+from utils.embeddings import queue_profile_embedding
+from utils.bulk_sections import insert_rows, replace_rows, delete_rows
 import sys
 from pathlib import Path
 
@@ -11,9 +15,22 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+def _education_row(user_id: str, education_data: CreateEducation) -> dict:
+    return {
+        "user_id": user_id,
+        "school": education_data.school,
+        "degree": education_data.degree,
+        "start_date": education_data.start_date.isoformat() if education_data.start_date else None,
+        "end_date": education_data.end_date.isoformat() if education_data.end_date else None
+    }
+
 @router.get("/api/education")
-def get_education(user_id: str = Depends(get_current_user)):
+def get_education(request: Request, http_response: Response, user_id: str = Depends(get_current_user)):
     """Get user education from normalized user_education table"""
+    not_modified = check_not_modified(request, http_response, user_id, "education")
+    if not_modified:
+        return not_modified
+    
     try:
         response = supabase.table("user_education").select("*").eq("user_id", user_id).order("start_date", desc=True).execute()
         if response.data:
@@ -27,15 +44,11 @@ def get_education(user_id: str = Depends(get_current_user)):
 def add_education(education_data: CreateEducation, user_id: str = Depends(get_current_user)):
     """Add education to normalized user_education table"""
     try:
-        edu_dict = {
-            "user_id": user_id,
-            "school": education_data.school,
-            "degree": education_data.degree,
-            "start_date": education_data.start_date.isoformat() if education_data.start_date else None,
-            "end_date": education_data.end_date.isoformat() if education_data.end_date else None
-        }
+        edu_dict = _education_row(user_id, education_data)
         
         response = supabase.table("user_education").insert(edu_dict).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -44,6 +57,46 @@ def add_education(education_data: CreateEducation, user_id: str = Depends(get_cu
         print(f"Error adding education: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to add education: {str(e)}")
 
+@router.post("/api/education/bulk")
+def bulk_add_education(payload: BulkEducation, user_id: str = Depends(get_current_user)):
+    """Add many education entries in one statement"""
+    try:
+        rows = insert_rows("user_education", [_education_row(user_id, item) for item in payload.items])
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error adding education: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to add education: {str(e)}")
+
+@router.put("/api/education/bulk")
+def replace_education(payload: BulkEducation, user_id: str = Depends(get_current_user)):
+    """Replace all of the user's education with the given list"""
+    try:
+        rows = replace_rows("user_education", user_id, [_education_row(user_id, item) for item in payload.items])
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error replacing education: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to replace education: {str(e)}")
+
+@router.delete("/api/education/bulk")
+def bulk_delete_education(payload: BulkDelete, user_id: str = Depends(get_current_user)):
+    """Delete several education entries by id in one statement"""
+    try:
+        rows = delete_rows("user_education", user_id, payload.ids)
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return {"success": True, "deleted": [row["id"] for row in rows]}
+    except Exception as e:
+        print(f"Error deleting education: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to delete education: {str(e)}")
+
 @router.put("/api/education/{education_id}")
 def update_education(education_id: str, education_data: UpdateEducation, user_id: str = Depends(get_current_user)):
     """Update education in normalized user_education table"""
@@ -62,6 +115,8 @@ def update_education(education_id: str, education_data: UpdateEducation, user_id
             raise HTTPException(status_code=400, detail="No fields to update")
         
         response = supabase.table("user_education").update(update_dict).eq("id", education_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -77,6 +132,8 @@ def delete_education(education_id: str, user_id: str = Depends(get_current_user)
     """Delete education from normalized user_education table"""
     try:
         response = supabase.table("user_education").delete().eq("id", education_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         return {"success": True, "message": "Education deleted successfully"}
     except Exception as e:
         print(f"Error deleting education: {str(e)}")
@@ -1,8 +1,12 @@
 """Work experience management routes"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from supabase_client import supabase
-from models import CreateExperience, UpdateExperience
+from models import CreateExperience, UpdateExperience, BulkExperience, BulkDelete
 from utils.dependencies import get_current_user
+from utils.etag import check_not_modified
+from utils.profile_snapshot import invalidate_profile_snapshot
+from utils.embeddings import queue_profile_embedding
+from utils.bulk_sections import insert_rows, replace_rows, delete_rows
 import sys
 from pathlib import Path
 
@@ -11,9 +15,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+def _experience_row(user_id: str, experience_data: CreateExperience) -> dict:
+    """Validate and build a user_work_experience row"""
+    if not experience_data.title or not experience_data.title.strip():
+        raise HTTPException(status_code=400, detail="Please enter a job title")
+    
+    if not experience_data.company or not experience_data.company.strip():
+        raise HTTPException(status_code=400, detail="Please enter a company name")
+    
+    return {
+        "user_id": user_id,
+        "title": experience_data.title.strip(),
+        "company": experience_data.company.strip(),
+        "location": experience_data.location.strip() if experience_data.location else None,
+        "start_date": experience_data.start_date.isoformat() if experience_data.start_date else None,
+        "end_date": experience_data.end_date.isoformat() if experience_data.end_date else None,
+        "is_current": experience_data.is_current,
+        "description": experience_data.description.strip() if experience_data.description else None
+    }
+
 @router.get("/api/experience")
-def get_experience(user_id: str = Depends(get_current_user)):
+def get_experience(request: Request, http_response: Response, user_id: str = Depends(get_current_user)):
     """Get user work experience from normalized user_work_experience table"""
+    not_modified = check_not_modified(request, http_response, user_id, "experience")
+    if not_modified:
+        return not_modified
+    
     try:
         response = supabase.table("user_work_experience").select("*").eq("user_id", user_id).order("start_date", desc=True).execute()
         if response.data:
@@ -27,25 +54,12 @@ def get_experience(user_id: str = Depends(get_current_user)):
 def add_experience(experience_data: CreateExperience, user_id: str = Depends(get_current_user)):
     """Add work experience to normalized user_work_experience table"""
     try:
-        # Validate required fields
-        if not experience_data.title or not experience_data.title.strip():
-            raise HTTPException(status_code=400, detail="Please enter a job title")
-        
-        if not experience_data.company or not experience_data.company.strip():
-            raise HTTPException(status_code=400, detail="Please enter a company name")
-        
-        exp_dict = {
-            "user_id": user_id,
-            "title": experience_data.title.strip(),
-            "company": experience_data.company.strip(),
-            "location": experience_data.location.strip() if experience_data.location else None,
-            "start_date": experience_data.start_date.isoformat() if experience_data.start_date else None,
-            "end_date": experience_data.end_date.isoformat() if experience_data.end_date else None,
-            "is_current": experience_data.is_current,
-            "description": experience_data.description.strip() if experience_data.description else None
-        }
+        # Validates required fields
+        exp_dict = _experience_row(user_id, experience_data)
         
         response = supabase.table("user_work_experience").insert(exp_dict).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -61,6 +75,46 @@ def add_experience(experience_data: CreateExperience, user_id: str = Depends(get
         # Return user-friendly error message
         raise HTTPException(status_code=400, detail="Failed to add experience. Please check your input and try again.")
 
+@router.post("/api/experience/bulk")
+def bulk_add_experience(payload: BulkExperience, user_id: str = Depends(get_current_user)):
+    """Add many work experience entries in one statement"""
+    try:
+        rows = insert_rows("user_work_experience", [_experience_row(user_id, item) for item in payload.items])
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error adding experience: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to add experience: {str(e)}")
+
+@router.put("/api/experience/bulk")
+def replace_experience(payload: BulkExperience, user_id: str = Depends(get_current_user)):
+    """Replace all of the user's work experience with the given list"""
+    try:
+        rows = replace_rows("user_work_experience", user_id, [_experience_row(user_id, item) for item in payload.items])
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error replacing experience: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to replace experience: {str(e)}")
+
+@router.delete("/api/experience/bulk")
+def bulk_delete_experience(payload: BulkDelete, user_id: str = Depends(get_current_user)):
+    """Delete several work experience entries by id in one statement"""
+    try:
+        rows = delete_rows("user_work_experience", user_id, payload.ids)
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return {"success": True, "deleted": [row["id"] for row in rows]}
+    except Exception as e:
+        print(f"Error deleting experience: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to delete experience: {str(e)}")
+
 @router.put("/api/experience/{experience_id}")
 def update_experience(experience_id: str, experience_data: UpdateExperience, user_id: str = Depends(get_current_user)):
     """Update work experience in normalized user_work_experience table"""
@@ -101,6 +155,8 @@ def update_experience(experience_id: str, experience_data: UpdateExperience, use
             update_dict["description"] = update_dict["description"].strip()
         
         response = supabase.table("user_work_experience").update(update_dict).eq("id", experience_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -121,6 +177,8 @@ def delete_experience(experience_id: str, user_id: str = Depends(get_current_use
     """Delete work experience from normalized user_work_experience table"""
     try:
         response = supabase.table("user_work_experience").delete().eq("id", experience_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         return {"success": True, "message": "Experience deleted successfully"}
     except Exception as e:
         print(f"Error deleting experience: {str(e)}")
@@ -1,11 +1,15 @@
 """Job management routes"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from fastapi.encoders import jsonable_encoder
 from supabase_client import supabase
-from models import Job, CreateJob, UpdateJob
+from models import Job, CreateJob, UpdateJob, JobListQuery, JobChanges, BulkUpdateJobs, BulkUpdateJobsResponse, JobSearchResponse, JobSuggestion
 from uuid import UUID
-from typing import List
+from typing import Annotated, List, Optional
 from utils.dependencies import get_current_user
+from utils.etag import check_not_modified
+from utils.job_autocomplete import suggest_job_values, invalidate_job_suggestions, AUTOCOMPLETE_FIELDS
+from utils.embeddings import EMBEDDED_JOB_FIELDS, invalidate_job_embeddings, queue_job_embeddings
+from utils.pagination import encode_cursor, decode_cursor, postgrest_quote
 import sys
 from pathlib import Path
 
@@ -14,11 +18,83 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+# Explicit column list so internal columns such as search_vector are never fetched
+JOB_COLUMNS = ",".join(Job.model_fields)
+# Columns every job list row carries: the Job model requires them and the cursor is built from them
+JOB_LIST_REQUIRED_FIELDS = ("id", "user_id", "job_title", "company", "status", "updated_at")
+# Page size when a cursor is passed without a limit
+JOB_LIST_DEFAULT_LIMIT = 500
+# Rows per request when an unpaged list is assembled (PostgREST caps responses at max-rows)
+JOB_LIST_FETCH_CHUNK = 1000
+JOB_CHANGES_FETCH_CHUNK = 200
+# Columns declared NOT NULL on public.jobs
+JOB_NOT_NULL_FIELDS = ("job_title", "company", "status")
+
+def _job_list_columns(fields: Optional[str]) -> str:
+    if not fields:
+        requested = tuple(Job.model_fields)
+    else:
+        requested = tuple(field.strip() for field in fields.split(",") if field.strip())
+        if "*" in requested:
+            requested = tuple(Job.model_fields)
+        unknown = [field for field in requested if field not in Job.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown job fields: {', '.join(unknown)}")
+    return ",".join(dict.fromkeys(JOB_LIST_REQUIRED_FIELDS + requested))
+
+def _list_jobs(user_id: str, params: JobListQuery, response: Response) -> List[dict]:
+    """The user's jobs, newest first, keyed on (updated_at, id).
+
+    With a limit or cursor this is one page; when more rows remain, the cursor
+    for the next page is returned in the X-Next-Cursor header so the body stays
+    a plain list. Without either, every matching job is returned.
+    """
+    columns = _job_list_columns(params.fields)
+    statuses = [s.strip() for value in params.status or [] for s in value.split(",") if s.strip()]
+    
+    def page(cursor: Optional[str], size: int) -> List[dict]:
+        query = supabase.table("jobs").select(columns).eq("user_id", user_id)
+        if statuses:
+            query = query.in_("status", statuses)
+        if params.company:
+            query = query.ilike("company", f"%{params.company.strip()}%")
+        if params.date_applied_from:
+            query = query.gte("date_applied", params.date_applied_from.isoformat())
+        if params.date_applied_to:
+            query = query.lte("date_applied", params.date_applied_to.isoformat())
+        if params.updated_after:
+            query = query.gt("updated_at", params.updated_after.isoformat())
+        if cursor:
+            updated_at, job_id = (postgrest_quote(v) for v in decode_cursor(cursor, 2))
+            query = query.or_(f"updated_at.lt.{updated_at},and(updated_at.eq.{updated_at},id.lt.{job_id})")
+        return query.order("updated_at", desc=True).order("id", desc=True).limit(size).execute().data or []
+    
+    if params.limit is None and params.cursor is None:
+        rows: List[dict] = []
+        cursor = None
+        while True:
+            chunk = page(cursor, JOB_LIST_FETCH_CHUNK)
+            rows.extend(chunk)
+            if len(chunk) < JOB_LIST_FETCH_CHUNK:
+                return rows
+            cursor = encode_cursor(chunk[-1]["updated_at"], chunk[-1]["id"])
+    
+    limit = params.limit or JOB_LIST_DEFAULT_LIMIT
+    # Fetch one extra row to learn whether another page exists
+    rows = page(params.cursor, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["updated_at"], last["id"])
+    return rows
+
 @router.post("/jobs", response_model=Job)
 def create_job(job: CreateJob, user_id: str = Depends(get_current_user)):
     data = jsonable_encoder(job, exclude_unset=True)
     data["user_id"] = user_id
     response = supabase.table("jobs").insert(data).execute()
+    invalidate_job_suggestions(user_id)
+    queue_job_embeddings(user_id)
     if response.data:
         return response.data[0]
     raise HTTPException(status_code=400, detail="Job creation failed")
@@ -32,6 +108,8 @@ def create_job_api(job: CreateJob, user_id: str = Depends(get_current_user)):
         
         print(f"Creating job with data: {data}")  # Debug log
         response = supabase.table("jobs").insert(data).execute()
+        invalidate_job_suggestions(user_id)
+        queue_job_embeddings(user_id)
         print(f"Supabase response: {response.data}")  # Debug log
         
         if response.data:
@@ -41,21 +119,177 @@ def create_job_api(job: CreateJob, user_id: str = Depends(get_current_user)):
         print(f"Error creating job: {str(e)}")  # Debug log
         raise HTTPException(status_code=400, detail=f"Job creation failed: {str(e)}")
 
-@router.get("/api/jobs", response_model=List[Job])
-def get_jobs_api(user_id: str = Depends(get_current_user)):
-    """Get all jobs for the authenticated user"""
+@router.get("/api/jobs", response_model=List[Job], response_model_exclude_unset=True)
+def get_jobs_api(request: Request, response: Response, params: Annotated[JobListQuery, Query()], user_id: str = Depends(get_current_user)):
+    """Get a page of jobs for the authenticated user"""
+    not_modified = check_not_modified(request, response, user_id, "jobs")
+    if not_modified:
+        return not_modified
+    
     try:
-        response = supabase.table("jobs").select("*").eq("user_id", user_id).execute()
-        return response.data
+        return _list_jobs(user_id, params, response)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error getting jobs: {str(e)}")  # Debug log
         raise HTTPException(status_code=400, detail=f"Failed to get jobs: {str(e)}")
 
+# Declared before /api/jobs/{job_id} so "changes" is not parsed as a job id
+@router.get("/api/jobs/changes", response_model=JobChanges, response_model_exclude_unset=True)
+def get_job_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    fields: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """Jobs created, updated or deleted since `since` (omit it to sync from scratch)"""
+    try:
+        since_txid, since_id = (int(value) for value in decode_cursor(since, 2)) if since else (0, 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    try:
+        reset = False
+        if since_txid:
+            # Deletes up to pruned_txid may have been pruned from the log (prune_job_changes)
+            horizon = (
+                supabase.table("job_changes_horizon")
+                .select("pruned_txid")
+                .eq("user_id", user_id)
+                .execute()
+            ).data or []
+            if horizon and since_txid <= horizon[0]["pruned_txid"]:
+                since_txid, since_id, reset = 0, 0, True
+        
+        # (txid, id) order, holding back rows whose transaction may still have an
+        # uncommitted change before them (see get_job_changes)
+        changes = supabase.rpc("get_job_changes", {
+            "p_user_id": user_id,
+            "p_since_txid": since_txid,
+            "p_since_id": since_id,
+            "p_limit": limit + 1
+        }).execute().data or []
+        
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        # Only the latest change per job matters; row locks on jobs order changes to
+        # one job by id, not by txid
+        latest_ops = {}
+        for change in sorted(changes, key=lambda change: change["id"]):
+            latest_ops.pop(change["job_id"], None)
+            latest_ops[change["job_id"]] = change["op"]
+        
+        upsert_ids = [job_id for job_id, op in latest_ops.items() if op == "upsert"]
+        upserted = []
+        columns = _job_list_columns(fields)
+        # Chunked to keep the id=in.(...) filter well under URL length limits
+        for start in range(0, len(upsert_ids), JOB_CHANGES_FETCH_CHUNK):
+            upserted.extend(
+                supabase.table("jobs")
+                .select(columns)
+                .eq("user_id", user_id)
+                .in_("id", upsert_ids[start:start + JOB_CHANGES_FETCH_CHUNK])
+                .execute()
+                .data or []
+            )
+        
+        return {
+            "upserted": upserted,
+            "deleted": [job_id for job_id, op in latest_ops.items() if op == "delete"],
+            "cursor": encode_cursor(*((changes[-1]["txid"], changes[-1]["id"]) if changes else (since_txid, since_id))),
+            "has_more": has_more,
+            "reset": reset
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error getting job changes: {str(e)}")  # Debug log
+        raise HTTPException(status_code=400, detail=f"Failed to get job changes: {str(e)}")
+
+@router.patch("/api/jobs/bulk", response_model=BulkUpdateJobsResponse)
+def bulk_update_jobs(payload: BulkUpdateJobs, user_id: str = Depends(get_current_user)):
+    """Apply many job updates (e.g. a multi-card Kanban move) in one statement"""
+    ids = [str(update.id) for update in payload.updates]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each job may appear only once per bulk update")
+    
+    results = {}
+    updates = []
+    for update in payload.updates:
+        data = jsonable_encoder(update, exclude_unset=True)
+        null_fields = [field for field in JOB_NOT_NULL_FIELDS if field in data and data[field] is None]
+        if null_fields:
+            results[data["id"]] = {"id": data["id"], "success": False, "error": f"{', '.join(null_fields)} cannot be null"}
+        else:
+            updates.append(data)
+    
+    try:
+        if updates:
+            response = supabase.rpc("bulk_update_jobs", {"p_user_id": user_id, "p_updates": updates}).execute()
+            invalidate_job_suggestions(user_id)
+            if any(field in update for update in updates for field in EMBEDDED_JOB_FIELDS):
+                queue_job_embeddings(user_id)
+            else:
+                invalidate_job_embeddings(user_id)
+            for result in response.data or []:
+                results[str(result["id"])] = result
+    except Exception as e:
+        print(f"Error bulk updating jobs: {str(e)}")  # Debug log
+        raise HTTPException(status_code=400, detail=f"Bulk job update failed: {str(e)}")
+    
+    ordered = [results.get(job_id, {"id": job_id, "success": False, "error": "Job not found"}) for job_id in ids]
+    updated = sum(1 for result in ordered if result["success"])
+    return {"results": ordered, "updated": updated, "failed": len(ordered) - updated}
+
+@router.get("/api/jobs/search", response_model=JobSearchResponse)
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user_id: str = Depends(get_current_user)
+):
+    """Ranked full-text search over the user's jobs with highlighted snippets"""
+    try:
+        # One extra row tells us whether another page exists
+        response = supabase.rpc("search_jobs", {
+            "p_user_id": user_id,
+            "p_query": q,
+            "p_limit": limit + 1,
+            "p_offset": offset
+        }).execute()
+        hits = response.data or []
+        has_more = len(hits) > limit
+        return {
+            "results": hits[:limit],
+            "has_more": has_more,
+            "next_offset": offset + limit if has_more else None
+        }
+    except Exception as e:
+        print(f"Error searching jobs: {str(e)}")  # Debug log
+        raise HTTPException(status_code=400, detail=f"Job search failed: {str(e)}")
+
+@router.get("/api/jobs/autocomplete", response_model=List[JobSuggestion])
+def autocomplete_jobs(
+    field: str = Query(..., description="company or job_title"),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    user_id: str = Depends(get_current_user)
+):
+    """Suggest companies or job titles the user has already saved"""
+    if field not in AUTOCOMPLETE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of: {', '.join(AUTOCOMPLETE_FIELDS)}")
+    try:
+        return suggest_job_values(user_id, field, q, limit)
+    except Exception as e:
+        print(f"Error getting job suggestions: {str(e)}")  # Debug log
+        raise HTTPException(status_code=400, detail=f"Failed to get suggestions: {str(e)}")
+
 @router.get("/api/jobs/{job_id}", response_model=Job)
 def get_job_api(job_id: UUID, user_id: str = Depends(get_current_user)):
     """Get a specific job by ID for the authenticated user"""
     try:
-        response = supabase.table("jobs").select("*").eq("id", str(job_id)).eq("user_id", user_id).execute()
+        response = supabase.table("jobs").select(JOB_COLUMNS).eq("id", str(job_id)).eq("user_id", user_id).execute()
         
         if response.data:
             return response.data[0]
@@ -72,6 +306,11 @@ def update_job_api(job_id: UUID, job: UpdateJob, user_id: str = Depends(get_curr
         
         # Ensure we're only updating the current user's job
         response = supabase.table("jobs").update(data).eq("id", str(job_id)).eq("user_id", user_id).execute()
+        invalidate_job_suggestions(user_id)
+        if any(field in data for field in EMBEDDED_JOB_FIELDS):
+            queue_job_embeddings(user_id)
+        else:
+            invalidate_job_embeddings(user_id)
         
         if response.data:
             return response.data[0]
@@ -85,6 +324,8 @@ def delete_job_api(job_id: UUID, user_id: str = Depends(get_current_user)):
     """Delete a job by ID for the authenticated user"""
     try:
         response = supabase.table("jobs").delete().eq("id", str(job_id)).eq("user_id", user_id).execute()
+        invalidate_job_suggestions(user_id)
+        invalidate_job_embeddings(user_id)
         
         if response.data:
             return {"success": True, "message": "Job deleted successfully"}
@@ -93,14 +334,16 @@ def delete_job_api(job_id: UUID, user_id: str = Depends(get_current_user)):
         print(f"Error deleting job: {str(e)}")  # Debug log
         raise HTTPException(status_code=400, detail=f"Job deletion failed: {str(e)}")
 
-@router.get("/jobs", response_model=List[Job])
-def get_jobs(user_id: str = Depends(get_current_user)):
-    response = supabase.table("jobs").select("*").eq("user_id", str(user_id)).execute()
-    return response.data
+@router.get("/jobs", response_model=List[Job], response_model_exclude_unset=True)
+def get_jobs(request: Request, response: Response, params: Annotated[JobListQuery, Query()], user_id: str = Depends(get_current_user)):
+    not_modified = check_not_modified(request, response, str(user_id), "jobs")
+    if not_modified:
+        return not_modified
+    return _list_jobs(str(user_id), params, response)
 
 @router.get("/jobs/{job_id}", response_model=Job)
 def get_job(job_id: UUID, user_id: str = Depends(get_current_user)):
-    response = supabase.table("jobs").select("*").eq("id", str(job_id)).eq("user_id", str(user_id)).single().execute()
+    response = supabase.table("jobs").select(JOB_COLUMNS).eq("id", str(job_id)).eq("user_id", str(user_id)).single().execute()
     if response.data:
         return response.data
     raise HTTPException(status_code=404, detail="Job not found")
@@ -109,6 +352,8 @@ def get_job(job_id: UUID, user_id: str = Depends(get_current_user)):
 def update_job(job_id: UUID, job: Job, user_id: str = Depends(get_current_user)):
     data = jsonable_encoder(job, exclude_unset=True)
     response = supabase.table("jobs").update(data).eq("id", str(job_id)).eq("user_id", str(user_id)).execute()
+    invalidate_job_suggestions(str(user_id))
+    queue_job_embeddings(str(user_id))
     if response.data:
         return response.data[0]
     raise HTTPException(status_code=400, detail="Job update failed")
@@ -116,6 +361,8 @@ def update_job(job_id: UUID, job: Job, user_id: str = Depends(get_current_user))
 @router.delete("/jobs/{job_id}")
 def delete_job(job_id: UUID, user_id: str = Depends(get_current_user)):
     response = supabase.table("jobs").delete().eq("id", str(job_id)).eq("user_id", str(user_id)).execute()
+    invalidate_job_suggestions(str(user_id))
+    invalidate_job_embeddings(str(user_id))
     if response.data:
         return {"success": True}
     raise HTTPException(status_code=404, detail="Job not found")
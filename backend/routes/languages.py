@@ -1,8 +1,11 @@
 """Languages management routes"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from supabase_client import supabase
-from models import CreateLanguage, UpdateLanguage
+from models import CreateLanguage, UpdateLanguage, BulkLanguages, BulkDelete
 from utils.dependencies import get_current_user
+from utils.etag import check_not_modified
+from utils.profile_snapshot import invalidate_profile_snapshot
+from utils.bulk_sections import insert_rows, replace_rows, delete_rows
 import sys
 from pathlib import Path
 
@@ -11,9 +14,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+def _language_row(user_id: str, language_data: CreateLanguage) -> dict:
+    return {
+        "user_id": user_id,
+        "language": language_data.language,
+        "proficiency": language_data.proficiency
+    }
+
 @router.get("/api/languages")
-def get_languages(user_id: str = Depends(get_current_user)):
+def get_languages(request: Request, http_response: Response, user_id: str = Depends(get_current_user)):
     """Get user languages from normalized user_languages table"""
+    not_modified = check_not_modified(request, http_response, user_id, "languages")
+    if not_modified:
+        return not_modified
+    
     try:
         response = supabase.table("user_languages").select("*").eq("user_id", user_id).order("created_at", desc=False).execute()
         if response.data:
@@ -27,13 +41,10 @@ def get_languages(user_id: str = Depends(get_current_user)):
 def create_language(language_data: CreateLanguage, user_id: str = Depends(get_current_user)):
     """Add language to normalized user_languages table"""
     try:
-        language_dict = {
-            "user_id": user_id,
-            "language": language_data.language,
-            "proficiency": language_data.proficiency
-        }
+        language_dict = _language_row(user_id, language_data)
         
         response = supabase.table("user_languages").insert(language_dict).execute()
+        invalidate_profile_snapshot(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -45,6 +56,43 @@ def create_language(language_data: CreateLanguage, user_id: str = Depends(get_cu
             raise HTTPException(status_code=400, detail="Language already exists")
         raise HTTPException(status_code=400, detail=f"Failed to add language: {str(e)}")
 
+@router.post("/api/languages/bulk")
+def bulk_add_languages(payload: BulkLanguages, user_id: str = Depends(get_current_user)):
+    """Add many languages in one statement (existing languages are updated)"""
+    try:
+        rows = insert_rows("user_languages", [_language_row(user_id, item) for item in payload.items], on_conflict="user_id,language")
+        invalidate_profile_snapshot(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error adding languages: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to add languages: {str(e)}")
+
+@router.put("/api/languages/bulk")
+def replace_languages(payload: BulkLanguages, user_id: str = Depends(get_current_user)):
+    """Replace all of the user's languages with the given list"""
+    try:
+        rows = replace_rows("user_languages", user_id, [_language_row(user_id, item) for item in payload.items], on_conflict="user_id,language")
+        invalidate_profile_snapshot(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error replacing languages: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to replace languages: {str(e)}")
+
+@router.delete("/api/languages/bulk")
+def bulk_delete_languages(payload: BulkDelete, user_id: str = Depends(get_current_user)):
+    """Delete several languages by id in one statement"""
+    try:
+        rows = delete_rows("user_languages", user_id, payload.ids)
+        invalidate_profile_snapshot(user_id)
+        return {"success": True, "deleted": [row["id"] for row in rows]}
+    except Exception as e:
+        print(f"Error deleting languages: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to delete languages: {str(e)}")
+
 @router.put("/api/languages/{language_id}")
 def update_language(language_id: str, language_data: UpdateLanguage, user_id: str = Depends(get_current_user)):
     """Update language in normalized user_languages table"""
@@ -59,6 +107,7 @@ def update_language(language_id: str, language_data: UpdateLanguage, user_id: st
             raise HTTPException(status_code=400, detail="No fields to update")
         
         response = supabase.table("user_languages").update(update_dict).eq("id", language_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -74,6 +123,7 @@ def delete_language(language_id: str, user_id: str = Depends(get_current_user)):
     """Delete language from normalized user_languages table"""
     try:
         response = supabase.table("user_languages").delete().eq("id", language_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
         return {"success": True, "message": "Language deleted successfully"}
     except Exception as e:
         print(f"Error deleting language: {str(e)}")
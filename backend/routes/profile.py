@@ -1,12 +1,19 @@
 """Profile management routes"""
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Header
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Header, Request, Response
 from fastapi.encoders import jsonable_encoder
 from supabase_client import supabase
-from models import ProfileResponse, UpdateProfile, ProfileStats
-from datetime import datetime
+from models import ProfileResponse, UpdateProfile, ProfileStats, FullProfileUpdate
 from utils.dependencies import get_current_user
 from utils.file_upload import upload_profile_picture_to_supabase
+from utils.etag import check_not_modified, resource_version
+from utils.job_stats import fetch_status_counts
+from utils.job_autocomplete import invalidate_job_suggestions
+from utils.user_email import aget_user_email, get_user_email, forget_user_email
+from utils.profile_write import upsert_profile
+from utils.embeddings import queue_profile_embedding
+from utils.profile_snapshot import aload_profile_snapshot, invalidate_profile_snapshot, store_profile_snapshot, SNAPSHOT_SECTIONS
 from typing import Optional
+import asyncio
 import sys
 from pathlib import Path
 
@@ -15,22 +22,54 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+def _build_profile_response(profile: dict, snapshot: dict, email_result) -> ProfileResponse:
+    """Attach the normalized sections and auth email to a user_profile row"""
+    for section in SNAPSHOT_SECTIONS:
+        profile[section] = snapshot[section]
+    
+    # Ensure profile_completed defaults to False if not set
+    if "profile_completed" not in profile or profile["profile_completed"] is None:
+        profile["profile_completed"] = False
+    
+    # Prefer the email from auth.users, falling back to user_profile if the lookup failed
+    if isinstance(email_result, Exception):
+        print(f"Warning: Could not fetch email from auth.users: {str(email_result)}")
+        if "email" not in profile or not profile["email"]:
+            profile["email"] = None
+    elif not profile.get("email"):
+        profile["email"] = email_result
+    
+    return ProfileResponse(**profile)
+
 @router.get("/api/profile", response_model=ProfileResponse)
-def get_profile(user_id: str = Depends(get_current_user), authorization: Optional[str] = Header(None)):
+async def get_profile(request: Request, response: Response, user_id: str = Depends(get_current_user), authorization: Optional[str] = Header(None)):
     """Get user profile with normalized data"""
+    # The body is loaded under the same version as the ETag: a snapshot this worker
+    # cached before another worker's write must not be served under the new ETag
+    version = await asyncio.to_thread(resource_version, user_id, "profile")
+    if version is not None:
+        not_modified = check_not_modified(request, response, user_id, "profile", version)
+        if not_modified:
+            return not_modified
+    
     try:
-        # Get basic profile
-        try:
-            profile_response = supabase.table("user_profile").select("*").eq("user_id", user_id).execute()
-        except Exception as e:
-            error_msg = str(e).lower()
+        # The snapshot and the auth email lookup are independent; issue them concurrently
+        # (both are served from in-process caches when warm)
+        snapshot_result, email_result = await asyncio.gather(
+            aload_profile_snapshot(user_id, resource_version=version),
+            aget_user_email(user_id),
+            return_exceptions=True
+        )
+        
+        if isinstance(snapshot_result, Exception):
+            error_msg = str(snapshot_result).lower()
             if "connection" in error_msg or "disconnected" in error_msg or "network" in error_msg:
                 raise HTTPException(status_code=503, detail="Database connection error. Please try again.")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Database error: {str(snapshot_result)}")
+        snapshot = snapshot_result
         
-        if profile_response.data and len(profile_response.data) > 0:
-            profile = profile_response.data[0]
-        else:
+        profile = snapshot["profile"]
+        if not profile:
             # Create default profile if none exists
             default_profile = {
                 "user_id": user_id,
@@ -39,64 +78,15 @@ def get_profile(user_id: str = Depends(get_current_user), authorization: Optiona
                 "location": ""
             }
             try:
-                insert_response = supabase.table("user_profile").insert(default_profile).execute()
+                insert_response = await asyncio.to_thread(
+                    lambda: supabase.table("user_profile").insert(default_profile).execute()
+                )
                 profile = insert_response.data[0]
+                invalidate_profile_snapshot(user_id)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed to create profile: {str(e)}")
         
-        # Fetch normalized data (handle case where tables might not exist yet)
-        try:
-            skills_response = supabase.table("user_skills").select("*").eq("user_id", user_id).execute()
-            profile["skills"] = skills_response.data or []
-        except Exception as e:
-            print(f"Warning: Could not fetch skills: {str(e)}")
-            profile["skills"] = []
-        
-        try:
-            experience_response = supabase.table("user_work_experience").select("*").eq("user_id", user_id).execute()
-            profile["work_experience"] = experience_response.data or []
-        except Exception as e:
-            print(f"Warning: Could not fetch work experience: {str(e)}")
-            profile["work_experience"] = []
-        
-        try:
-            education_response = supabase.table("user_education").select("*").eq("user_id", user_id).execute()
-            profile["education"] = education_response.data or []
-        except Exception as e:
-            print(f"Warning: Could not fetch education: {str(e)}")
-            profile["education"] = []
-        
-        try:
-            languages_response = supabase.table("user_languages").select("*").eq("user_id", user_id).execute()
-            profile["languages"] = languages_response.data or []
-        except Exception as e:
-            print(f"Warning: Could not fetch languages: {str(e)}")
-            profile["languages"] = []
-        
-        # Ensure profile_completed defaults to False if not set
-        if "profile_completed" not in profile or profile["profile_completed"] is None:
-            profile["profile_completed"] = False
-        
-        # Fetch email from auth.users (email is managed by auth, not user_profile)
-        # Use admin API to get user email by user_id (more reliable than token)
-        try:
-            # First check if email exists in user_profile (fallback)
-            if "email" in profile and profile["email"]:
-                pass  # Email already in profile
-            else:
-                # Use admin API to get user from auth.users
-                user_response = supabase.auth.admin.get_user_by_id(user_id)
-                if user_response and user_response.user and user_response.user.email:
-                    profile["email"] = user_response.user.email
-                else:
-                    profile["email"] = None
-        except Exception as e:
-            print(f"Warning: Could not fetch email from auth.users: {str(e)}")
-            # Fallback to email in user_profile if it exists
-            if "email" not in profile or not profile["email"]:
-                profile["email"] = None
-        
-        return ProfileResponse(**profile)
+        return _build_profile_response(profile, snapshot, email_result)
     except HTTPException:
         raise
     except Exception as e:
@@ -106,40 +96,68 @@ def get_profile(user_id: str = Depends(get_current_user), authorization: Optiona
             raise HTTPException(status_code=503, detail="Database connection error. Please try again.")
         raise HTTPException(status_code=400, detail=f"Failed to get profile: {str(e)}")
 
+@router.put("/api/profile/full", response_model=ProfileResponse)
+async def replace_full_profile(payload: FullProfileUpdate, user_id: str = Depends(get_current_user)):
+    """Save the profile row and any provided sections in one transaction"""
+    # An empty object still creates the profile row if it is missing
+    profile_data = {}
+    if payload.profile is not None:
+        profile_data = jsonable_encoder(payload.profile, exclude_unset=True)
+        # email is managed by auth.users, not user_profile
+        profile_data.pop("email", None)
+    
+    sections = {}
+    for section in SNAPSHOT_SECTIONS:
+        items = getattr(payload, section)
+        if items is not None:
+            sections[section] = jsonable_encoder(items)
+    # Skills and languages are keyed by name; keep the last entry for each
+    for section, key in (("skills", "name"), ("languages", "language")):
+        if section in sections:
+            sections[section] = list({item[key]: item for item in sections[section]}.values())
+    
+    try:
+        rpc_result, email_result = await asyncio.gather(
+            asyncio.to_thread(
+                lambda: supabase.rpc("replace_profile", {
+                    "p_user_id": user_id,
+                    "p_profile": profile_data,
+                    "p_sections": sections
+                }).execute()
+            ),
+            aget_user_email(user_id),
+            return_exceptions=True
+        )
+        if isinstance(rpc_result, Exception):
+            raise rpc_result
+        
+        snapshot = store_profile_snapshot(user_id, rpc_result.data)
+        queue_profile_embedding(user_id)
+        return _build_profile_response(snapshot["profile"], snapshot, email_result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        invalidate_profile_snapshot(user_id)
+        print(f"Error replacing profile: {str(e)}")
+        # replace_profile raises P0002 for an experience/education id the user does not own
+        if getattr(e, "code", None) == "P0002":
+            raise HTTPException(status_code=404, detail=getattr(e, "message", None) or str(e))
+        raise HTTPException(status_code=400, detail=f"Profile save failed: {str(e)}")
+
 @router.post("/api/profile/update", response_model=ProfileResponse)
 def update_profile(profile_data: UpdateProfile, user_id: str = Depends(get_current_user), authorization: Optional[str] = Header(None)):
     """Update user profile"""
     try:
         data = jsonable_encoder(profile_data, exclude_unset=True)
-        data["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Remove email if it exists - email is managed by auth.users, not user_profile
-        # The email column might not exist in user_profile table
-        if "email" in data:
-            del data["email"]
         
-        # Check if profile exists
-        existing = supabase.table("user_profile").select("id").eq("user_id", user_id).execute()
+        # Update or create the profile in one round trip (email is dropped; it lives in auth.users)
+        updated_profile = upsert_profile(user_id, data)
         
-        if existing.data:
-            # Update existing profile
-            response = supabase.table("user_profile").update(data).eq("user_id", user_id).execute()
-        else:
-            # Create new profile
-            data["user_id"] = user_id
-            response = supabase.table("user_profile").insert(data).execute()
-        
-        if response.data:
-            updated_profile = response.data[0]
+        if updated_profile:
             # Fetch email from auth.users (email is managed by auth, not user_profile)
             try:
-                # Use admin API to get user email by user_id (more reliable than token)
                 if "email" not in updated_profile or not updated_profile["email"]:
-                    user_response = supabase.auth.admin.get_user_by_id(user_id)
-                    if user_response and user_response.user and user_response.user.email:
-                        updated_profile["email"] = user_response.user.email
-                    else:
-                        updated_profile["email"] = None
+                    updated_profile["email"] = get_user_email(user_id)
             except Exception as e:
                 print(f"Warning: Could not fetch email from auth.users: {str(e)}")
                 # Fallback to email in user_profile if it exists
@@ -170,16 +188,9 @@ async def upload_profile_picture(file: UploadFile = File(...), user_id: str = De
         file_url = await upload_profile_picture_to_supabase(file, file_content, user_id)
         
         # Update profile with new picture URL
-        data = {"profile_picture_url": file_url, "updated_at": datetime.utcnow().isoformat()}
-        
-        existing = supabase.table("user_profile").select("id").eq("user_id", user_id).execute()
-        if existing.data:
-            response = supabase.table("user_profile").update(data).eq("user_id", user_id).execute()
-        else:
-            data["user_id"] = user_id
-            response = supabase.table("user_profile").insert(data).execute()
+        updated_profile = await asyncio.to_thread(upsert_profile, user_id, {"profile_picture_url": file_url})
         
-        if response.data:
+        if updated_profile:
             return {"profile_picture_url": file_url}
         raise HTTPException(status_code=400, detail="Failed to update profile picture")
     except HTTPException:
@@ -192,27 +203,13 @@ async def upload_profile_picture(file: UploadFile = File(...), user_id: str = De
 def get_profile_stats(user_id: str = Depends(get_current_user)):
     """Get profile statistics"""
     try:
-        # Count jobs by status
-        jobs_response = supabase.table("jobs").select("status").eq("user_id", user_id).execute()
-        
-        jobs_applied = 0
-        interviews = 0
-        offers = 0
-        
-        for job in jobs_response.data:
-            if job["status"] == "Applied":
-                jobs_applied += 1
-            elif job["status"] == "Interviewing":
-                interviews += 1
-            elif job["status"] == "Accepted":
-                offers += 1
-        
-        # Calculate profile statistics
+        # Per-status counters are maintained by triggers on the jobs table
+        status_counts = fetch_status_counts(user_id)
         
         return ProfileStats(
-            jobs_applied=jobs_applied,
-            interviews=interviews,
-            offers=offers
+            jobs_applied=status_counts.get("Applied", 0),
+            interviews=status_counts.get("Interviewing", 0),
+            offers=status_counts.get("Accepted", 0)
         )
     except Exception as e:
         print(f"Error getting profile stats: {str(e)}")
@@ -222,21 +219,10 @@ def get_profile_stats(user_id: str = Depends(get_current_user)):
 def complete_profile(user_id: str = Depends(get_current_user)):
     """Mark user profile as completed"""
     try:
-        data = {"profile_completed": True, "updated_at": datetime.utcnow().isoformat()}
-        
-        # Check if profile exists
-        existing = supabase.table("user_profile").select("id").eq("user_id", user_id).execute()
-        
-        if existing.data:
-            # Update existing profile
-            response = supabase.table("user_profile").update(data).eq("user_id", user_id).execute()
-        else:
-            # Create new profile with completed flag
-            data["user_id"] = user_id
-            data["full_name"] = "User"
-            response = supabase.table("user_profile").insert(data).execute()
+        # Creates the profile (full_name defaults to 'User') when it does not exist yet
+        updated_profile = upsert_profile(user_id, {"profile_completed": True})
         
-        if response.data:
+        if updated_profile:
             return {"success": True, "message": "Profile marked as completed"}
         raise HTTPException(status_code=400, detail="Failed to mark profile as completed")
     except Exception as e:
@@ -249,9 +235,12 @@ def delete_profile(user_id: str = Depends(get_current_user)):
     try:
         # Delete all user jobs first
         jobs_response = supabase.table("jobs").delete().eq("user_id", user_id).execute()
+        invalidate_job_suggestions(user_id)
         
         # Delete user profile
         profile_response = supabase.table("user_profile").delete().eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        forget_user_email(user_id)
         
         # Delete the user from auth.users table using admin API
         try:
@@ -1,8 +1,12 @@
 """Skills management routes"""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from supabase_client import supabase
-from models import CreateSkill, UpdateSkill
+from models import CreateSkill, UpdateSkill, BulkSkills, BulkDelete
 from utils.dependencies import get_current_user
+from utils.etag import check_not_modified
+from utils.profile_snapshot import invalidate_profile_snapshot
+from utils.embeddings import queue_profile_embedding
+from utils.bulk_sections import insert_rows, replace_rows, delete_rows
 import sys
 from pathlib import Path
 
@@ -11,9 +15,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 router = APIRouter()
 
+def _skill_row(user_id: str, skill_data: CreateSkill) -> dict:
+    return {
+        "user_id": user_id,
+        "name": skill_data.name,
+        "proficiency": skill_data.proficiency,
+        "category": skill_data.category or "Technical"
+    }
+
 @router.get("/api/skills")
-def get_skills(user_id: str = Depends(get_current_user)):
+def get_skills(request: Request, http_response: Response, user_id: str = Depends(get_current_user)):
     """Get user skills from normalized user_skills table"""
+    not_modified = check_not_modified(request, http_response, user_id, "skills")
+    if not_modified:
+        return not_modified
+    
     try:
         response = supabase.table("user_skills").select("*").eq("user_id", user_id).order("created_at", desc=False).execute()
         if response.data:
@@ -27,14 +43,11 @@ def get_skills(user_id: str = Depends(get_current_user)):
 def add_skill(skill_data: CreateSkill, user_id: str = Depends(get_current_user)):
     """Add skill to normalized user_skills table"""
     try:
-        skill_dict = {
-            "user_id": user_id,
-            "name": skill_data.name,
-            "proficiency": skill_data.proficiency,
-            "category": skill_data.category or "Technical"
-        }
+        skill_dict = _skill_row(user_id, skill_data)
         
         response = supabase.table("user_skills").insert(skill_dict).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -43,6 +56,46 @@ def add_skill(skill_data: CreateSkill, user_id: str = Depends(get_current_user))
         print(f"Error adding skill: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to add skill: {str(e)}")
 
+@router.post("/api/skills/bulk")
+def bulk_add_skills(payload: BulkSkills, user_id: str = Depends(get_current_user)):
+    """Add many skills in one statement (existing skills with the same name are updated)"""
+    try:
+        rows = insert_rows("user_skills", [_skill_row(user_id, item) for item in payload.items], on_conflict="user_id,name")
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error adding skills: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to add skills: {str(e)}")
+
+@router.put("/api/skills/bulk")
+def replace_skills(payload: BulkSkills, user_id: str = Depends(get_current_user)):
+    """Replace all of the user's skills with the given list"""
+    try:
+        rows = replace_rows("user_skills", user_id, [_skill_row(user_id, item) for item in payload.items], on_conflict="user_id,name")
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return rows
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error replacing skills: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to replace skills: {str(e)}")
+
+@router.delete("/api/skills/bulk")
+def bulk_delete_skills(payload: BulkDelete, user_id: str = Depends(get_current_user)):
+    """Delete several skills by id in one statement"""
+    try:
+        rows = delete_rows("user_skills", user_id, payload.ids)
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
+        return {"success": True, "deleted": [row["id"] for row in rows]}
+    except Exception as e:
+        print(f"Error deleting skills: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to delete skills: {str(e)}")
+
 @router.put("/api/skills/{skill_id}")
 def update_skill(skill_id: str, skill_data: UpdateSkill, user_id: str = Depends(get_current_user)):
     """Update skill in normalized user_skills table"""
@@ -59,6 +112,8 @@ def update_skill(skill_id: str, skill_data: UpdateSkill, user_id: str = Depends(
             raise HTTPException(status_code=400, detail="No fields to update")
         
         response = supabase.table("user_skills").update(update_dict).eq("id", skill_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -74,6 +129,8 @@ def delete_skill(skill_id: str, user_id: str = Depends(get_current_user)):
     """Delete skill from normalized user_skills table"""
     try:
         response = supabase.table("user_skills").delete().eq("id", skill_id).eq("user_id", user_id).execute()
+        invalidate_profile_snapshot(user_id)
+        queue_profile_embedding(user_id)
         return {"success": True, "message": "Skill deleted successfully"}
     except Exception as e:
         print(f"Error deleting skill: {str(e)}")
@@ -0,0 +1,58 @@
+"""Job statistics routes"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from models import JobStatistics, FunnelStage, StageDuration, WeeklyActivity
+from typing import List
+from utils.dependencies import get_current_user
+from utils.job_stats import fetch_status_counts, build_funnel, fetch_stage_durations, fetch_weekly_activity
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+router = APIRouter()
+
+@router.get("/api/statistics", response_model=JobStatistics)
+def get_statistics(weeks: int = Query(12, ge=1, le=104), user_id: str = Depends(get_current_user)):
+    """Funnel, time-in-stage and weekly activity for the user's jobs"""
+    try:
+        status_counts = fetch_status_counts(user_id)
+        weekly = fetch_weekly_activity(user_id, weeks)
+        return {
+            "total_jobs": sum(status_counts.values()),
+            "status_counts": status_counts,
+            "funnel": build_funnel(status_counts),
+            "time_in_stage": fetch_stage_durations(user_id),
+            "weekly": weekly,
+            "average_weekly_applications": round(sum(week["applications"] for week in weekly) / weeks, 2),
+        }
+    except Exception as e:
+        print(f"Error getting statistics: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to get statistics: {str(e)}")
+
+@router.get("/api/statistics/funnel", response_model=List[FunnelStage])
+def get_funnel(user_id: str = Depends(get_current_user)):
+    """Jobs per pipeline stage with stage-to-stage conversion rates"""
+    try:
+        return build_funnel(fetch_status_counts(user_id))
+    except Exception as e:
+        print(f"Error getting funnel: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to get funnel: {str(e)}")
+
+@router.get("/api/statistics/time-in-stage", response_model=List[StageDuration])
+def get_time_in_stage(user_id: str = Depends(get_current_user)):
+    """Average days jobs spend in each status before moving on"""
+    try:
+        return fetch_stage_durations(user_id)
+    except Exception as e:
+        print(f"Error getting time in stage: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to get time in stage: {str(e)}")
+
+@router.get("/api/statistics/weekly", response_model=List[WeeklyActivity])
+def get_weekly_activity(weeks: int = Query(12, ge=1, le=104), user_id: str = Depends(get_current_user)):
+    """Jobs added and applications per week"""
+    try:
+        return fetch_weekly_activity(user_id, weeks)
+    except Exception as e:
+        print(f"Error getting weekly activity: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to get weekly activity: {str(e)}")
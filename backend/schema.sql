@@ -7,10 +7,10 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- Consolidated user_profile table
 CREATE TABLE IF NOT EXISTS public.user_profile (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL UNIQUE REFERENCES auth.users(id) ON DELETE CASCADE,
     
     -- Basic profile information
-    full_name VARCHAR(255) NOT NULL,
+    full_name VARCHAR(255) NOT NULL DEFAULT 'User',
     first_name VARCHAR(255),
     last_name VARCHAR(255),
     email VARCHAR(255),
@@ -72,8 +72,9 @@ CREATE TABLE IF NOT EXISTS public.jobs (
     date_applied DATE,
     deadline DATE,
     description TEXT,
+    status_changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
 );
 
 -- Resume Builder Data table for structured resume data
@@ -82,8 +83,10 @@ CREATE TABLE IF NOT EXISTS public.resume_builder_data (
     user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
     template_id VARCHAR(100) NOT NULL,
     title VARCHAR(255) DEFAULT 'My Resume',
-    resume_data JSONB NOT NULL,
+    resume_data JSONB NOT NULL CONSTRAINT resume_builder_data_resume_data_object CHECK (jsonb_typeof(resume_data) = 'object'),
+    preview JSONB NOT NULL DEFAULT '{}'::jsonb,
     is_current BOOLEAN DEFAULT FALSE,
+    version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -140,9 +143,11 @@ CREATE TABLE IF NOT EXISTS public.user_languages (
 );
 
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_user_profile_user_id ON public.user_profile(user_id);
-CREATE INDEX IF NOT EXISTS idx_jobs_user_id ON public.jobs(user_id);
-CREATE INDEX IF NOT EXISTS idx_resume_builder_data_user_id ON public.resume_builder_data(user_id);
+-- Job list keyset pagination: ORDER BY updated_at DESC, id DESC with optional status / date filters
+CREATE INDEX IF NOT EXISTS idx_jobs_user_updated_id ON public.jobs(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status_updated_id ON public.jobs(user_id, status, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_date_applied ON public.jobs(user_id, date_applied);
+CREATE INDEX IF NOT EXISTS idx_resume_builder_data_user_updated ON public.resume_builder_data(user_id, updated_at DESC);
 CREATE INDEX IF NOT EXISTS idx_resume_builder_data_template_id ON public.resume_builder_data(template_id);
 CREATE INDEX IF NOT EXISTS idx_resume_builder_data_resume_data ON public.resume_builder_data USING GIN (resume_data);
 CREATE INDEX IF NOT EXISTS idx_user_skills_user_id ON public.user_skills(user_id);
@@ -337,3 +342,751 @@ BEGIN
     END IF;
 END;
 $$ LANGUAGE plpgsql;
+
+-- Function returning the full profile (row + normalized sections) in one round trip
+CREATE OR REPLACE FUNCTION public.get_profile_snapshot(p_user_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'profile', (
+            SELECT to_jsonb(p) FROM public.user_profile p
+            WHERE p.user_id = p_user_id
+            ORDER BY p.created_at
+            LIMIT 1
+        ),
+        'skills', COALESCE((
+            SELECT jsonb_agg(to_jsonb(s) ORDER BY s.created_at)
+            FROM public.user_skills s WHERE s.user_id = p_user_id
+        ), '[]'::jsonb),
+        'work_experience', COALESCE((
+            SELECT jsonb_agg(to_jsonb(w) ORDER BY w.start_date DESC NULLS LAST)
+            FROM public.user_work_experience w WHERE w.user_id = p_user_id
+        ), '[]'::jsonb),
+        'education', COALESCE((
+            SELECT jsonb_agg(to_jsonb(e) ORDER BY e.start_date DESC NULLS LAST)
+            FROM public.user_education e WHERE e.user_id = p_user_id
+        ), '[]'::jsonb),
+        'languages', COALESCE((
+            SELECT jsonb_agg(to_jsonb(l) ORDER BY l.created_at)
+            FROM public.user_languages l WHERE l.user_id = p_user_id
+        ), '[]'::jsonb)
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Job change log feeding GET /api/jobs/changes (delta sync)
+-- Written by triggers on jobs, including during auth.users delete cascades, so no FK to auth.users
+CREATE TABLE IF NOT EXISTS public.job_changes (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    job_id UUID NOT NULL,
+    op VARCHAR(10) NOT NULL CHECK (op IN ('upsert', 'delete')),
+    changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Writing transaction; see get_job_changes
+    txid BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_changes_user_id_id ON public.job_changes(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_job_changes_job_id_id ON public.job_changes(job_id, id);
+CREATE INDEX IF NOT EXISTS idx_job_changes_user_id_txid_id ON public.job_changes(user_id, txid, id);
+
+ALTER TABLE public.job_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own job changes" ON public.job_changes
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.record_job_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO public.job_changes (user_id, job_id, op) VALUES (OLD.user_id, OLD.id, 'delete');
+        RETURN OLD;
+    END IF;
+    INSERT INTO public.job_changes (user_id, job_id, op) VALUES (NEW.user_id, NEW.id, 'upsert');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER record_jobs_change
+    AFTER INSERT OR UPDATE OR DELETE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.record_job_change();
+
+-- Delta sync reads the log in (txid, id) order, returning only rows of transactions
+-- older than every one still in progress: ids are taken at insert time, so an id cursor
+-- could skip a row whose transaction commits late
+CREATE OR REPLACE FUNCTION public.get_job_changes(p_user_id UUID, p_since_txid BIGINT, p_since_id BIGINT, p_limit INTEGER)
+RETURNS TABLE (id BIGINT, job_id UUID, op VARCHAR, txid BIGINT) AS $$
+    SELECT c.id, c.job_id, c.op, c.txid
+    FROM public.job_changes c
+    WHERE c.user_id = p_user_id
+      AND (c.txid, c.id) > (p_since_txid, p_since_id)
+      AND c.txid < pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+    ORDER BY c.txid, c.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Retention
+-- A delta sync only needs the latest change per job: a job changed after a client's
+-- cursor has its latest row either after that cursor or already synced (upserts are
+-- read from jobs at sync time, so that sync saw the later state). So superseded rows
+-- are dropped outright, which bounds the log by the number of jobs a user has ever had.
+-- Delete tombstones are dropped once older than p_tombstone_days; the highest txid
+-- dropped is recorded per user in job_changes_horizon, and a sync from a cursor at or
+-- below it is told to start over (reset) because it may have missed deletes. The newest row per user is
+-- always kept so MAX(id), the jobs resource version, never goes backwards.
+-- Rows of users that no longer exist are removed as well.
+CREATE TABLE IF NOT EXISTS public.job_changes_horizon (
+    user_id UUID PRIMARY KEY,
+    pruned_txid BIGINT NOT NULL DEFAULT 0
+);
+
+ALTER TABLE public.job_changes_horizon ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own job changes horizon" ON public.job_changes_horizon
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.prune_job_changes(p_tombstone_days INTEGER DEFAULT 90)
+RETURNS INTEGER AS $$
+DECLARE
+    superseded INTEGER;
+    expired INTEGER;
+    orphaned INTEGER;
+BEGIN
+    DELETE FROM public.job_changes c
+    WHERE EXISTS (SELECT 1 FROM public.job_changes newer WHERE newer.job_id = c.job_id AND newer.id > c.id);
+    GET DIAGNOSTICS superseded = ROW_COUNT;
+
+    WITH dropped AS (
+        DELETE FROM public.job_changes c
+        WHERE c.op = 'delete'
+          AND c.changed_at < NOW() - make_interval(days => p_tombstone_days)
+          AND c.id < (SELECT MAX(m.id) FROM public.job_changes m WHERE m.user_id = c.user_id)
+        RETURNING c.user_id, c.txid
+    ), horizon AS (
+        INSERT INTO public.job_changes_horizon (user_id, pruned_txid)
+        SELECT user_id, MAX(txid) FROM dropped GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+            SET pruned_txid = GREATEST(public.job_changes_horizon.pruned_txid, EXCLUDED.pruned_txid)
+    )
+    SELECT COUNT(*) INTO expired FROM dropped;
+
+    DELETE FROM public.job_changes c
+    WHERE NOT EXISTS (SELECT 1 FROM auth.users u WHERE u.id = c.user_id);
+    GET DIAGNOSTICS orphaned = ROW_COUNT;
+    DELETE FROM public.job_changes_horizon h
+    WHERE NOT EXISTS (SELECT 1 FROM auth.users u WHERE u.id = h.user_id);
+
+    RETURN superseded + expired + orphaned;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.prune_job_changes(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.prune_job_changes(INTEGER) TO service_role;
+-- Scheduled nightly (pg_cron where enabled): SELECT public.prune_job_changes()
+
+-- Cheap per-user resource versions backing ETag / If-None-Match on the read endpoints
+CREATE OR REPLACE FUNCTION public.get_resource_version(p_user_id UUID, p_resource TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    CASE p_resource
+    WHEN 'jobs' THEN
+        -- The change log id moves on every insert, update and delete
+        RETURN (SELECT COALESCE(MAX(id), 0)::text FROM public.job_changes WHERE user_id = p_user_id);
+    WHEN 'skills' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_skills WHERE user_id = p_user_id);
+    WHEN 'experience' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_work_experience WHERE user_id = p_user_id);
+    WHEN 'education' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_education WHERE user_id = p_user_id);
+    WHEN 'languages' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_languages WHERE user_id = p_user_id);
+    WHEN 'profile' THEN
+        RETURN concat_ws('|',
+            (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_profile WHERE user_id = p_user_id),
+            public.get_resource_version(p_user_id, 'skills'),
+            public.get_resource_version(p_user_id, 'experience'),
+            public.get_resource_version(p_user_id, 'education'),
+            public.get_resource_version(p_user_id, 'languages')
+        );
+    WHEN 'templates' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.templates WHERE is_active);
+    ELSE
+        RETURN NULL;
+    END CASE;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Bulk per-job field updates in one statement (PATCH /api/jobs/bulk)
+CREATE OR REPLACE FUNCTION public.bulk_update_jobs(p_user_id UUID, p_updates JSONB)
+RETURNS JSONB AS $$
+    WITH input AS (
+        SELECT (t.elem->>'id')::uuid AS id, t.elem, t.ord
+        FROM jsonb_array_elements(p_updates) WITH ORDINALITY AS t(elem, ord)
+    ),
+    updated AS (
+        UPDATE public.jobs j SET
+            job_title = CASE WHEN i.elem ? 'job_title' THEN i.elem->>'job_title' ELSE j.job_title END,
+            company = CASE WHEN i.elem ? 'company' THEN i.elem->>'company' ELSE j.company END,
+            location = CASE WHEN i.elem ? 'location' THEN i.elem->>'location' ELSE j.location END,
+            salary = CASE WHEN i.elem ? 'salary' THEN i.elem->>'salary' ELSE j.salary END,
+            job_url = CASE WHEN i.elem ? 'job_url' THEN i.elem->>'job_url' ELSE j.job_url END,
+            status = CASE WHEN i.elem ? 'status' THEN i.elem->>'status' ELSE j.status END,
+            excitement_level = CASE WHEN i.elem ? 'excitement_level' THEN (i.elem->>'excitement_level')::int ELSE j.excitement_level END,
+            date_applied = CASE WHEN i.elem ? 'date_applied' THEN (i.elem->>'date_applied')::date ELSE j.date_applied END,
+            deadline = CASE WHEN i.elem ? 'deadline' THEN (i.elem->>'deadline')::date ELSE j.deadline END,
+            description = CASE WHEN i.elem ? 'description' THEN i.elem->>'description' ELSE j.description END
+        FROM input i
+        WHERE j.id = i.id AND j.user_id = p_user_id
+        RETURNING j.*
+    )
+    SELECT COALESCE(jsonb_agg(
+        jsonb_build_object(
+            'id', i.id,
+            'success', u.id IS NOT NULL,
+            'job', to_jsonb(u),
+            'error', CASE WHEN u.id IS NULL THEN 'Job not found' END
+        ) ORDER BY i.ord
+    ), '[]'::jsonb)
+    FROM input i
+    LEFT JOIN updated u ON u.id = i.id;
+$$ LANGUAGE sql;
+
+-- Trigger-maintained job statistics (status counts, weekly activity, time in stage)
+CREATE TABLE IF NOT EXISTS public.job_status_counts (
+    user_id UUID NOT NULL,
+    status VARCHAR(100) NOT NULL,
+    job_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS public.job_weekly_counts (
+    user_id UUID NOT NULL,
+    week_start DATE NOT NULL,
+    jobs_added INTEGER NOT NULL DEFAULT 0,
+    applications INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, week_start)
+);
+
+CREATE TABLE IF NOT EXISTS public.job_stage_durations (
+    user_id UUID NOT NULL,
+    status VARCHAR(100) NOT NULL,
+    transitions INTEGER NOT NULL DEFAULT 0,
+    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+ALTER TABLE public.job_status_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.job_weekly_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.job_stage_durations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own job status counts" ON public.job_status_counts
+    FOR SELECT USING (auth.uid() = user_id);
+CREATE POLICY "Users can view own job weekly counts" ON public.job_weekly_counts
+    FOR SELECT USING (auth.uid() = user_id);
+CREATE POLICY "Users can view own job stage durations" ON public.job_stage_durations
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- Add (p_delta = 1) or remove (p_delta = -1) one job's contribution to the counters
+CREATE OR REPLACE FUNCTION public.bump_job_stats(
+    p_user_id UUID, p_status TEXT, p_created_at TIMESTAMP WITH TIME ZONE, p_date_applied DATE, p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.job_status_counts (user_id, status, job_count)
+    VALUES (p_user_id, p_status, p_delta)
+    ON CONFLICT (user_id, status) DO UPDATE
+        SET job_count = public.job_status_counts.job_count + EXCLUDED.job_count;
+
+    INSERT INTO public.job_weekly_counts (user_id, week_start, jobs_added)
+    VALUES (p_user_id, date_trunc('week', COALESCE(p_created_at, NOW()))::date, p_delta)
+    ON CONFLICT (user_id, week_start) DO UPDATE
+        SET jobs_added = public.job_weekly_counts.jobs_added + EXCLUDED.jobs_added;
+
+    IF p_date_applied IS NOT NULL THEN
+        INSERT INTO public.job_weekly_counts (user_id, week_start, applications)
+        VALUES (p_user_id, date_trunc('week', p_date_applied)::date, p_delta)
+        ON CONFLICT (user_id, week_start) DO UPDATE
+            SET applications = public.job_weekly_counts.applications + EXCLUDED.applications;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.touch_job_status_changed_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.status_changed_at = COALESCE(NEW.status_changed_at, NOW());
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.maintain_job_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE'
+           OR NEW.user_id IS DISTINCT FROM OLD.user_id
+           OR NEW.status IS DISTINCT FROM OLD.status
+           OR NEW.created_at IS DISTINCT FROM OLD.created_at
+           OR NEW.date_applied IS DISTINCT FROM OLD.date_applied THEN
+            PERFORM public.bump_job_stats(OLD.user_id, OLD.status, OLD.created_at, OLD.date_applied, -1);
+        END IF;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND NEW.status IS DISTINCT FROM OLD.status THEN
+        INSERT INTO public.job_stage_durations (user_id, status, transitions, total_seconds)
+        VALUES (
+            OLD.user_id, OLD.status, 1,
+            GREATEST(EXTRACT(EPOCH FROM NEW.status_changed_at - COALESCE(OLD.status_changed_at, OLD.created_at, NEW.status_changed_at)), 0)
+        )
+        ON CONFLICT (user_id, status) DO UPDATE
+            SET transitions = public.job_stage_durations.transitions + 1,
+                total_seconds = public.job_stage_durations.total_seconds + EXCLUDED.total_seconds;
+    END IF;
+
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (
+            NEW.user_id IS DISTINCT FROM OLD.user_id
+            OR NEW.status IS DISTINCT FROM OLD.status
+            OR NEW.created_at IS DISTINCT FROM OLD.created_at
+            OR NEW.date_applied IS DISTINCT FROM OLD.date_applied)) THEN
+        PERFORM public.bump_job_stats(NEW.user_id, NEW.status, NEW.created_at, NEW.date_applied, 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER touch_jobs_status_changed_at
+    BEFORE INSERT OR UPDATE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.touch_job_status_changed_at();
+
+CREATE TRIGGER maintain_jobs_stats
+    AFTER INSERT OR UPDATE OR DELETE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.maintain_job_stats();
+
+-- Full-text search over jobs (generated tsvector column + GIN index, GET /api/jobs/search)
+ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(job_title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(location, '')), 'C') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON public.jobs USING GIN (search_vector);
+
+-- Minimal HTML escaping for text returned inside markup
+CREATE OR REPLACE FUNCTION public.html_escape(p_text TEXT)
+RETURNS TEXT AS $$
+    SELECT replace(replace(replace(replace(replace(p_text,
+        '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '"', '&quot;'), '''', '&#39;');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Ranked, highlighted search over one user's jobs.
+-- The scraped text is HTML-escaped before highlighting, so the <mark></mark> around
+-- matches is the only markup in a snippet and it is safe to render as HTML.
+CREATE OR REPLACE FUNCTION public.search_jobs(p_user_id UUID, p_query TEXT, p_limit INTEGER DEFAULT 20, p_offset INTEGER DEFAULT 0)
+RETURNS TABLE (
+    id UUID,
+    job_title VARCHAR,
+    company VARCHAR,
+    location VARCHAR,
+    status VARCHAR,
+    date_applied DATE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    rank REAL,
+    headline TEXT
+) AS $$
+    WITH q AS (
+        SELECT websearch_to_tsquery('english'::regconfig, p_query) AS query
+    ),
+    hits AS (
+        SELECT j.id, j.job_title, j.company, j.location, j.status, j.date_applied, j.updated_at, j.description,
+               ts_rank_cd(j.search_vector, q.query) AS rank
+        FROM public.jobs j, q
+        WHERE j.user_id = p_user_id AND j.search_vector @@ q.query
+        ORDER BY rank DESC, j.updated_at DESC, j.id DESC
+        LIMIT p_limit OFFSET p_offset
+    )
+    -- Headlines are expensive, so they are only built for the returned page
+    SELECT h.id, h.job_title, h.company, h.location, h.status, h.date_applied, h.updated_at, h.rank,
+           ts_headline(
+               'english'::regconfig,
+               public.html_escape(concat_ws(' - ', h.job_title, h.company, h.location, h.description)),
+               q.query,
+               'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=" ... "'
+           )
+    FROM hits h, q
+    ORDER BY h.rank DESC, h.updated_at DESC, h.id DESC;
+$$ LANGUAGE sql STABLE;
+
+-- Trigram autocomplete over saved companies and job titles (GET /api/jobs/autocomplete)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_company_trgm ON public.jobs USING GIN (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_title_trgm ON public.jobs USING GIN (job_title gin_trgm_ops);
+
+-- Distinct values of `company` or `job_title` matching p_query, best first:
+-- prefix matches, then substring matches, then fuzzy matches, each by similarity and use count.
+CREATE OR REPLACE FUNCTION public.suggest_job_values(p_user_id UUID, p_field TEXT, p_query TEXT, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (value TEXT, uses BIGINT) AS $$
+DECLARE
+    v_escaped TEXT := replace(replace(replace(p_query, '\', '\\'), '%', '\%'), '_', '\_');
+BEGIN
+    IF p_field NOT IN ('company', 'job_title') THEN
+        RAISE EXCEPTION 'Unsupported autocomplete field: %', p_field;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT %1$I::text, COUNT(*)
+         FROM public.jobs
+         WHERE user_id = $1 AND (%1$I ILIKE $2 OR %1$I %% $3)
+         GROUP BY %1$I
+         ORDER BY %1$I ILIKE $4 DESC, %1$I ILIKE $2 DESC, similarity(%1$I, $3) DESC, COUNT(*) DESC, %1$I
+         LIMIT $5',
+        p_field
+    )
+    USING p_user_id, '%' || v_escaped || '%', p_query, v_escaped || '%', p_limit;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Transactional full-profile save: upsert user_profile and diff-apply sections (PUT /api/profile/full)
+CREATE OR REPLACE FUNCTION public.replace_profile(p_user_id UUID, p_profile JSONB, p_sections JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    v_columns TEXT[];
+    v_set TEXT;
+    v_insert_columns TEXT;
+    v_insert_values TEXT;
+    v_updated INTEGER;
+    v_unknown UUID;
+BEGIN
+    -- An id that is not one of the user's rows would otherwise be dropped silently;
+    -- fail the whole save instead (P0002 -> 404 in PUT /api/profile/full)
+    IF p_sections ? 'work_experience' THEN
+        SELECT r.id INTO v_unknown
+        FROM jsonb_to_recordset(p_sections->'work_experience') AS r(id UUID)
+        WHERE r.id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM public.user_work_experience w WHERE w.id = r.id AND w.user_id = p_user_id)
+        LIMIT 1;
+        IF v_unknown IS NOT NULL THEN
+            RAISE EXCEPTION 'Work experience % not found', v_unknown USING ERRCODE = 'P0002';
+        END IF;
+    END IF;
+
+    IF p_sections ? 'education' THEN
+        SELECT r.id INTO v_unknown
+        FROM jsonb_to_recordset(p_sections->'education') AS r(id UUID)
+        WHERE r.id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM public.user_education e WHERE e.id = r.id AND e.user_id = p_user_id)
+        LIMIT 1;
+        IF v_unknown IS NOT NULL THEN
+            RAISE EXCEPTION 'Education % not found', v_unknown USING ERRCODE = 'P0002';
+        END IF;
+    END IF;
+
+    -- Profile row: only real, client-writable columns present in p_profile
+    IF p_profile IS NOT NULL THEN
+        SELECT array_agg(c.column_name::text ORDER BY c.ordinal_position) INTO v_columns
+        FROM information_schema.columns c
+        WHERE c.table_schema = 'public'
+          AND c.table_name = 'user_profile'
+          AND p_profile ? c.column_name
+          AND c.column_name NOT IN ('id', 'user_id', 'email', 'skills', 'work_experience', 'education', 'created_at', 'updated_at');
+
+        IF v_columns IS NOT NULL THEN
+            SELECT string_agg(format('%I = r.%I', col, col), ', ') INTO v_set FROM unnest(v_columns) col;
+            EXECUTE format(
+                'UPDATE public.user_profile p SET %s, updated_at = NOW()
+                 FROM jsonb_populate_record(NULL::public.user_profile, $1) r
+                 WHERE p.user_id = $2',
+                v_set
+            ) USING p_profile, p_user_id;
+        ELSE
+            UPDATE public.user_profile SET updated_at = NOW() WHERE user_id = p_user_id;
+        END IF;
+        -- EXECUTE does not set FOUND
+        GET DIAGNOSTICS v_updated = ROW_COUNT;
+
+        IF v_updated = 0 THEN
+            v_columns := array_remove(COALESCE(v_columns, ARRAY[]::text[]), 'full_name');
+            SELECT COALESCE(string_agg(format(', %I', col), ''), ''), COALESCE(string_agg(format(', r.%I', col), ''), '')
+            INTO v_insert_columns, v_insert_values
+            FROM unnest(v_columns) col;
+            EXECUTE format(
+                'INSERT INTO public.user_profile (user_id, full_name%s)
+                 SELECT $2, COALESCE(r.full_name, ''User'')%s
+                 FROM jsonb_populate_record(NULL::public.user_profile, $1) r',
+                v_insert_columns, v_insert_values
+            ) USING p_profile, p_user_id;
+        END IF;
+    END IF;
+
+    IF p_sections ? 'skills' THEN
+        DELETE FROM public.user_skills s
+        WHERE s.user_id = p_user_id
+          AND s.name NOT IN (SELECT r.name FROM jsonb_to_recordset(p_sections->'skills') AS r(name TEXT));
+
+        INSERT INTO public.user_skills (user_id, name, proficiency, category)
+        SELECT p_user_id, r.name, r.proficiency, COALESCE(r.category, 'Technical')
+        FROM jsonb_to_recordset(p_sections->'skills') AS r(name TEXT, proficiency TEXT, category TEXT)
+        ON CONFLICT (user_id, name) DO UPDATE
+            SET proficiency = EXCLUDED.proficiency, category = EXCLUDED.category
+            WHERE (public.user_skills.proficiency, public.user_skills.category)
+                  IS DISTINCT FROM (EXCLUDED.proficiency, EXCLUDED.category);
+    END IF;
+
+    IF p_sections ? 'languages' THEN
+        DELETE FROM public.user_languages l
+        WHERE l.user_id = p_user_id
+          AND l.language NOT IN (SELECT r.language FROM jsonb_to_recordset(p_sections->'languages') AS r(language TEXT));
+
+        INSERT INTO public.user_languages (user_id, language, proficiency)
+        SELECT p_user_id, r.language, r.proficiency
+        FROM jsonb_to_recordset(p_sections->'languages') AS r(language TEXT, proficiency TEXT)
+        ON CONFLICT (user_id, language) DO UPDATE
+            SET proficiency = EXCLUDED.proficiency
+            WHERE public.user_languages.proficiency IS DISTINCT FROM EXCLUDED.proficiency;
+    END IF;
+
+    IF p_sections ? 'work_experience' THEN
+        DELETE FROM public.user_work_experience w
+        WHERE w.user_id = p_user_id
+          AND w.id NOT IN (
+              SELECT r.id FROM jsonb_to_recordset(p_sections->'work_experience') AS r(id UUID) WHERE r.id IS NOT NULL
+          );
+
+        UPDATE public.user_work_experience w
+        SET title = r.title, company = r.company, location = r.location, start_date = r.start_date,
+            end_date = r.end_date, is_current = COALESCE(r.is_current, FALSE), description = r.description
+        FROM jsonb_to_recordset(p_sections->'work_experience')
+            AS r(id UUID, title TEXT, company TEXT, location TEXT, start_date DATE, end_date DATE, is_current BOOLEAN, description TEXT)
+        WHERE w.id = r.id AND w.user_id = p_user_id
+          AND (w.title, w.company, w.location, w.start_date, w.end_date, w.is_current, w.description)
+              IS DISTINCT FROM (r.title, r.company, r.location, r.start_date, r.end_date, COALESCE(r.is_current, FALSE), r.description);
+
+        INSERT INTO public.user_work_experience (user_id, title, company, location, start_date, end_date, is_current, description)
+        SELECT p_user_id, r.title, r.company, r.location, r.start_date, r.end_date, COALESCE(r.is_current, FALSE), r.description
+        FROM jsonb_to_recordset(p_sections->'work_experience')
+            AS r(id UUID, title TEXT, company TEXT, location TEXT, start_date DATE, end_date DATE, is_current BOOLEAN, description TEXT)
+        WHERE r.id IS NULL;
+    END IF;
+
+    IF p_sections ? 'education' THEN
+        DELETE FROM public.user_education e
+        WHERE e.user_id = p_user_id
+          AND e.id NOT IN (
+              SELECT r.id FROM jsonb_to_recordset(p_sections->'education') AS r(id UUID) WHERE r.id IS NOT NULL
+          );
+
+        UPDATE public.user_education e
+        SET school = r.school, degree = r.degree, start_date = r.start_date, end_date = r.end_date
+        FROM jsonb_to_recordset(p_sections->'education')
+            AS r(id UUID, school TEXT, degree TEXT, start_date DATE, end_date DATE)
+        WHERE e.id = r.id AND e.user_id = p_user_id
+          AND (e.school, e.degree, e.start_date, e.end_date) IS DISTINCT FROM (r.school, r.degree, r.start_date, r.end_date);
+
+        INSERT INTO public.user_education (user_id, school, degree, start_date, end_date)
+        SELECT p_user_id, r.school, r.degree, r.start_date, r.end_date
+        FROM jsonb_to_recordset(p_sections->'education')
+            AS r(id UUID, school TEXT, degree TEXT, start_date DATE, end_date DATE)
+        WHERE r.id IS NULL;
+    END IF;
+
+    RETURN public.get_profile_snapshot(p_user_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Older clients sent resume_data JSON-encoded; store it as an object either way.
+-- Named to sort before set_resume_builder_data_preview.
+CREATE OR REPLACE FUNCTION public.unwrap_resume_data()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF jsonb_typeof(NEW.resume_data) = 'string' THEN
+        NEW.resume_data := (NEW.resume_data #>> '{}')::jsonb;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER normalize_resume_builder_data_json
+    BEFORE INSERT OR UPDATE OF resume_data ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.unwrap_resume_data();
+
+-- Small summary of resume_data for the resume list, kept current by trigger
+-- Rows saved by older clients hold resume_data as a JSON-encoded string; unwrap those
+CREATE OR REPLACE FUNCTION public.resume_preview(p_data JSONB)
+RETURNS JSONB AS $$
+    WITH d AS (
+        SELECT CASE WHEN jsonb_typeof(p_data) = 'string' THEN (p_data #>> '{}')::jsonb ELSE p_data END AS data
+    ),
+    sections AS (
+        SELECT
+            data,
+            CASE WHEN jsonb_typeof(data->'personalInfo') = 'object' THEN data->'personalInfo' ELSE '{}'::jsonb END AS info,
+            CASE WHEN jsonb_typeof(data->'workExperience') = 'array' THEN data->'workExperience' ELSE '[]'::jsonb END AS work,
+            CASE WHEN jsonb_typeof(data->'education') = 'array' THEN data->'education' ELSE '[]'::jsonb END AS education,
+            CASE WHEN jsonb_typeof(data->'skills') = 'array' THEN data->'skills' ELSE '[]'::jsonb END AS skills,
+            CASE WHEN jsonb_typeof(data->'languages') = 'array' THEN data->'languages' ELSE '[]'::jsonb END AS languages
+        FROM d
+    )
+    SELECT jsonb_build_object(
+        'personalInfo', jsonb_build_object(
+            'firstName', COALESCE(info->>'firstName', ''),
+            'lastName', COALESCE(info->>'lastName', ''),
+            'jobTitle', COALESCE(info->>'jobTitle', ''),
+            'location', COALESCE(info->>'location', '')
+        ),
+        'summary', left(COALESCE(NULLIF(data->>'summary', ''), info->>'summary', ''), 280),
+        'workExperience', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'title', COALESCE(w.value->>'title', ''),
+                       'company', COALESCE(w.value->>'company', ''),
+                       'startDate', COALESCE(w.value->>'startDate', ''),
+                       'endDate', COALESCE(w.value->>'endDate', ''),
+                       'isCurrent', COALESCE(w.value->'isCurrent' = 'true'::jsonb, FALSE)
+                   ) ORDER BY w.ordinality)
+            FROM jsonb_array_elements(work) WITH ORDINALITY AS w(value, ordinality)
+            WHERE w.ordinality <= 3 AND jsonb_typeof(w.value) = 'object'
+        ), '[]'::jsonb),
+        'education', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'school', COALESCE(e.value->>'school', ''),
+                       'degree', COALESCE(e.value->>'degree', '')
+                   ) ORDER BY e.ordinality)
+            FROM jsonb_array_elements(education) WITH ORDINALITY AS e(value, ordinality)
+            WHERE e.ordinality <= 2 AND jsonb_typeof(e.value) = 'object'
+        ), '[]'::jsonb),
+        'skills', COALESCE((
+            SELECT jsonb_agg(s.value->>'name' ORDER BY s.ordinality)
+            FROM jsonb_array_elements(skills) WITH ORDINALITY AS s(value, ordinality)
+            WHERE s.ordinality <= 8 AND jsonb_typeof(s.value) = 'object' AND s.value->>'name' <> ''
+        ), '[]'::jsonb),
+        'counts', jsonb_build_object(
+            'workExperience', jsonb_array_length(work),
+            'education', jsonb_array_length(education),
+            'skills', jsonb_array_length(skills),
+            'languages', jsonb_array_length(languages)
+        )
+    )
+    FROM sections;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION public.set_resume_preview()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.preview := public.resume_preview(NEW.resume_data);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER set_resume_builder_data_preview
+    BEFORE INSERT OR UPDATE OF resume_data ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.set_resume_preview();
+
+-- Template registry change notification (see utils/template_registry.py)
+CREATE TRIGGER update_templates_updated_at BEFORE UPDATE ON public.templates
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE OR REPLACE FUNCTION public.notify_templates_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('templates_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_templates_changed
+    AFTER INSERT OR UPDATE OR DELETE ON public.templates
+    FOR EACH STATEMENT EXECUTE FUNCTION public.notify_templates_changed();
+
+-- Optimistic concurrency for resume documents: version moves on every content change
+CREATE OR REPLACE FUNCTION public.bump_resume_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old JSONB := OLD.resume_data;
+    v_new JSONB := NEW.resume_data;
+BEGIN
+    -- Compare documents the way unwrap_resume_data stores them: rewriting a JSON-encoded
+    -- string as the object it holds (backfill_resume_data_batch) is not an edit.
+    -- This trigger sorts before normalize_resume_builder_data_json, so NEW may still be a string.
+    IF jsonb_typeof(v_old) = 'string' THEN
+        v_old := (v_old #>> '{}')::jsonb;
+    END IF;
+    IF jsonb_typeof(v_new) = 'string' THEN
+        v_new := (v_new #>> '{}')::jsonb;
+    END IF;
+
+    IF v_new IS DISTINCT FROM v_old OR NEW.title IS DISTINCT FROM OLD.title THEN
+        NEW.version := OLD.version + 1;
+    ELSE
+        NEW.version := OLD.version;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bump_resume_builder_data_version
+    BEFORE UPDATE ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.bump_resume_version();
+
+-- Resume revision history: periodic snapshots plus JSON Patch deltas
+CREATE TABLE IF NOT EXISTS public.resume_revisions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    resume_id UUID NOT NULL REFERENCES public.resume_builder_data(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('snapshot', 'delta')),
+    base_revision INTEGER,
+    title VARCHAR(255),
+    content JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (resume_id, revision),
+    CHECK ((kind = 'snapshot') = (base_revision IS NULL))
+);
+
+-- Finds the nearest snapshot at or below a revision
+CREATE INDEX IF NOT EXISTS idx_resume_revisions_snapshots ON public.resume_revisions(resume_id, revision) WHERE kind = 'snapshot';
+
+ALTER TABLE public.resume_revisions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own resume revisions" ON public.resume_revisions
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- Embedding vectors for saved jobs and profiles (backend/utils/embeddings.py)
+CREATE TABLE IF NOT EXISTS public.job_embeddings (
+    job_id UUID PRIMARY KEY REFERENCES public.jobs(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,
+    content_hash CHAR(40) NOT NULL,
+    embedding REAL[] NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_embeddings_user_model ON public.job_embeddings(user_id, model);
+
+CREATE TABLE IF NOT EXISTS public.profile_embeddings (
+    user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,
+    content_hash CHAR(40) NOT NULL,
+    embedding REAL[] NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE TRIGGER update_job_embeddings_updated_at BEFORE UPDATE ON public.job_embeddings
+    FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+CREATE TRIGGER update_profile_embeddings_updated_at BEFORE UPDATE ON public.profile_embeddings
+    FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+ALTER TABLE public.job_embeddings ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.profile_embeddings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own job embeddings" ON public.job_embeddings
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can view own profile embedding" ON public.profile_embeddings
+    FOR SELECT USING (auth.uid() = user_id);
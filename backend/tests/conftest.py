@@ -0,0 +1,11 @@
+"""Shared test setup
+
+supabase_client builds its client at import time, so it needs credentials.
+Tests never reach the network: they swap the module-level `supabase` of the
+code under test for the in-memory FakeSupabase in tests/fakes.py.
+"""
+import os
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test.service.role")
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
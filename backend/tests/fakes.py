@@ -0,0 +1,150 @@
+"""In-memory stand-in for the supabase-py client, covering the query builder calls the utils make"""
+from typing import Any, Callable, Dict, List, Optional
+import copy
+import itertools
+import uuid
+
+class FakeResponse:
+    def __init__(self, data: Any):
+        self.data = data
+
+class FakeQuery:
+    def __init__(self, client: "FakeSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self._columns: Optional[List[str]] = None
+        self._order: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._single = False
+        self._action = "select"
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+
+    @property
+    def _rows(self) -> List[Dict[str, Any]]:
+        return self._client.tables.setdefault(self._table, [])
+
+    def select(self, columns: str = "*", **_: Any) -> "FakeQuery":
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row[column] <= value)
+        return self
+
+    def in_(self, column: str, values: List[Any]) -> "FakeQuery":
+        allowed = set(values)
+        self._filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self._limit = count
+        return self
+
+    def single(self) -> "FakeQuery":
+        self._single = True
+        return self
+
+    def insert(self, rows: Any) -> "FakeQuery":
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None, ignore_duplicates: bool = False, **_: Any) -> "FakeQuery":
+        self._action, self._payload = "upsert", rows
+        self._on_conflict, self._ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "FakeQuery":
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self._action = "delete"
+        return self
+
+    def _matching(self) -> List[Dict[str, Any]]:
+        return [row for row in self._rows if all(check(row) for check in self._filters)]
+
+    def _write(self) -> List[Dict[str, Any]]:
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = [key.strip() for key in (self._on_conflict or "id").split(",")]
+        written = []
+        for row in copy.deepcopy(rows):
+            existing = next((current for current in self._rows
+                             if self._action == "upsert" and all(current.get(key) == row.get(key) for key in keys)), None)
+            if existing is not None:
+                if not self._ignore_duplicates:
+                    existing.update(row)
+                    written.append(existing)
+                continue
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", f"2026-01-01T00:00:{next(self._client.clock):06d}")
+            self._rows.append(row)
+            written.append(row)
+        return written
+
+    def execute(self) -> FakeResponse:
+        self._client.calls.append((self._table, self._action))
+        if self._action in ("insert", "upsert"):
+            return FakeResponse(copy.deepcopy(self._write()))
+        matching = self._matching()
+        if self._action == "update":
+            for row in matching:
+                row.update(copy.deepcopy(self._payload))
+            return FakeResponse(copy.deepcopy(matching))
+        if self._action == "delete":
+            self._client.tables[self._table] = [row for row in self._rows if row not in matching]
+            return FakeResponse(copy.deepcopy(matching))
+
+        for column, desc in reversed(self._order):
+            matching = sorted(matching, key=lambda row: row.get(column), reverse=desc)
+        if self._limit is not None:
+            matching = matching[:self._limit]
+        if self._columns is not None:
+            matching = [{column: row.get(column) for column in self._columns} for row in matching]
+        matching = copy.deepcopy(matching)
+        if self._single:
+            return FakeResponse(matching[0] if matching else None)
+        return FakeResponse(matching)
+
+class FakeRpc:
+    def __init__(self, result: Any):
+        self._result = result
+
+    def execute(self) -> FakeResponse:
+        return FakeResponse(self._result)
+
+class FakeSupabase:
+    """Tables are lists of row dicts; RPCs are plain functions registered in `rpcs`"""
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = copy.deepcopy(tables or {})
+        self.rpcs: Dict[str, Callable[..., Any]] = {}
+        self.calls: List[tuple] = []
+        self.clock = itertools.count(1)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> FakeRpc:
+        self.calls.append((name, "rpc"))
+        return FakeRpc(self.rpcs[name](**(params or {})))
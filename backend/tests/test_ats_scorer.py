@@ -0,0 +1,85 @@
+"""Keyword scoring in utils/ats_scorer.py"""
+import pytest
+
+pytest.importorskip("supabase")
+
+from tests.fakes import FakeSupabase
+from utils import ats_scorer
+from utils.ats_scorer import TITLE_ONLY_WEIGHT, rank_jobs, score_job_match, user_job_corpus
+from utils.cache import TTLCache
+
+DESCRIPTION = "We run Python services on Kubernetes. Python everywhere, plus Docker."
+USER_ID = "user-1"
+SAVED_JOBS = [
+    {"id": "j1", "job_title": "Backend Engineer", "description": DESCRIPTION},
+    {"id": "j2", "job_title": "Python Developer", "description": "Python, PostgreSQL and AWS. Storybook a plus."},
+    {"id": "j3", "job_title": "Frontend Engineer", "description": "React, TypeScript and Storybook. Some Python."},
+    {"id": "j4", "job_title": "Pastry Chef", "description": "Croissants and sourdough"},
+    {"id": "j5", "job_title": "Platform Engineer", "description": "Terraform, AWS, Kubernetes, Kubernetes"},
+]
+
+
+def test_repeated_terms_weigh_more():
+    result = score_job_match("Engineer", DESCRIPTION, [])
+    # Python twice, Docker and Kubernetes once each
+    assert result["missingSkills"] == ["Python", "Docker", "Kubernetes"]
+
+
+def test_terms_common_across_saved_jobs_weigh_less():
+    # Every saved job asks for Python; Kubernetes sets this one apart
+    corpus = {"doc_count": 20, "document_frequency": {"Python": 20, "Docker": 10, "Kubernetes": 1}}
+    result = score_job_match("Engineer", DESCRIPTION, [], **corpus)
+    assert result["missingSkills"][0] == "Kubernetes"
+
+    rare = score_job_match("Engineer", DESCRIPTION, ["Kubernetes"], **corpus)
+    common = score_job_match("Engineer", DESCRIPTION, ["Python"], **corpus)
+    assert rare["coverage"] == common["coverage"]
+    assert rare["weightedMatch"] > common["weightedMatch"]
+    assert rare["matchScore"] > common["matchScore"]
+
+
+def test_matched_and_missing_are_heaviest_first_then_alphabetical():
+    description = "AWS, Terraform, Docker, Docker, React, Python, Python, Python"
+    result = score_job_match("Engineer", description, ["python", "react.js", "AWS"])
+    assert result["matchedSkills"] == ["Python", "AWS", "React"]
+    assert result["missingSkills"] == ["Docker", "Terraform"]
+    assert result["coverage"] == 0.6
+
+
+def test_title_terms_are_boosted():
+    result = score_job_match("React Developer", "Python, Python and React", [])
+    assert result["missingSkills"] == ["React", "Python"]
+
+
+def test_posting_without_skills_falls_back_to_the_title():
+    result = score_job_match("Senior Pastry Chef", "Bake for our new café.", ["Python"], ["Pastry Chef"])
+    assert result["matchedSkills"] == [] and result["missingSkills"] == []
+    assert result["titleMatch"] == round(2 / 3, 4)
+    assert result["matchScore"] == round(TITLE_ONLY_WEIGHT * 2 / 3 * 100)
+
+
+def test_empty_profile_scores_zero_against_skills():
+    result = score_job_match("Engineer", DESCRIPTION, [], ["Accountant"])
+    assert result["matchScore"] == 0
+    assert result["weightedMatch"] == 0.0
+
+
+def test_rank_jobs_matches_score_job_match_over_the_saved_job_corpus(monkeypatch):
+    # The corpus is the newest CORPUS_MAX_JOBS saved jobs; j5 is the oldest and falls outside it
+    monkeypatch.setattr(ats_scorer, "CORPUS_MAX_JOBS", 4)
+    rows = [{**job, "user_id": USER_ID, "created_at": f"2026-01-0{9 - i}"} for i, job in enumerate(SAVED_JOBS)]
+    monkeypatch.setattr(ats_scorer, "supabase", FakeSupabase({"jobs": rows}))
+    monkeypatch.setattr(ats_scorer, "resource_version", lambda user_id, resource: None)
+    monkeypatch.setattr(ats_scorer, "_corpus_cache", TTLCache(ttl_seconds=60))
+    skills = ["Python", "Kubernetes", "Storybook", "react.js"]
+    titles = ["Backend Engineer"]
+
+    corpus = user_job_corpus(USER_ID, skills)
+    assert corpus[0] == 4
+    ranked = rank_jobs(SAVED_JOBS[:4], skills, titles)
+
+    assert [result["matchScore"] for result in ranked] == sorted((result["matchScore"] for result in ranked), reverse=True)
+    for result in ranked:
+        job = next(job for job in SAVED_JOBS if job["id"] == result["job_id"])
+        expected = score_job_match(job["job_title"], job["description"], skills, titles, *corpus)
+        assert {key: value for key, value in result.items() if key != "job_id"} == expected
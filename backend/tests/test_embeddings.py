@@ -0,0 +1,103 @@
+"""Job and profile embeddings in utils/embeddings.py (EMBEDDING_PROVIDER=local)"""
+import numpy as np
+import pytest
+
+pytest.importorskip("supabase")
+
+from tests.fakes import FakeSupabase
+from utils import embeddings
+from utils.cache import TTLCache
+from utils.embeddings import HashingEmbedder, JobIndex, _top, queue_profile_embedding, similar_jobs
+
+USER_ID = "user-1"
+JOBS = [
+    {"id": "j1", "user_id": USER_ID, "job_title": "Backend Engineer", "company": "Acme",
+     "status": "Applied", "description": "Python, PostgreSQL and FastAPI services", "created_at": "2026-01-03"},
+    {"id": "j2", "user_id": USER_ID, "job_title": "Backend Developer", "company": "Globex",
+     "status": "Bookmarked", "description": "Python, PostgreSQL and FastAPI APIs", "created_at": "2026-01-02"},
+    {"id": "j3", "user_id": USER_ID, "job_title": "Pastry Chef", "company": "Bakery",
+     "status": "Bookmarked", "description": "Croissants, sourdough and laminated dough", "created_at": "2026-01-01"},
+]
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeSupabase({"jobs": JOBS})
+    monkeypatch.setattr(embeddings, "supabase", fake)
+    monkeypatch.setattr(embeddings, "_index_cache", TTLCache(ttl_seconds=60))
+    monkeypatch.setattr(embeddings, "_profile_cache", TTLCache(ttl_seconds=60))
+    return fake
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    counting = CountingEmbedder()
+    monkeypatch.setattr(embeddings, "get_embedder", lambda: counting)
+    return counting
+
+
+def test_top_orders_by_similarity_and_skips_excluded_rows():
+    index = JobIndex(
+        model="test",
+        jobs=[{"id": f"j{row}"} for row in range(5)],
+        matrix=np.zeros((5, 2), dtype=np.float32),
+        rows={},
+    )
+    similarities = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+    assert [job["id"] for job in _top(index, similarities, 3)] == ["j1", "j3", "j2"]
+    assert [job["id"] for job in _top(index, similarities, 2, exclude=(1,))] == ["j3", "j2"]
+    assert len(_top(index, similarities, 10, exclude=(0, 4))) == 3
+    assert _top(index, similarities, 1)[0]["similarity"] == 0.9
+
+
+def test_similar_jobs_ranks_by_cosine_and_excludes_the_job(db, embedder):
+    similar = similar_jobs(USER_ID, "j1", limit=5)
+    assert [job["id"] for job in similar] == ["j2", "j3"]
+    assert similar[0]["similarity"] > similar[1]["similarity"]
+    assert similar_jobs(USER_ID, "missing") is None
+    assert {row["job_id"] for row in db.tables["job_embeddings"]} == {"j1", "j2", "j3"}
+
+
+def test_only_jobs_with_a_stale_hash_are_re_embedded(db, embedder):
+    before = {job["id"]: job["similarity"] for job in similar_jobs(USER_ID, "j1")}
+    assert len(embedder.embedded) == 3
+
+    db.tables["jobs"][2]["description"] = "Python and PostgreSQL FastAPI backend"
+    embeddings.invalidate_job_embeddings(USER_ID)
+    embedder.embedded.clear()
+    after = {job["id"]: job["similarity"] for job in similar_jobs(USER_ID, "j1")}
+
+    assert embedder.embedded == [embeddings.job_embedding_text(db.tables["jobs"][2])]
+    assert after["j3"] > before["j3"]
+    assert after["j2"] == before["j2"]
+
+
+def test_profile_writes_re_embed_a_changed_profile(db, embedder, monkeypatch):
+    snapshot = {"profile": {"job_title": "Backend Engineer"}, "skills": [{"name": "Python"}]}
+    monkeypatch.setattr(embeddings, "_background", InlineExecutor())
+    monkeypatch.setattr(embeddings, "load_profile_snapshot", lambda user_id: snapshot)
+
+    queue_profile_embedding(USER_ID)
+    first_hash = db.tables["profile_embeddings"][0]["content_hash"]
+    queue_profile_embedding(USER_ID)
+    assert len(embedder.embedded) == 1
+
+    snapshot["skills"].append({"name": "PostgreSQL"})
+    queue_profile_embedding(USER_ID)
+    assert len(embedder.embedded) == 2
+    assert len(db.tables["profile_embeddings"]) == 1
+    assert db.tables["profile_embeddings"][0]["content_hash"] != first_hash
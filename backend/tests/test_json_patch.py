@@ -0,0 +1,62 @@
+"""JSON Patch and JSON Merge Patch in utils/json_patch.py"""
+import pytest
+
+from utils.json_patch import JsonPatchError, apply_json_patch, apply_merge_patch, create_json_patch
+
+DOCUMENT = {"summary": "Backend engineer", "skills": ["Python", "SQL"], "meta": {"pages": 1}}
+
+
+def test_operations_apply_in_order_without_touching_the_input():
+    patched = apply_json_patch(DOCUMENT, [
+        {"op": "add", "path": "/skills/-", "value": "Go"},
+        {"op": "replace", "path": "/summary", "value": "Platform engineer"},
+        {"op": "remove", "path": "/skills/0"},
+        {"op": "move", "from": "/meta/pages", "path": "/pages"},
+        {"op": "copy", "from": "/skills/0", "path": "/primary"},
+    ])
+    assert patched == {"summary": "Platform engineer", "skills": ["SQL", "Go"], "meta": {}, "pages": 1, "primary": "SQL"}
+    assert DOCUMENT["skills"] == ["Python", "SQL"]
+
+
+@pytest.mark.parametrize("index", ["²", "01", "-1", "1.0", " 1", ""])
+def test_malformed_array_indexes_are_patch_errors(index):
+    with pytest.raises(JsonPatchError):
+        apply_json_patch(DOCUMENT, [{"op": "remove", "path": f"/skills/{index}"}])
+
+
+def test_out_of_range_index_is_rejected():
+    with pytest.raises(JsonPatchError):
+        apply_json_patch(DOCUMENT, [{"op": "replace", "path": "/skills/2", "value": "Go"}])
+
+
+@pytest.mark.parametrize("stored, expected", [
+    (1, True),
+    (1, 1.0),
+    (0, False),
+    ([1], [True]),
+    ({"n": 1}, {"n": 1.0}),
+])
+def test_test_op_compares_types_strictly(stored, expected):
+    with pytest.raises(JsonPatchError):
+        apply_json_patch({"value": stored}, [{"op": "test", "path": "/value", "value": expected}])
+    assert apply_json_patch({"value": stored}, [{"op": "test", "path": "/value", "value": stored}]) == {"value": stored}
+
+
+def test_failing_operation_rejects_the_whole_patch():
+    with pytest.raises(JsonPatchError):
+        apply_json_patch(DOCUMENT, [
+            {"op": "replace", "path": "/summary", "value": "changed"},
+            {"op": "test", "path": "/meta/pages", "value": 2},
+        ])
+
+
+def test_merge_patch_merges_objects_and_deletes_nulls():
+    patched = apply_merge_patch(DOCUMENT, {"summary": None, "meta": {"pages": 2, "theme": "clean"}})
+    assert patched == {"skills": ["Python", "SQL"], "meta": {"pages": 2, "theme": "clean"}}
+
+
+def test_created_patch_round_trips():
+    after = {"summary": "Backend engineer", "skills": ["Python", "SQL", "Go"], "meta": {"pages": True}}
+    operations = create_json_patch(DOCUMENT, after)
+    assert apply_json_patch(DOCUMENT, operations) == after
+    assert {"op": "replace", "path": "/meta/pages", "value": True} in operations
@@ -0,0 +1,112 @@
+"""Strict json_schema rewriting and structured completions in utils/llm.py"""
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+from types import SimpleNamespace
+from typing import List, Optional
+import pytest
+
+from utils.llm import response_format_for, structured_completion
+
+
+class Section(BaseModel):
+    title: str = Field(description="Section heading")
+    items: List[str] = []
+
+
+class ExperienceEntry(BaseModel):
+    title: str
+    company: str
+    default: Optional[str] = None
+
+
+class ResumeOutline(BaseModel):
+    title: str = Field(default="Resume", title="Document title")
+    sections: List[Section]
+    experience: Optional[ExperienceEntry] = None
+
+
+def _schema(model):
+    return response_format_for(model)["json_schema"]["schema"]
+
+
+def test_property_named_title_is_kept():
+    schema = _schema(ResumeOutline)
+    assert "title" in schema["properties"]
+    assert "title" in schema["required"]
+    assert schema["properties"]["title"]["type"] == "string"
+    assert schema["properties"]["sections"]["type"] == "array"
+
+
+def test_unsupported_keywords_are_stripped_from_schema_nodes():
+    schema = _schema(ResumeOutline)
+    assert "title" not in schema
+    assert "default" not in schema["properties"]["title"]
+    assert "title" not in schema["properties"]["title"]
+
+
+def test_nested_models_keep_their_fields():
+    schema = _schema(ResumeOutline)
+    section = schema["$defs"]["Section"]
+    assert set(section["properties"]) == {"title", "items"}
+    assert section["required"] == ["title", "items"]
+    assert section["additionalProperties"] is False
+
+    entry = schema["$defs"]["ExperienceEntry"]
+    assert set(entry["required"]) == {"title", "company", "default"}
+
+
+def test_every_object_is_closed_and_fully_required():
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get("type") == "object" and "properties" in node:
+                assert node["additionalProperties"] is False
+                assert node["required"] == list(node["properties"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(_schema(ResumeOutline))
+
+
+class FakeCompletions:
+    """Replays (content, finish_reason) pairs and records each request"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content, finish_reason = self.replies.pop(0)
+        message = SimpleNamespace(content=content, refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+
+def _client(*replies):
+    completions = FakeCompletions(*replies)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+
+def test_truncated_output_is_retried_with_a_larger_budget():
+    client, completions = _client(('{"title": "Res', "length"), ('{"title": "Resume", "items": []}', "stop"))
+    parsed, _ = structured_completion(client, Section, [], max_tokens=300)
+    assert parsed.title == "Resume"
+    assert [request["max_tokens"] for request in completions.requests] == [300, 600]
+
+
+def test_truncated_output_without_max_tokens_fails_at_once():
+    client, completions = _client(('{"title": "Res', "length"), ('{"title": "Resume", "items": []}', "stop"))
+    with pytest.raises(HTTPException) as error:
+        structured_completion(client, Section, [])
+    assert error.value.status_code == 502
+    assert len(completions.requests) == 1
+
+
+def test_invalid_output_is_retried_then_rejected():
+    client, completions = _client(('{"items": []}', "stop"), ('{"items": []}', "stop"))
+    with pytest.raises(HTTPException) as error:
+        structured_completion(client, Section, [], max_tokens=300)
+    assert error.value.status_code == 502
+    assert [request["max_tokens"] for request in completions.requests] == [300, 300]
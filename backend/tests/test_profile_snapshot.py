@@ -0,0 +1,43 @@
+"""Per-user profile snapshot cache in utils/profile_snapshot.py"""
+import pytest
+
+pytest.importorskip("supabase")
+
+from tests.fakes import FakeSupabase
+from utils import profile_snapshot
+from utils.cache import TTLCache
+from utils.profile_snapshot import load_profile_snapshot
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    data = {"profile": {"user_id": USER_ID, "job_title": "Engineer"}, "skills": [{"name": "Python"}]}
+    fake = FakeSupabase()
+    fake.rpcs["get_profile_snapshot"] = lambda p_user_id: data
+    monkeypatch.setattr(profile_snapshot, "supabase", fake)
+    monkeypatch.setattr(profile_snapshot, "_snapshot_cache", TTLCache(ttl_seconds=60))
+    return data
+
+
+def test_cached_snapshot_is_reused_under_the_same_version(stored):
+    assert load_profile_snapshot(USER_ID, "v1")["profile"]["job_title"] == "Engineer"
+    # Written by another worker, whose invalidation never reaches this cache
+    stored["profile"] = {"user_id": USER_ID, "job_title": "Staff Engineer"}
+
+    assert load_profile_snapshot(USER_ID, "v1")["profile"]["job_title"] == "Engineer"
+    assert load_profile_snapshot(USER_ID)["profile"]["job_title"] == "Engineer"
+
+
+def test_newer_version_bypasses_the_cached_snapshot(stored):
+    load_profile_snapshot(USER_ID, "v1")
+    stored["profile"] = {"user_id": USER_ID, "job_title": "Staff Engineer"}
+
+    assert load_profile_snapshot(USER_ID, "v2")["profile"]["job_title"] == "Staff Engineer"
+    assert load_profile_snapshot(USER_ID, "v2")["profile"]["job_title"] == "Staff Engineer"
+
+
+def test_snapshots_are_private_copies(stored):
+    load_profile_snapshot(USER_ID, "v1")["skills"].append({"name": "SQL"})
+    assert load_profile_snapshot(USER_ID, "v1")["skills"] == [{"name": "Python"}]
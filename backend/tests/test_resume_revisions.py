@@ -0,0 +1,63 @@
+"""Snapshot + delta revision chains in utils/resume_revisions.py"""
+import pytest
+
+pytest.importorskip("supabase")
+
+from tests.fakes import FakeSupabase
+from utils import resume_revisions
+from utils.resume_revisions import load_revision, record_revision
+
+RESUME_ID = "resume-1"
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeSupabase()
+    monkeypatch.setattr(resume_revisions, "supabase", fake)
+    return fake
+
+
+def _kinds(db):
+    return {row["revision"]: row["kind"] for row in db.tables["resume_revisions"]}
+
+
+def test_deltas_rebuild_each_revision(db):
+    v1 = {"summary": "first", "skills": ["Python"]}
+    v2 = {"summary": "second", "skills": ["Python"]}
+    v3 = {"summary": "second", "skills": ["Python", "SQL"]}
+    record_revision(RESUME_ID, USER_ID, 1, "CV", v1)
+    record_revision(RESUME_ID, USER_ID, 2, "CV", v2, previous=v1)
+    record_revision(RESUME_ID, USER_ID, 3, "CV", v3, previous=v2)
+
+    assert _kinds(db) == {1: "snapshot", 2: "delta", 3: "delta"}
+    assert load_revision(RESUME_ID, USER_ID, 2)["resume_data"] == v2
+    assert load_revision(RESUME_ID, USER_ID, 3)["resume_data"] == v3
+
+
+def test_missing_predecessor_starts_a_new_snapshot(db):
+    # Seeded snapshot at v5; the version then moved to v6 without a revision
+    # (e.g. a storage backfill), and the next edit saves v7 from v6
+    v5 = {"summary": "seeded"}
+    v6 = {"summary": "seeded"}
+    v7 = {"summary": "edited"}
+    record_revision(RESUME_ID, USER_ID, 5, "CV", v5)
+    record_revision(RESUME_ID, USER_ID, 7, "CV", v7, previous=v6)
+    record_revision(RESUME_ID, USER_ID, 8, "CV", {"summary": "edited again"}, previous=v7)
+
+    assert _kinds(db) == {5: "snapshot", 7: "snapshot", 8: "delta"}
+    assert load_revision(RESUME_ID, USER_ID, 7)["resume_data"] == v7
+    assert load_revision(RESUME_ID, USER_ID, 8)["resume_data"] == {"summary": "edited again"}
+
+
+def test_snapshot_every_interval(db):
+    previous = None
+    for revision in range(1, resume_revisions.REVISION_SNAPSHOT_INTERVAL + 3):
+        document = {"revision": revision}
+        record_revision(RESUME_ID, USER_ID, revision, "CV", document, previous=previous)
+        previous = document
+
+    snapshots = sorted(revision for revision, kind in _kinds(db).items() if kind == "snapshot")
+    assert snapshots == [1, resume_revisions.REVISION_SNAPSHOT_INTERVAL + 1]
+    last = resume_revisions.REVISION_SNAPSHOT_INTERVAL + 2
+    assert load_revision(RESUME_ID, USER_ID, last)["resume_data"] == {"revision": last}
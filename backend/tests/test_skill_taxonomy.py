@@ -0,0 +1,37 @@
+"""Free-text skill matching in utils/skill_taxonomy.py"""
+from utils.skill_taxonomy import extract_skills, normalize_skill, skill_matcher
+
+POSTING = "Advanced Excel required. iOS developer with Swift and Go experience. Sales Manager: 5 years of sales."
+
+
+def test_prose_words_are_not_skills():
+    text = "You will excel at partnering with our sales team. Go to market fast, then go live. Code samples: github.com/acme"
+    assert extract_skills(text) == []
+
+
+def test_ambiguous_skills_match_in_skill_case():
+    assert sorted(extract_skills(POSTING)) == ["Excel", "Go", "Sales", "Swift"]
+
+
+def test_single_letter_languages_need_a_word_boundary():
+    assert extract_skills("C++ and C# for the R&D team") == ["C++", "C#"]
+    assert sorted(extract_skills("Numerical work in C and R")) == ["C", "R"]
+
+
+def test_longer_spellings_still_match():
+    text = "Reporting in MS Excel, B2B sales experience, Git and GitHub Actions"
+    assert sorted(extract_skills(text)) == ["Excel", "Git", "GitHub Actions", "Sales"]
+
+
+def test_typed_skills_normalize_in_any_case():
+    assert normalize_skill("excel") == "Excel"
+    assert normalize_skill("go") == "Go"
+    assert normalize_skill("Sales") == "Sales"
+    # A platform, not an alias of Git
+    assert normalize_skill("GitHub") == "GitHub"
+
+
+def test_user_skills_match_ambiguous_spellings():
+    matcher = skill_matcher(["Excel", "Swift", "Sales", "Storybook"])
+    counts = matcher.count(POSTING + " Components live in Storybook.")
+    assert counts == {"Excel": 1, "Swift": 1, "Go": 1, "Sales": 1, "Storybook": 1}
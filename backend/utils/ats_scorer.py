@@ -0,0 +1,202 @@
+"""Deterministic ATS-style keyword scoring of a profile against a job posting
+
+Skills are normalized to canonical names through the skill taxonomy
+("React.js", "reactjs" and "react" all become "React"), found in the job
+description by its one-pass matcher, and weighted TF-IDF style: a term's
+weight grows with how often the posting repeats it and shrinks with how many
+of the user's other saved jobs also ask for it, so the requirements that set
+a posting apart count for more than the ones every posting in the user's
+search shares.
+
+The score is computed in-process in milliseconds; the LLM is only needed for
+the narrative around it.
+"""
+from supabase_client import supabase
+from utils.cache import TTLCache
+from utils.etag import resource_version
+from utils.skill_taxonomy import SkillMatcher, custom_skills, normalize_skill, skill_matcher
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+import numpy as np
+import re
+
+# Blend of TF-IDF weighted match, plain coverage and title overlap in the score
+SCORE_WEIGHTS = (0.65, 0.2, 0.15)
+# Score weight of the title when the posting names no recognizable skills
+TITLE_ONLY_WEIGHT = 0.5
+# Occurrences in the job title count this many times
+TITLE_TERM_BOOST = 3
+# Saved jobs read to build the per-user document frequencies
+CORPUS_MAX_JOBS = 500
+CORPUS_TTL_SECONDS = 10 * 60
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+_corpus_cache = TTLCache(ttl_seconds=CORPUS_TTL_SECONDS, max_entries=1024)
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+def extract_terms(text: str, matcher: Optional[SkillMatcher] = None) -> Counter:
+    """Canonical skill -> number of mentions in `text`"""
+    return (matcher or skill_matcher()).count(text or "")
+
+def job_term_counts(job_title: str, job_description: str, matcher: Optional[SkillMatcher] = None) -> Counter:
+    """Skill mentions in a posting, with title mentions boosted"""
+    counts = extract_terms(job_description, matcher)
+    for term, count in extract_terms(job_title, matcher).items():
+        counts[term] += count * TITLE_TERM_BOOST
+    return counts
+
+def _load_corpus(user_id: str, matcher: SkillMatcher) -> Tuple[int, Counter]:
+    response = supabase.table("jobs")\
+        .select("job_title, description")\
+        .eq("user_id", user_id)\
+        .order("created_at", desc=True)\
+        .limit(CORPUS_MAX_JOBS)\
+        .execute()
+    document_frequency: Counter = Counter()
+    rows = response.data or []
+    for row in rows:
+        document_frequency.update(job_term_counts(row.get("job_title") or "", row.get("description") or "", matcher).keys())
+    return len(rows), document_frequency
+
+def user_job_corpus(user_id: str, skills: Iterable[str] = ()) -> Tuple[int, Counter]:
+    """(saved job count, skill -> jobs mentioning it) over the user's saved jobs.
+
+    Terms are found with the same matcher score_job_match uses for `skills`,
+    so the user's skills outside the taxonomy get document frequencies too.
+    Cached per user and skill set and rebuilt when the jobs version moves;
+    (0, {}) when the jobs cannot be read, which reduces the weighting to
+    plain term frequency.
+    """
+    extra = custom_skills(skills)
+    key = (user_id, extra)
+    version = resource_version(user_id, "jobs")
+    cached = _corpus_cache.get(key)
+    if cached is not None and version is not None and cached[0] == version:
+        return cached[1], cached[2]
+    try:
+        doc_count, document_frequency = _load_corpus(user_id, skill_matcher(extra))
+    except Exception as e:
+        print(f"Warning: Could not load job corpus: {str(e)}")
+        return 0, Counter()
+    if version is not None:
+        _corpus_cache.set(key, (version, doc_count, document_frequency))
+    return doc_count, document_frequency
+
+def idf(term: str, doc_count: int, document_frequency: Dict[str, int]) -> float:
+    """Smoothed inverse document frequency; 1.0 for every term on an empty corpus"""
+    return math.log((1 + doc_count) / (1 + document_frequency.get(term, 0))) + 1.0
+
+def term_weights(counts: Dict[str, int], doc_count: int = 0,
+                 document_frequency: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+    """Sublinear TF times IDF for each term of a posting"""
+    document_frequency = document_frequency or {}
+    return {
+        term: (1.0 + math.log(count)) * idf(term, doc_count, document_frequency)
+        for term, count in counts.items() if count > 0
+    }
+
+def title_overlap(job_title: str, profile_titles: Iterable[str]) -> float:
+    """Share of the job title's words found in any of the candidate's titles"""
+    wanted = {token for token in _tokens(job_title or "") if len(token) > 2}
+    if not wanted:
+        return 0.0
+    have = {token for title in profile_titles for token in _tokens(title or "")}
+    return len(wanted & have) / len(wanted)
+
+def score_job_match(job_title: str, job_description: str, skills: Iterable[str],
+                    profile_titles: Iterable[str] = (), doc_count: int = 0,
+                    document_frequency: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Keyword match of a profile against a posting.
+
+    Returns matchScore (0-100), coverage (share of the posting's skills the
+    profile has), weightedMatch (the same share weighted by TF-IDF),
+    titleMatch, and the matched and missing skills heaviest first.
+    """
+    skills = [s for s in skills if s and s.strip()]
+    matcher = skill_matcher(skills)
+    have = {normalize_skill(skill) for skill in skills}
+
+    weights = term_weights(job_term_counts(job_title, job_description, matcher), doc_count, document_frequency)
+    ranked = sorted(weights, key=lambda term: (-weights[term], term))
+    matched = [term for term in ranked if term in have]
+    missing = [term for term in ranked if term not in have]
+
+    total_weight = sum(weights.values())
+    coverage = len(matched) / len(ranked) if ranked else 0.0
+    weighted = sum(weights[term] for term in matched) / total_weight if total_weight else 0.0
+    title_match = title_overlap(job_title, profile_titles)
+
+    if ranked:
+        score = SCORE_WEIGHTS[0] * weighted + SCORE_WEIGHTS[1] * coverage + SCORE_WEIGHTS[2] * title_match
+    else:
+        # No recognizable skills in the posting: the title is all there is to go on
+        score = TITLE_ONLY_WEIGHT * title_match
+
+    return {
+        "matchScore": max(0, min(100, round(score * 100))),
+        "coverage": round(coverage, 4),
+        "weightedMatch": round(weighted, 4),
+        "titleMatch": round(title_match, 4),
+        "matchedSkills": matched,
+        "missingSkills": missing,
+    }
+
+def rank_jobs(jobs: List[Dict[str, Any]], skills: Iterable[str],
+              profile_titles: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """Score every job at once and return them best first.
+
+    `jobs` are rows with id, job_title and description and double as the IDF
+    corpus, so passing all of a user's saved jobs gives the same scores as
+    score_job_match with user_job_corpus(user_id, skills). Each result has
+    job_id plus the fields score_job_match returns.
+    """
+    skills = [s for s in skills if s and s.strip()]
+    profile_titles = list(profile_titles)
+    matcher = skill_matcher(skills)
+    have = {normalize_skill(skill) for skill in skills}
+
+    per_job = [job_term_counts(job.get("job_title") or "", job.get("description") or "", matcher) for job in jobs]
+    terms = sorted(set().union(*per_job)) if per_job else []
+    column = {term: i for i, term in enumerate(terms)}
+
+    # jobs x terms matrix of mention counts
+    counts = np.zeros((len(jobs), len(terms)), dtype=np.float64)
+    for row, job_counts in enumerate(per_job):
+        for term, count in job_counts.items():
+            counts[row, column[term]] = count
+    present = counts > 0
+
+    # Same smoothing and sublinear TF as term_weights, with the jobs as the corpus
+    inverse = np.log((1 + len(jobs)) / (1 + present.sum(axis=0))) + 1.0
+    weights = np.where(present, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0) * inverse
+    profile = np.array([term in have for term in terms], dtype=np.float64)
+
+    total_weight = weights.sum(axis=1)
+    term_count = present.sum(axis=1)
+    weighted = np.divide(weights @ profile, total_weight, out=np.zeros(len(jobs)), where=total_weight > 0)
+    coverage = np.divide(present @ profile, term_count, out=np.zeros(len(jobs)), where=term_count > 0)
+    title_match = np.array([title_overlap(job.get("job_title") or "", profile_titles) for job in jobs])
+
+    blended = SCORE_WEIGHTS[0] * weighted + SCORE_WEIGHTS[1] * coverage + SCORE_WEIGHTS[2] * title_match
+    score = np.where(term_count > 0, blended, TITLE_ONLY_WEIGHT * title_match)
+    # Python's round() so ties land where score_job_match puts them
+    scores = [max(0, min(100, round(float(value) * 100))) for value in score]
+
+    results = []
+    for row in sorted(range(len(jobs)), key=lambda i: -scores[i]):
+        columns = np.flatnonzero(present[row])
+        ranked_terms = sorted((terms[i] for i in columns), key=lambda term: (-weights[row, column[term]], term))
+        results.append({
+            "job_id": str(jobs[row]["id"]),
+            "matchScore": scores[row],
+            "coverage": round(float(coverage[row]), 4),
+            "weightedMatch": round(float(weighted[row]), 4),
+            "titleMatch": round(float(title_match[row]), 4),
+            "matchedSkills": [term for term in ranked_terms if term in have],
+            "missingSkills": [term for term in ranked_terms if term not in have],
+        })
+    return results
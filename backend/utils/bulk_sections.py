@@ -0,0 +1,54 @@
+"""Multi-row writes shared by the profile section routes (skills, experience, education, languages)"""
+from supabase_client import supabase
+from typing import Any, Dict, List, Optional, Sequence
+
+# Section tables -> their key in replace_profile's p_sections (and in the profile snapshot)
+SECTION_TABLES = {
+    "user_skills": "skills",
+    "user_work_experience": "work_experience",
+    "user_education": "education",
+    "user_languages": "languages",
+}
+
+def _dedupe(rows: List[Dict[str, Any]], on_conflict: Optional[str]) -> List[Dict[str, Any]]:
+    """Keep the last row per conflict key; one upsert may not touch the same row twice"""
+    if not on_conflict:
+        return rows
+    columns = [column.strip() for column in on_conflict.split(",")]
+    unique: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        unique[tuple(row.get(column) for column in columns)] = row
+    return list(unique.values())
+
+def insert_rows(table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Insert all rows in one statement (upserting on `on_conflict` when given) and return them"""
+    rows = _dedupe(rows, on_conflict)
+    if not rows:
+        return []
+    if on_conflict:
+        response = supabase.table(table).upsert(rows, on_conflict=on_conflict).execute()
+    else:
+        response = supabase.table(table).insert(rows).execute()
+    return response.data or []
+
+def replace_rows(table: str, user_id: str, rows: List[Dict[str, Any]], on_conflict: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Make `rows` the user's complete set for `table` and return the section.
+
+    Goes through the replace_profile RPC, so the inserts, updates and deletes
+    run in one transaction: a failure leaves the previous section untouched.
+    """
+    section = SECTION_TABLES[table]
+    items = [{key: value for key, value in row.items() if key != "user_id"} for row in _dedupe(rows, on_conflict)]
+    response = supabase.rpc("replace_profile", {
+        "p_user_id": user_id,
+        "p_profile": None,
+        "p_sections": {section: items}
+    }).execute()
+    return (response.data or {}).get(section) or []
+
+def delete_rows(table: str, user_id: str, ids: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Delete the user's rows with the given ids in one statement and return them"""
+    if not ids:
+        return []
+    response = supabase.table(table).delete().eq("user_id", user_id).in_("id", [str(row_id) for row_id in ids]).execute()
+    return response.data or []
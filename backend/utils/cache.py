@@ -0,0 +1,67 @@
+"""Small in-process caches shared by route modules"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import itertools
+import threading
+import time
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire after `ttl_seconds`.
+
+    Every key carries a version that `invalidate` bumps. Loaders read the
+    version before querying and pass it to `set`, so a result fetched before
+    a concurrent write is dropped instead of overwriting the invalidation.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._clock = itertools.count(1)
+        self._version_floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def version(self, key: Hashable) -> int:
+        with self._lock:
+            return max(self._versions.get(key, 0), self._version_floor)
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None, ttl_seconds: Optional[float] = None) -> bool:
+        """Store `value`; returns False when `version` is stale and the write was dropped"""
+        with self._lock:
+            if version is not None and version != max(self._versions.get(key, 0), self._version_floor):
+                return False
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._versions[key] = next(self._clock)
+            if len(self._versions) > self.max_entries * 4:
+                # Forget per-key versions; raising the floor makes every in-flight loader stale
+                self._version_floor = next(self._clock)
+                self._versions.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version_floor = next(self._clock)
+            self._versions.clear()
@@ -2,6 +2,7 @@
 from fastapi import HTTPException, Header, Depends
 from typing import Optional
 from supabase_client import supabase
+from utils.user_email import remember_user_email
 import logging
 
 logger = logging.getLogger("jobstalker")
@@ -48,6 +49,9 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         user_id = user_response.user.id
         user_email = user_response.user.email
         
+        # The verified user carries the current email; keep the profile routes off the admin API
+        remember_user_email(user_id, user_email)
+        
         # Authentication successful - user_id returned
         
         return user_id
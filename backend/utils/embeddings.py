@@ -0,0 +1,290 @@
+"""Embedding vectors for saved jobs and profiles, and similarity search over them
+
+Each saved job and each user's profile is embedded once and stored in
+job_embeddings / profile_embeddings together with a hash of the embedded
+text, so only new or edited content is sent to the embedding API, in batches
+of EMBEDDING_BATCH_SIZE.
+
+Similarity is a brute-force cosine over a per-user NumPy matrix of unit
+vectors, built on first use and kept in process. A user has at most a few
+hundred saved jobs, so a matrix-vector product is fast enough that an ANN
+index would not pay for itself.
+
+Jobs are (re)embedded
+- in the background after a job is created, ingested or its text edited
+  (`queue_job_embeddings`), and
+- when the index is rebuilt, for any job whose text no longer matches its
+  stored hash.
+The profile is re-embedded in the background after a profile write
+(`queue_profile_embedding`), and on the next similarity request if its text
+no longer matches the stored hash.
+
+EMBEDDING_PROVIDER=local switches to a deterministic hashing embedder that
+needs no API key (development and tests).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from supabase_client import supabase
+from utils.cache import TTLCache
+from utils.openai_client import get_openai_client
+from utils.profile_snapshot import load_profile_snapshot
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import hashlib
+import numpy as np
+import os
+import re
+import threading
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 512
+EMBEDDING_BATCH_SIZE = 96
+# Characters of each text sent for embedding (well under the model's token limit)
+EMBEDDING_MAX_CHARS = 8000
+EMBEDDING_INDEX_TTL_SECONDS = 10 * 60
+# Saved jobs included in a user's index, newest first
+EMBEDDING_MAX_JOBS = 500
+# Job columns that make up the embedded text; edits to others keep the vectors
+EMBEDDED_JOB_FIELDS = ("job_title", "company", "description")
+
+_index_cache = TTLCache(ttl_seconds=EMBEDDING_INDEX_TTL_SECONDS, max_entries=512)
+_profile_cache = TTLCache(ttl_seconds=EMBEDDING_INDEX_TTL_SECONDS, max_entries=2048)
+_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="embeddings")
+_pending_users = set()
+_pending_profiles = set()
+_pending_lock = threading.Lock()
+
+class OpenAIEmbedder:
+    """OpenAI embeddings API, shortened to EMBEDDING_DIMENSIONS"""
+    model = f"{EMBEDDING_MODEL}@{EMBEDDING_DIMENSIONS}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        client = get_openai_client()
+        response = client.embeddings.create(model=EMBEDDING_MODEL, input=texts, dimensions=EMBEDDING_DIMENSIONS)
+        return np.array([item.embedding for item in sorted(response.data, key=lambda item: item.index)], dtype=np.float32)
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder: token and bigram hashes into a fixed vector"""
+    model = f"local-hashing@{EMBEDDING_DIMENSIONS}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), EMBEDDING_DIMENSIONS), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = re.findall(r"[a-z0-9+#]+", text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % EMBEDDING_DIMENSIONS
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vectors
+
+def get_embedder():
+    if os.getenv("EMBEDDING_PROVIDER", "openai").lower() == "local":
+        return HashingEmbedder()
+    return OpenAIEmbedder()
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def embed_texts(texts: List[str], embedder=None) -> np.ndarray:
+    """Unit vectors for `texts`, one API call per EMBEDDING_BATCH_SIZE texts"""
+    embedder = embedder or get_embedder()
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+    batches = [
+        embedder.embed([text[:EMBEDDING_MAX_CHARS] for text in texts[start:start + EMBEDDING_BATCH_SIZE]])
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    ]
+    return _normalize(np.vstack(batches).astype(np.float32))
+
+def job_embedding_text(job: Dict[str, Any]) -> str:
+    parts = [job.get(field) or "" for field in EMBEDDED_JOB_FIELDS]
+    return "\n".join(part.strip() for part in parts if part and part.strip())
+
+def profile_embedding_text(snapshot: Dict[str, Any]) -> str:
+    profile = snapshot.get("profile") or {}
+    lines = [profile.get("job_title") or "", profile.get("professional_summary") or ""]
+    skills = [skill.get("name") for skill in snapshot.get("skills", []) if skill.get("name")]
+    if skills:
+        lines.append("Skills: " + ", ".join(skills))
+    for exp in snapshot.get("work_experience", []):
+        lines.append(f"{exp.get('title') or ''} at {exp.get('company') or ''}. {exp.get('description') or ''}")
+    for edu in snapshot.get("education", []):
+        lines.append(" ".join(part for part in (edu.get("degree"), edu.get("field"), edu.get("school")) if part))
+    return "\n".join(line.strip() for line in lines if line and line.strip())
+
+class JobIndex(NamedTuple):
+    model: str
+    jobs: List[Dict[str, Any]]  # id, job_title, company, status per row
+    matrix: np.ndarray  # len(jobs) x EMBEDDING_DIMENSIONS unit vectors
+    rows: Dict[str, int]  # job id -> row
+
+def _build_job_index(user_id: str, embedder) -> JobIndex:
+    jobs_response = supabase.table("jobs")\
+        .select("id, job_title, company, status, description")\
+        .eq("user_id", user_id)\
+        .order("created_at", desc=True)\
+        .limit(EMBEDDING_MAX_JOBS)\
+        .execute()
+    jobs = jobs_response.data or []
+    stored_response = supabase.table("job_embeddings")\
+        .select("job_id, content_hash, embedding")\
+        .eq("user_id", user_id)\
+        .eq("model", embedder.model)\
+        .execute()
+    stored = {str(row["job_id"]): row for row in stored_response.data or []}
+
+    vectors: Dict[str, np.ndarray] = {}
+    stale: List[Tuple[str, str, str]] = []  # (job id, text, hash)
+    for job in jobs:
+        job_id = str(job["id"])
+        text = job_embedding_text(job)
+        if not text:
+            continue
+        digest = _content_hash(text)
+        row = stored.get(job_id)
+        if row and row["content_hash"] == digest and row.get("embedding"):
+            vectors[job_id] = np.asarray(row["embedding"], dtype=np.float32)
+        else:
+            stale.append((job_id, text, digest))
+
+    if stale:
+        embedded = embed_texts([text for _, text, _ in stale], embedder)
+        rows = []
+        for (job_id, _, digest), vector in zip(stale, embedded):
+            vectors[job_id] = vector
+            rows.append({
+                "job_id": job_id,
+                "user_id": user_id,
+                "model": embedder.model,
+                "content_hash": digest,
+                "embedding": vector.tolist(),
+            })
+        try:
+            supabase.table("job_embeddings").upsert(rows, on_conflict="job_id").execute()
+        except Exception as e:
+            print(f"Warning: Could not store job embeddings: {str(e)}")
+        print(f"🧭 EMBEDDINGS: Embedded {len(stale)} job(s) for user {user_id}")
+
+    indexed = [
+        {"id": str(job["id"]), "job_title": job.get("job_title"), "company": job.get("company"), "status": job.get("status")}
+        for job in jobs if str(job["id"]) in vectors
+    ]
+    matrix = _normalize(np.vstack([vectors[job["id"]] for job in indexed])) if indexed \
+        else np.zeros((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+    return JobIndex(
+        model=embedder.model,
+        jobs=indexed,
+        matrix=matrix,
+        rows={job["id"]: row for row, job in enumerate(indexed)},
+    )
+
+def job_index(user_id: str) -> JobIndex:
+    """The user's job index, embedding any new or edited jobs first"""
+    embedder = get_embedder()
+    index = _index_cache.get(user_id)
+    if index is not None and index.model == embedder.model:
+        return index
+    version = _index_cache.version(user_id)
+    index = _build_job_index(user_id, embedder)
+    _index_cache.set(user_id, index, version=version)
+    return index
+
+def invalidate_job_embeddings(user_id: str) -> None:
+    """Drop the cached index after the user's jobs change"""
+    _index_cache.invalidate(user_id)
+
+def _refresh_in_background(user_id: str) -> None:
+    with _pending_lock:
+        _pending_users.discard(user_id)
+    try:
+        job_index(user_id)
+    except Exception as e:
+        print(f"Background job embedding failed for user {user_id}: {str(e)}")
+
+def queue_job_embeddings(user_id: str) -> None:
+    """Invalidate the index and embed the user's new or edited jobs in the background"""
+    invalidate_job_embeddings(user_id)
+    with _pending_lock:
+        if user_id in _pending_users:
+            return
+        _pending_users.add(user_id)
+    _background.submit(_refresh_in_background, user_id)
+
+def profile_vector(user_id: str, snapshot: Dict[str, Any]) -> Optional[np.ndarray]:
+    """Unit vector for the profile in `snapshot`, re-embedded only when its text changed"""
+    text = profile_embedding_text(snapshot)
+    if not text:
+        return None
+    embedder = get_embedder()
+    digest = _content_hash(text)
+    cached = _profile_cache.get(user_id)
+    if cached is not None and cached[0] == (embedder.model, digest):
+        return cached[1]
+
+    response = supabase.table("profile_embeddings")\
+        .select("content_hash, embedding")\
+        .eq("user_id", user_id)\
+        .eq("model", embedder.model)\
+        .execute()
+    row = response.data[0] if response.data else None
+    if row and row["content_hash"] == digest and row.get("embedding"):
+        vector = _normalize(np.asarray(row["embedding"], dtype=np.float32))
+    else:
+        vector = embed_texts([text], embedder)[0]
+        try:
+            supabase.table("profile_embeddings").upsert({
+                "user_id": user_id,
+                "model": embedder.model,
+                "content_hash": digest,
+                "embedding": vector.tolist(),
+            }, on_conflict="user_id").execute()
+        except Exception as e:
+            print(f"Warning: Could not store profile embedding: {str(e)}")
+    _profile_cache.set(user_id, ((embedder.model, digest), vector))
+    return vector
+
+def _refresh_profile_in_background(user_id: str) -> None:
+    with _pending_lock:
+        _pending_profiles.discard(user_id)
+    try:
+        profile_vector(user_id, load_profile_snapshot(user_id))
+    except Exception as e:
+        print(f"Background profile embedding failed for user {user_id}: {str(e)}")
+
+def queue_profile_embedding(user_id: str) -> None:
+    """Re-embed the user's profile in the background if its text changed"""
+    with _pending_lock:
+        if user_id in _pending_profiles:
+            return
+        _pending_profiles.add(user_id)
+    _background.submit(_refresh_profile_in_background, user_id)
+
+def _top(index: JobIndex, similarities: np.ndarray, limit: int, exclude: Iterable[int] = ()) -> List[Dict[str, Any]]:
+    similarities = similarities.copy()
+    for row in exclude:
+        similarities[row] = -np.inf
+    count = min(limit, int(np.isfinite(similarities).sum()))
+    if count <= 0:
+        return []
+    # argpartition finds the top rows in linear time; only those are sorted
+    top = np.argpartition(-similarities, count - 1)[:count]
+    top = top[np.argsort(-similarities[top], kind="stable")]
+    return [{**index.jobs[row], "similarity": round(float(similarities[row]), 4)} for row in top]
+
+def similar_jobs(user_id: str, job_id: str, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+    """Saved jobs closest to `job_id`, or None when that job has no embedding"""
+    index = job_index(user_id)
+    row = index.rows.get(job_id)
+    if row is None:
+        return None
+    return _top(index, index.matrix @ index.matrix[row], limit, exclude=(row,))
+
+def best_fit_jobs(user_id: str, snapshot: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+    """Saved jobs closest to the user's profile; empty when the profile has no text"""
+    vector = profile_vector(user_id, snapshot)
+    if vector is None:
+        return []
+    index = job_index(user_id)
+    return _top(index, index.matrix @ vector, limit)
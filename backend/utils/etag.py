@@ -0,0 +1,57 @@
+"""Conditional GET support (ETag / If-None-Match)
+
+Read endpoints ask the `get_resource_version` RPC for a cheap version string of
+the requested resource and derive an ETag from it, so an unchanged poll can be
+answered with 304 Not Modified before the real query runs.
+"""
+from fastapi import Request, Response
+from supabase_client import supabase
+from typing import Optional
+import hashlib
+
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+def resource_version(user_id: str, resource: str) -> Optional[str]:
+    """Version string for one of the user's resources, None when unavailable"""
+    try:
+        response = supabase.rpc("get_resource_version", {"p_user_id": user_id, "p_resource": resource}).execute()
+    except Exception as e:
+        print(f"Warning: Could not compute {resource} version: {str(e)}")
+        return None
+    return response.data if isinstance(response.data, str) else None
+
+def make_etag(user_id: str, resource: str, version: str, query: str = "") -> str:
+    # The query string is part of the key: a filtered page has its own representation
+    digest = hashlib.sha1(f"{user_id}:{resource}:{version}:{query}".encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def check_not_modified(request: Request, response: Response, user_id: str, resource: str,
+                       version: Optional[str] = None) -> Optional[Response]:
+    """Return a 304 response when the client's copy is current.
+
+    Otherwise sets ETag on `response` and returns None so the endpoint builds
+    the full body as usual. Pass `version` when the endpoint already looked it
+    up. Any failure to version the resource simply skips the conditional
+    handling.
+    """
+    if version is None:
+        version = resource_version(user_id, resource)
+    if version is None:
+        return None
+
+    etag = make_etag(user_id, resource, version, request.url.query)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+    return None
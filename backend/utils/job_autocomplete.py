@@ -0,0 +1,66 @@
+"""Company / job title type-ahead over a user's saved jobs
+
+Suggestions come from the `suggest_job_values` RPC (pg_trgm indexed) and are
+cached in process per user and field, keyed by the typed prefix. Once a
+prefix has returned every match, longer prefixes are answered by filtering
+that result locally, so most keystrokes never reach the database.
+"""
+from supabase_client import supabase
+from utils.cache import TTLCache
+from typing import Any, Dict, List
+
+AUTOCOMPLETE_FIELDS = ("company", "job_title")
+AUTOCOMPLETE_TTL_SECONDS = 5 * 60
+# Rows requested per RPC call; a shorter answer means the prefix is complete
+AUTOCOMPLETE_FETCH_LIMIT = 50
+# Prefixes remembered per user and field
+AUTOCOMPLETE_MAX_PREFIXES = 128
+
+_suggestion_cache = TTLCache(ttl_seconds=AUTOCOMPLETE_TTL_SECONDS, max_entries=4096)
+
+def _narrow(values: List[Dict[str, Any]], needle: str) -> List[Dict[str, Any]]:
+    matches = [value for value in values if needle in value["value"].lower()]
+    matches.sort(key=lambda value: (not value["value"].lower().startswith(needle), -value["uses"], value["value"]))
+    return matches
+
+def suggest_job_values(user_id: str, field: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Distinct saved values of `field` matching `query`, best first"""
+    needle = query.strip().lower()
+    if not needle:
+        return []
+
+    key = (user_id, field)
+    version = _suggestion_cache.version(key)
+    prefixes: Dict[str, Dict[str, Any]] = _suggestion_cache.get(key) or {}
+
+    entry = prefixes.get(needle)
+    if entry is None:
+        for length in range(len(needle) - 1, 0, -1):
+            shorter = prefixes.get(needle[:length])
+            if shorter is not None and shorter["complete"]:
+                entry = {"complete": True, "values": _narrow(shorter["values"], needle)}
+                break
+
+    if entry is None:
+        response = supabase.rpc("suggest_job_values", {
+            "p_user_id": user_id,
+            "p_field": field,
+            "p_query": query.strip(),
+            "p_limit": AUTOCOMPLETE_FETCH_LIMIT
+        }).execute()
+        rows = response.data or []
+        entry = {"complete": len(rows) < AUTOCOMPLETE_FETCH_LIMIT, "values": rows}
+
+    if needle not in prefixes:
+        prefixes = dict(prefixes)
+        if len(prefixes) >= AUTOCOMPLETE_MAX_PREFIXES:
+            prefixes.pop(next(iter(prefixes)))
+        prefixes[needle] = entry
+        _suggestion_cache.set(key, prefixes, version=version)
+
+    return entry["values"][:limit]
+
+def invalidate_job_suggestions(user_id: str) -> None:
+    """Forget cached suggestions after the user's jobs change"""
+    for field in AUTOCOMPLETE_FIELDS:
+        _suggestion_cache.invalidate((user_id, field))
@@ -1,9 +1,25 @@
 """Job data extraction utilities using AI and basic parsing"""
 import hashlib
 import re
-import json
 from bs4 import BeautifulSoup
+from pydantic import BaseModel
+from typing import List, Optional
 from utils.openai_client import get_openai_client
+from utils.llm import structured_completion
+
+class ExtractedJobData(BaseModel):
+    """Structured-output schema for AI job extraction"""
+    job_title: str
+    company: str
+    location: Optional[str]
+    salary: Optional[str]
+    description: Optional[str]
+    job_type: Optional[str]
+    experience_level: Optional[str]
+    remote_work: bool
+    benefits: List[str]
+    requirements: List[str]
+    skills: List[str]
 
 # Debug persistence disabled for production
 def save_state_data(state_name: str, data: dict, user_id: str = None, job_url: str = None):
@@ -338,11 +354,11 @@ def extract_job_data_with_ai(html: str, source_url: str) -> dict:
         Salary: {salary if salary else "Not specified"}
         Description Preview: {job_description[:1000] if job_description else "See full content below - extract complete description"}
         
-        Return ONLY a valid JSON object with this structure:
+        Return a JSON object with this structure:
         {{
             "job_title": "string - use the pre-extracted title or extract from content",
             "company": "string - use the pre-extracted company or extract from content", 
-            "location": "string - use the pre-extracted location or extract from content",
+            "location": "string or null - use the pre-extracted location or extract from content",
             "salary": "string or null - use the pre-extracted salary or extract from content",
             "description": "string - REQUIRED: must be the COMPLETE, FULL job description text, not truncated. Include all details from the content.",
             "job_type": "string (e.g., Full-time, Part-time, Contract) - extract from content",
@@ -364,7 +380,7 @@ def extract_job_data_with_ai(html: str, source_url: str) -> dict:
         3. Look for job type, experience level, remote work, benefits, requirements, and skills
         4. For salary: Look for patterns like "$50,000 - $70,000 per year", "$60k annually", "Salary: $45,000", etc.
         5. If content appears to be a login page or not a job posting, return all fields as "Unknown"
-        6. Return ONLY valid JSON, no other text
+        6. Use null for fields that are not present in the content
         7. Focus on the job posting content, ignore navigation elements
         8. Pay special attention to salary information in job descriptions and requirements sections
         9. MOST IMPORTANT: The description field must contain the ENTIRE job description text. If the description is long, include it all. Do not summarize or truncate.
@@ -372,10 +388,11 @@ def extract_job_data_with_ai(html: str, source_url: str) -> dict:
         Return the JSON object now:
         """
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        parsed, response = structured_completion(
+            client,
+            ExtractedJobData,
             messages=[
-                {"role": "system", "content": "You are an expert at extracting job information from HTML. Return only valid JSON. Always include the complete, full job description without truncation."},
+                {"role": "system", "content": "You are an expert at extracting job information from HTML. Always include the complete, full job description without truncation."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=4000,  # Increased to handle longer descriptions
@@ -384,48 +401,17 @@ def extract_job_data_with_ai(html: str, source_url: str) -> dict:
         
         print(f"🤖 AI EXTRACTION: OpenAI API call completed")
         
-        # Save AI API call state
-        save_state_data(f"ai_api_call_{extraction_id}", {
+        extracted_data = parsed.model_dump()
+        print(f"🤖 AI EXTRACTION: Successfully parsed JSON data: {extracted_data}")
+        
+        # Save successful extraction result
+        save_state_data(f"ai_extraction_success_{extraction_id}", {
             "extraction_id": extraction_id,
-            "model": "gpt-4o-mini",
-            "max_tokens": 2000,
-            "temperature": 0.1,
-            "prompt_length": len(prompt)
+            "extracted_data": extracted_data,
+            "success": True
         })
         
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        print(f"🤖 AI EXTRACTION: OpenAI raw response: {content}")
-        
-        # Save AI response
-        save_cleaned_content(content, "ai_extraction", source_url, f"ai_response_{extraction_id}")
-        
-        # Extract JSON from response (in case there's extra text)
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            extracted_data = json.loads(json_match.group())
-            print(f"🤖 AI EXTRACTION: Successfully parsed JSON data: {extracted_data}")
-            
-            # Save successful extraction result
-            save_state_data(f"ai_extraction_success_{extraction_id}", {
-                "extraction_id": extraction_id,
-                "extracted_data": extracted_data,
-                "success": True
-            })
-            
-            return extracted_data
-        else:
-            print(f"❌ AI EXTRACTION: No JSON found in OpenAI response")
-            
-            # Save failed extraction result
-            save_state_data(f"ai_extraction_failed_{extraction_id}", {
-                "extraction_id": extraction_id,
-                "raw_response": content,
-                "error": "No JSON found in OpenAI response",
-                "success": False
-            })
-            
-            raise ValueError("No JSON found in OpenAI response")
+        return extracted_data
             
     except Exception as e:
         print(f"❌ AI EXTRACTION: OpenAI extraction error: {str(e)}")
@@ -0,0 +1,83 @@
+"""Readers for the trigger-maintained job statistics tables
+
+job_status_counts, job_weekly_counts and job_stage_durations are kept up to
+date by triggers on public.jobs, so every read here touches a few small rows
+regardless of how many jobs a user has.
+"""
+from supabase_client import supabase
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# Kanban columns in pipeline order
+JOB_STAGES = ("Bookmarked", "Applying", "Applied", "Interviewing", "Accepted")
+
+def fetch_status_counts(user_id: str) -> Dict[str, int]:
+    """Current number of jobs per status"""
+    try:
+        response = supabase.table("job_status_counts").select("status,job_count").eq("user_id", user_id).execute()
+        return {row["status"]: row["job_count"] for row in response.data or [] if row["job_count"] > 0}
+    except Exception as e:
+        # Counters not deployed yet: count from the jobs table
+        print(f"Warning: job_status_counts unavailable, counting jobs: {str(e)}")
+        jobs_response = supabase.table("jobs").select("status").eq("user_id", user_id).execute()
+        counts: Dict[str, int] = {}
+        for job in jobs_response.data or []:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+def build_funnel(status_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Funnel over JOB_STAGES; a job counts as having reached every stage up to its current one"""
+    funnel = []
+    reached = 0
+    for status in reversed(JOB_STAGES):
+        reached += status_counts.get(status, 0)
+        funnel.append({"status": status, "count": status_counts.get(status, 0), "reached": reached})
+    funnel.reverse()
+
+    previous = None
+    for stage in funnel:
+        if previous is not None:
+            stage["conversion_rate"] = round(stage["reached"] / previous, 4) if previous else 0.0
+        previous = stage["reached"]
+    return funnel
+
+def fetch_stage_durations(user_id: str) -> List[Dict[str, Any]]:
+    """Average days spent in each status before moving on"""
+    response = supabase.table("job_stage_durations").select("status,transitions,total_seconds").eq("user_id", user_id).execute()
+    rows = {row["status"]: row for row in response.data or [] if row["transitions"] > 0}
+    ordered = [status for status in JOB_STAGES if status in rows] + sorted(set(rows) - set(JOB_STAGES))
+    return [
+        {
+            "status": status,
+            "transitions": rows[status]["transitions"],
+            "average_days": round(rows[status]["total_seconds"] / rows[status]["transitions"] / 86400, 2),
+        }
+        for status in ordered
+    ]
+
+def fetch_weekly_activity(user_id: str, weeks: int) -> List[Dict[str, Any]]:
+    """Jobs added and applications per ISO week for the last `weeks` weeks, oldest first"""
+    today = date.today()
+    current_week = today - timedelta(days=today.weekday())
+    first_week = current_week - timedelta(weeks=weeks - 1)
+
+    response = (
+        supabase.table("job_weekly_counts")
+        .select("week_start,jobs_added,applications")
+        .eq("user_id", user_id)
+        .gte("week_start", first_week.isoformat())
+        .lte("week_start", current_week.isoformat())
+        .execute()
+    )
+    by_week = {row["week_start"]: row for row in response.data or []}
+
+    activity = []
+    for offset in range(weeks):
+        week_start = first_week + timedelta(weeks=offset)
+        row = by_week.get(week_start.isoformat(), {})
+        activity.append({
+            "week_start": week_start,
+            "jobs_added": row.get("jobs_added", 0),
+            "applications": row.get("applications", 0),
+        })
+    return activity
@@ -0,0 +1,161 @@
+"""JSON Patch (RFC 6902) and JSON Merge Patch (RFC 7386) for stored JSON documents
+
+The apply functions return a new document and leave their inputs untouched;
+create_json_patch produces the operations between two documents.
+"""
+from typing import Any, Dict, List
+import copy
+import re
+
+class JsonPatchError(ValueError):
+    """The patch is malformed or cannot be applied to the document"""
+
+_MISSING = object()
+
+def _parse_pointer(pointer: Any) -> List[str]:
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if pointer == "":
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+def _array_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    # ASCII digits without leading zeros (str.isdigit also accepts e.g. "²")
+    if not re.fullmatch(r"0|[1-9][0-9]*", token):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+def _resolve(document: Any, tokens: List[str]) -> Any:
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_array_index(value, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return value
+
+def _json_equal(left: Any, right: Any) -> bool:
+    """Type-strict equality for "test": Python's == treats 1, 1.0 and True as equal"""
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(_json_equal(value, right[key]) for key, value in left.items())
+    if isinstance(left, list):
+        return len(left) == len(right) and all(_json_equal(a, b) for a, b in zip(left, right))
+    return left == right
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at /{'/'.join(tokens[:-1])}")
+    return document
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, key, allow_end=False))
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+def apply_json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """Apply RFC 6902 operations in order; any failing operation rejects the whole patch"""
+    if not isinstance(operations, list):
+        raise JsonPatchError("A JSON Patch must be an array of operations")
+
+    result = copy.deepcopy(document)
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise JsonPatchError(f"Operation {index} is not an object")
+        op = operation.get("op")
+        tokens = _parse_pointer(operation.get("path"))
+        value = operation.get("value", _MISSING)
+        if op in ("add", "replace", "test") and value is _MISSING:
+            raise JsonPatchError(f"Operation {index} ({op}) needs a value")
+
+        if op == "add":
+            result = _add(result, tokens, copy.deepcopy(value))
+        elif op == "remove":
+            _remove(result, tokens)
+        elif op == "replace":
+            if not tokens:
+                result = copy.deepcopy(value)
+            else:
+                _remove(result, tokens)
+                result = _add(result, tokens, copy.deepcopy(value))
+        elif op in ("move", "copy"):
+            source = _parse_pointer(operation.get("from"))
+            if op == "move" and tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError(f"Operation {index} moves a value into itself")
+            if op == "move":
+                moved = result if not source else _remove(result, source)
+            else:
+                moved = copy.deepcopy(_resolve(result, source))
+            result = _add(result, tokens, moved)
+        elif op == "test":
+            if not _json_equal(_resolve(result, tokens), value):
+                raise JsonPatchError(f"Test failed at {operation.get('path')}")
+        else:
+            raise JsonPatchError(f"Unknown operation {op!r} at index {index}")
+    return result
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7386 merge patch: objects merge recursively, null deletes, anything else replaces"""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+def _diff(before: Any, after: Any, path: str, operations: List[Dict[str, Any]]) -> None:
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in before:
+            if key not in after:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in after.items():
+            if key not in before:
+                operations.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": copy.deepcopy(value)})
+            else:
+                _diff(before[key], value, f"{path}/{_escape(key)}", operations)
+        return
+    # Same-length arrays are diffed per item; inserts and reorders replace the whole array
+    if isinstance(before, list) and isinstance(after, list) and len(before) == len(after):
+        for index, (old, new) in enumerate(zip(before, after)):
+            _diff(old, new, f"{path}/{index}", operations)
+        return
+    if before != after or type(before) is not type(after):
+        operations.append({"op": "replace", "path": path, "value": copy.deepcopy(after)})
+
+def create_json_patch(before: Any, after: Any) -> List[Dict[str, Any]]:
+    """RFC 6902 operations that turn `before` into `after`"""
+    operations: List[Dict[str, Any]] = []
+    _diff(before, after, "", operations)
+    return operations
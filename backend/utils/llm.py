@@ -0,0 +1,128 @@
+"""Structured-output helpers for OpenAI chat completions"""
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+import logging
+
+logger = logging.getLogger("jobstalker")
+
+T = TypeVar("T", bound=BaseModel)
+
+# Keywords OpenAI's strict json_schema mode rejects or ignores
+_UNSUPPORTED_SCHEMA_KEYS = ("title", "default", "examples", "minLength", "maxLength", "minItems", "maxItems")
+
+# Cap on max_tokens when a truncated response is retried with a larger budget
+MAX_TOKENS_CEILING = 16384
+
+
+# Keywords whose value is a single subschema, a list of subschemas, or a name -> subschema map
+_SUBSCHEMA_KEYS = ("items", "not", "additionalProperties")
+_SUBSCHEMA_LIST_KEYS = ("anyOf", "oneOf", "allOf", "prefixItems")
+_SUBSCHEMA_MAP_KEYS = ("properties", "$defs", "definitions")
+
+
+def _strict_schema(node: Any) -> Any:
+    """Rewrite a Pydantic JSON schema into the subset accepted by strict mode.
+
+    Strict mode requires every object to list all of its properties as required
+    and to forbid additional properties; optional fields stay nullable via anyOf.
+    Unsupported keywords are only stripped from schema nodes, so a property
+    that happens to be named e.g. `title` is kept.
+    """
+    if not isinstance(node, dict):
+        return node
+    result: Dict[str, Any] = {}
+    for key, value in node.items():
+        if key in _UNSUPPORTED_SCHEMA_KEYS:
+            continue
+        if key in _SUBSCHEMA_MAP_KEYS and isinstance(value, dict):
+            result[key] = {name: _strict_schema(subschema) for name, subschema in value.items()}
+        elif key in _SUBSCHEMA_LIST_KEYS and isinstance(value, list):
+            result[key] = [_strict_schema(subschema) for subschema in value]
+        elif key in _SUBSCHEMA_KEYS and isinstance(value, dict):
+            result[key] = _strict_schema(value)
+        else:
+            # enum, const, required, description, ...: literal values, copied as they are
+            result[key] = value
+    if result.get("type") == "object" and "properties" in result:
+        result["required"] = list(result["properties"].keys())
+        result["additionalProperties"] = False
+    return result
+
+
+def response_format_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Build the `response_format` payload requesting output matching `model`"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": _strict_schema(model.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
+def structured_completion(
+    client,
+    response_model: Type[T],
+    messages: List[Dict[str, str]],
+    model: str = "gpt-4o-mini",
+    max_tokens: Optional[int] = None,
+    temperature: float = 0.3,
+    max_attempts: int = 2,
+) -> Tuple[T, Any]:
+    """Run a chat completion constrained to `response_model`'s JSON schema.
+
+    Returns the validated model and the raw completion (for usage logging).
+    Only a call whose output fails validation is retried; API errors propagate.
+    Output cut off at max_tokens (finish_reason "length") is retried with twice
+    the budget, up to MAX_TOKENS_CEILING; without a max_tokens it fails at once.
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(1, max_attempts + 1):
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "response_format": response_format_for(response_model),
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+
+        response = client.chat.completions.create(**kwargs)
+        choice = response.choices[0]
+        content = choice.message.content or ""
+
+        if getattr(choice.message, "refusal", None):
+            raise HTTPException(status_code=502, detail="AI service declined to answer this request")
+
+        if choice.finish_reason == "length":
+            # Truncated JSON: retrying with the same max_tokens would truncate it again
+            if max_tokens is None or max_tokens >= MAX_TOKENS_CEILING or attempt == max_attempts:
+                raise HTTPException(status_code=502, detail="AI service response was cut off before it was complete")
+            logger.warning(
+                f"Structured output for {response_model.__name__} hit max_tokens={max_tokens} "
+                f"(attempt {attempt}/{max_attempts}); retrying with a larger budget"
+            )
+            max_tokens = min(max_tokens * 2, MAX_TOKENS_CEILING)
+            continue
+
+        try:
+            return response_model.model_validate_json(content), response
+        except ValidationError as e:
+            last_error = e
+            logger.warning(
+                f"Structured output for {response_model.__name__} failed validation "
+                f"(attempt {attempt}/{max_attempts}, finish_reason={choice.finish_reason}): {e}"
+            )
+
+    raise HTTPException(
+        status_code=502,
+        detail=f"AI service returned an invalid response: {str(last_error)}"
+    )
+
+
+def tokens_used(response: Any) -> int:
+    """Total tokens reported by a completion, 0 when unavailable"""
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", 0) or 0
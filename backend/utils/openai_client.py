@@ -12,3 +12,11 @@ def get_openai_client():
     client = openai.OpenAI(api_key=api_key)
     return client
 
+
+def get_async_openai_client():
+    """Get async OpenAI client for concurrent and streaming completions"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    
+    return openai.AsyncOpenAI(api_key=api_key)
@@ -0,0 +1,25 @@
+"""Opaque keyset cursors for paginated list endpoints"""
+from fastapi import HTTPException
+from typing import Any, List
+import base64
+import json
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort-key values of the last returned row into a URL-safe token"""
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """Unpack a cursor produced by encode_cursor, raising 400 when it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def postgrest_quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=(...) filter"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
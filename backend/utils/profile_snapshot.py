@@ -0,0 +1,142 @@
+"""Coalesced profile snapshot loader
+
+Loads a user's profile row together with skills, work experience, education
+and languages in one round trip via the `get_profile_snapshot` RPC, and keeps
+the result in a short-TTL per-user cache that the CRUD routes invalidate.
+"""
+from supabase_client import supabase
+from utils.cache import TTLCache
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import copy
+
+PROFILE_SNAPSHOT_TTL_SECONDS = 30
+SNAPSHOT_SECTIONS = ("skills", "work_experience", "education", "languages")
+
+_snapshot_cache = TTLCache(ttl_seconds=PROFILE_SNAPSHOT_TTL_SECONDS, max_entries=2048)
+
+def _empty_snapshot() -> Dict[str, Any]:
+    return {"profile": None, **{section: [] for section in SNAPSHOT_SECTIONS}}
+
+def _normalize_snapshot(data: Any) -> Dict[str, Any]:
+    """Coerce the RPC payload into the snapshot shape"""
+    snapshot = _empty_snapshot()
+    if isinstance(data, list):
+        data = data[0] if data else None
+    if isinstance(data, dict):
+        snapshot["profile"] = data.get("profile") or None
+        for section in SNAPSHOT_SECTIONS:
+            snapshot[section] = data.get(section) or []
+    return snapshot
+
+def _profile_query(user_id: str):
+    return supabase.table("user_profile").select("*").eq("user_id", user_id)
+
+def _section_queries(user_id: str) -> Dict[str, Callable[[], Any]]:
+    return {
+        "skills": lambda: supabase.table("user_skills").select("*").eq("user_id", user_id).order("created_at", desc=False),
+        "work_experience": lambda: supabase.table("user_work_experience").select("*").eq("user_id", user_id).order("start_date", desc=True),
+        "education": lambda: supabase.table("user_education").select("*").eq("user_id", user_id).order("start_date", desc=True),
+        "languages": lambda: supabase.table("user_languages").select("*").eq("user_id", user_id).order("created_at", desc=False),
+    }
+
+def _fetch_section(section: str, query: Callable[[], Any]) -> List[Dict[str, Any]]:
+    try:
+        return query().execute().data or []
+    except Exception as e:
+        print(f"Warning: Could not fetch {section}: {str(e)}")
+        return []
+
+def _load_snapshot_per_table(user_id: str) -> Dict[str, Any]:
+    """Fallback when the RPC is not deployed: one query per table"""
+    snapshot = _empty_snapshot()
+
+    profile_response = _profile_query(user_id).execute()
+    snapshot["profile"] = profile_response.data[0] if profile_response.data else None
+
+    for section, query in _section_queries(user_id).items():
+        snapshot[section] = _fetch_section(section, query)
+    return snapshot
+
+async def _aload_snapshot_per_table(user_id: str) -> Dict[str, Any]:
+    """Fallback issuing the per-table queries concurrently in the threadpool"""
+    queries = _section_queries(user_id)
+    profile_response, *sections = await asyncio.gather(
+        asyncio.to_thread(lambda: _profile_query(user_id).execute()),
+        *[asyncio.to_thread(_fetch_section, section, query) for section, query in queries.items()]
+    )
+
+    snapshot = _empty_snapshot()
+    snapshot["profile"] = profile_response.data[0] if profile_response.data else None
+    for section, rows in zip(queries.keys(), sections):
+        snapshot[section] = rows
+    return snapshot
+
+def fetch_profile_snapshot(user_id: str) -> Dict[str, Any]:
+    """Query the snapshot from the database, bypassing the cache"""
+    try:
+        response = supabase.rpc("get_profile_snapshot", {"p_user_id": user_id}).execute()
+        return _normalize_snapshot(response.data)
+    except Exception as e:
+        print(f"Warning: get_profile_snapshot RPC failed, falling back to per-table queries: {str(e)}")
+        return _load_snapshot_per_table(user_id)
+
+async def afetch_profile_snapshot(user_id: str) -> Dict[str, Any]:
+    """Async variant of fetch_profile_snapshot that keeps the event loop free"""
+    try:
+        response = await asyncio.to_thread(
+            lambda: supabase.rpc("get_profile_snapshot", {"p_user_id": user_id}).execute()
+        )
+        return _normalize_snapshot(response.data)
+    except Exception as e:
+        print(f"Warning: get_profile_snapshot RPC failed, falling back to per-table queries: {str(e)}")
+        return await _aload_snapshot_per_table(user_id)
+
+def _cached_snapshot(user_id: str, resource_version: Optional[str]) -> Optional[Dict[str, Any]]:
+    entry = _snapshot_cache.get(user_id)
+    if entry is None:
+        return None
+    cached_version, snapshot = entry
+    # Another worker may have written since this entry was loaded; only the
+    # caller's version (e.g. the one behind the ETag it sends) can tell
+    if resource_version is not None and cached_version != resource_version:
+        return None
+    return copy.deepcopy(snapshot)
+
+def load_profile_snapshot(user_id: str, resource_version: Optional[str] = None) -> Dict[str, Any]:
+    """Return {"profile", "skills", "work_experience", "education", "languages"} for a user.
+
+    With `resource_version` (the get_resource_version "profile" value) a cached
+    snapshot is only used if it was loaded under that same version.
+    The returned dict is a private copy; callers may mutate it freely.
+    """
+    cached = _cached_snapshot(user_id, resource_version)
+    if cached is not None:
+        return cached
+
+    version = _snapshot_cache.version(user_id)
+    snapshot = fetch_profile_snapshot(user_id)
+    _snapshot_cache.set(user_id, (resource_version, snapshot), version=version)
+    return copy.deepcopy(snapshot)
+
+async def aload_profile_snapshot(user_id: str, resource_version: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of load_profile_snapshot"""
+    cached = _cached_snapshot(user_id, resource_version)
+    if cached is not None:
+        return cached
+
+    version = _snapshot_cache.version(user_id)
+    snapshot = await afetch_profile_snapshot(user_id)
+    _snapshot_cache.set(user_id, (resource_version, snapshot), version=version)
+    return copy.deepcopy(snapshot)
+
+def store_profile_snapshot(user_id: str, data: Any) -> Dict[str, Any]:
+    """Cache a snapshot returned by a write RPC (e.g. replace_profile) and return a copy"""
+    snapshot = _normalize_snapshot(data)
+    _snapshot_cache.invalidate(user_id)
+    _snapshot_cache.set(user_id, (None, snapshot), version=_snapshot_cache.version(user_id))
+    return copy.deepcopy(snapshot)
+
+def invalidate_profile_snapshot(user_id: str) -> None:
+    """Drop the cached snapshot after any write to the user's profile data"""
+    _snapshot_cache.invalidate(user_id)
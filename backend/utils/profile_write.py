@@ -0,0 +1,27 @@
+"""Single round-trip writes to a user's user_profile row"""
+from supabase_client import supabase
+from utils.profile_snapshot import invalidate_profile_snapshot
+from utils.embeddings import queue_profile_embedding
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+def upsert_profile(user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Update the user's profile row with `data`, creating it if missing, and return the row.
+
+    Relies on the unique user_profile.user_id constraint: one INSERT ... ON
+    CONFLICT (user_id) DO UPDATE replaces the old select-then-update/insert
+    pair and cannot race into duplicate rows. Only the keys in `data` are
+    written; a freshly inserted row takes column defaults for the rest.
+    """
+    row = {**data, "user_id": user_id, "updated_at": datetime.utcnow().isoformat()}
+    # email is managed by auth.users, not user_profile
+    row.pop("email", None)
+
+    response = (
+        supabase.table("user_profile")
+        .upsert(row, on_conflict="user_id", default_to_null=False)
+        .execute()
+    )
+    invalidate_profile_snapshot(user_id)
+    queue_profile_embedding(user_id)
+    return response.data[0] if response.data else None
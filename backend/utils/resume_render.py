@@ -0,0 +1,317 @@
+"""Server-side resume rendering (HTML and PDF)
+
+`render_resume_html` / `render_resume_pdf` turn resume_data plus a template
+schema (see seed_template.py) into a document. They are pure functions so
+they can run in worker processes: `render_resume` sends CPU-bound layout to a
+process pool and caches the output under a hash of the template version and
+resume content, so unchanged resumes are never laid out twice.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils.cache import TTLCache
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import asyncio
+import hashlib
+import html
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+
+RENDER_FORMATS = ("pdf", "html")
+RENDER_CACHE_TTL_SECONDS = 60 * 60
+RENDER_CACHE_MAX_ENTRIES = 256
+RENDER_WORKERS = int(os.getenv("RESUME_RENDER_WORKERS", "2"))
+
+SECTION_TYPES = ("header", "summary", "work", "education", "skills", "languages")
+DEFAULT_SECTIONS = [{"type": section_type, "order": order, "visible": True} for order, section_type in enumerate(SECTION_TYPES, 1)]
+DEFAULT_TITLES = {"summary": "Summary", "work": "Work Experience", "education": "Education", "skills": "Skills", "languages": "Languages"}
+
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+def _plain(value: Any) -> Any:
+    """Registry schemas are frozen (mapping proxies / tuples); workers need plain JSON types"""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+def _color(value: Any, default: str) -> str:
+    return value if isinstance(value, str) and _HEX_COLOR.match(value) else default
+
+def _text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+def _sections(schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    sections = schema.get("sections") if isinstance(schema.get("sections"), list) else DEFAULT_SECTIONS
+    visible = [section for section in sections if isinstance(section, dict) and section.get("visible", True) and section.get("type") in SECTION_TYPES]
+    return sorted(visible, key=lambda section: section.get("order", 0))
+
+def _theme(schema: Dict[str, Any]) -> Dict[str, str]:
+    theme = schema.get("theme") if isinstance(schema.get("theme"), dict) else {}
+    return {
+        "primary": _color(theme.get("primaryColor"), "#2563eb"),
+        "text": _color(theme.get("textColor"), "#111827"),
+        "border": _color(theme.get("borderColor"), "#e5e7eb"),
+    }
+
+def _list(resume_data: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    items = resume_data.get(key)
+    return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+def _full_name(info: Dict[str, Any]) -> str:
+    return " ".join(part for part in (_text(info.get("firstName")), _text(info.get("lastName"))) if part)
+
+def _contact_line(info: Dict[str, Any]) -> List[str]:
+    return [_text(info.get(key)) for key in ("email", "phone", "location", "linkedin", "website") if _text(info.get(key))]
+
+def _date_range(item: Dict[str, Any]) -> str:
+    end = "Present" if item.get("isCurrent") else _text(item.get("endDate"))
+    return " - ".join(part for part in (_text(item.get("startDate")), end) if part)
+
+def _description_lines(description: Any) -> List[str]:
+    lines = [line.strip() for line in _text(description).splitlines()]
+    return [re.sub(r"^[•\-*]\s*", "", line) for line in lines if line]
+
+def _summary(resume_data: Dict[str, Any]) -> str:
+    info = resume_data.get("personalInfo") if isinstance(resume_data.get("personalInfo"), dict) else {}
+    return _text(resume_data.get("summary")) or _text(info.get("summary"))
+
+# ---------------------------------------------------------------------------
+# HTML
+# ---------------------------------------------------------------------------
+
+def _css(style: Any) -> str:
+    if not isinstance(style, dict):
+        return ""
+    declarations = []
+    for key, value in style.items():
+        if key == "primaryColor" or not isinstance(value, (str, int, float)):
+            continue
+        prop = re.sub(r"([A-Z])", lambda match: "-" + match.group(1).lower(), key)
+        declarations.append(f"{prop}:{value}")
+    return html.escape(";".join(declarations), quote=True)
+
+def render_resume_html(schema: Dict[str, Any], resume_data: Dict[str, Any], title: str = "Resume") -> str:
+    """Standalone HTML document for the resume"""
+    schema = _plain(schema) if schema else {}
+    theme = _theme(schema)
+    info = resume_data.get("personalInfo") if isinstance(resume_data.get("personalInfo"), dict) else {}
+    e = html.escape
+    parts = []
+
+    for section in _sections(schema):
+        kind = section["type"]
+        heading = ""
+        if kind != "header" and section.get("showTitle", True):
+            heading = f'<h2 style="color:{theme["primary"]}">{e(_text(section.get("title")) or DEFAULT_TITLES[kind])}</h2>'
+        body = ""
+        if kind == "header":
+            headline = e(_text(info.get("jobTitle")))
+            contact = " &middot; ".join(e(item) for item in _contact_line(info))
+            body = f'<h1 style="color:{theme["primary"]}">{e(_full_name(info))}</h1>'
+            body += f'<p class="headline">{headline}</p>' if headline else ""
+            body += f'<p class="contact">{contact}</p>' if contact else ""
+        elif kind == "summary" and _summary(resume_data):
+            body = f"<p>{e(_summary(resume_data))}</p>"
+        elif kind == "work":
+            for item in _list(resume_data, "workExperience"):
+                company = ", ".join(part for part in (_text(item.get("company")), _text(item.get("location"))) if part)
+                bullets = "".join(f"<li>{e(line)}</li>" for line in _description_lines(item.get("description")))
+                body += (
+                    f'<div class="entry"><div class="entry-head"><strong>{e(_text(item.get("title")))}</strong>'
+                    f'<span>{e(_date_range(item))}</span></div><div class="sub">{e(company)}</div>'
+                    + (f"<ul>{bullets}</ul>" if bullets else "") + "</div>"
+                )
+        elif kind == "education":
+            for item in _list(resume_data, "education"):
+                degree = ", ".join(part for part in (_text(item.get("degree")), _text(item.get("field"))) if part)
+                body += (
+                    f'<div class="entry"><div class="entry-head"><strong>{e(_text(item.get("school")))}</strong>'
+                    f'<span>{e(_date_range(item))}</span></div><div class="sub">{e(degree)}</div></div>'
+                )
+        elif kind == "skills":
+            names = [_text(item.get("name")) for item in _list(resume_data, "skills") if _text(item.get("name"))]
+            body = f"<p>{e(', '.join(names))}</p>" if names else ""
+        elif kind == "languages":
+            languages = [
+                f"{_text(item.get('name'))} ({_text(item.get('proficiency'))})" if _text(item.get("proficiency")) else _text(item.get("name"))
+                for item in _list(resume_data, "languages") if _text(item.get("name"))
+            ]
+            body = f"<p>{e(', '.join(languages))}</p>" if languages else ""
+        if body:
+            parts.append(f'<section class="{kind}" style="{_css(section.get("style"))}">{heading}{body}</section>')
+
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{e(title)}</title><style>"
+        f"body{{font-family:system-ui,-apple-system,'Segoe UI',Roboto,Arial,sans-serif;color:{theme['text']};"
+        "max-width:800px;margin:0 auto;padding:28px;font-size:14px;line-height:1.45}"
+        "h1{margin:0;font-size:26px}h2{font-size:13px;text-transform:uppercase;letter-spacing:.05em;"
+        f"border-bottom:1px solid {theme['border']};padding-bottom:4px;margin:18px 0 8px}}"
+        ".headline{margin:2px 0;font-size:15px}.contact{margin:2px 0;color:#6b7280;font-size:12px}"
+        ".entry{margin-bottom:10px}.entry-head{display:flex;justify-content:space-between}"
+        ".entry-head span,.sub{color:#6b7280;font-size:12px}ul{margin:4px 0 0 18px;padding:0}"
+        "</style></head><body>" + "".join(parts) + "</body></html>"
+    )
+
+# ---------------------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------------------
+
+def render_resume_pdf(schema: Dict[str, Any], resume_data: Dict[str, Any], title: str = "Resume") -> bytes:
+    """Letter-size PDF for the resume, laid out with reportlab"""
+    # Imported here so only the render workers pay for loading reportlab
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import HRFlowable, ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    schema = _plain(schema) if schema else {}
+    theme = _theme(schema)
+    primary, text, border = (colors.HexColor(theme[key]) for key in ("primary", "text", "border"))
+    muted = colors.HexColor("#6b7280")
+    info = resume_data.get("personalInfo") if isinstance(resume_data.get("personalInfo"), dict) else {}
+    e = html.escape
+
+    styles = {
+        "name": ParagraphStyle("name", fontName="Helvetica-Bold", fontSize=20, leading=24, textColor=primary),
+        "headline": ParagraphStyle("headline", fontName="Helvetica", fontSize=11, leading=14, textColor=text),
+        "contact": ParagraphStyle("contact", fontName="Helvetica", fontSize=8.5, leading=11, textColor=muted),
+        "heading": ParagraphStyle("heading", fontName="Helvetica-Bold", fontSize=10.5, leading=13, textColor=primary, spaceBefore=10, spaceAfter=2),
+        "body": ParagraphStyle("body", fontName="Helvetica", fontSize=9.5, leading=12.5, textColor=text),
+        "entry": ParagraphStyle("entry", fontName="Helvetica-Bold", fontSize=9.5, leading=12.5, textColor=text),
+        "meta": ParagraphStyle("meta", fontName="Helvetica", fontSize=8.5, leading=11, textColor=muted),
+        "date": ParagraphStyle("date", fontName="Helvetica", fontSize=8.5, leading=12.5, textColor=muted, alignment=2),
+    }
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, title=title, leftMargin=0.6 * inch, rightMargin=0.6 * inch,
+                            topMargin=0.5 * inch, bottomMargin=0.5 * inch)
+    story: List[Any] = []
+
+    def entry_row(left: str, right: str) -> Table:
+        row = Table([[Paragraph(e(left), styles["entry"]), Paragraph(e(right), styles["date"])]],
+                    colWidths=[doc.width * 0.72, doc.width * 0.28])
+        row.setStyle(TableStyle([("LEFTPADDING", (0, 0), (-1, -1), 0), ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                                 ("TOPPADDING", (0, 0), (-1, -1), 0), ("BOTTOMPADDING", (0, 0), (-1, -1), 0)]))
+        return row
+
+    for section in _sections(schema):
+        kind = section["type"]
+        flowables: List[Any] = []
+        if kind == "header":
+            flowables.append(Paragraph(e(_full_name(info)) or "&nbsp;", styles["name"]))
+            if _text(info.get("jobTitle")):
+                flowables.append(Paragraph(e(_text(info.get("jobTitle"))), styles["headline"]))
+            if _contact_line(info):
+                flowables.append(Paragraph(" &middot; ".join(e(item) for item in _contact_line(info)), styles["contact"]))
+            flowables.append(HRFlowable(width="100%", thickness=1, color=border, spaceBefore=6, spaceAfter=2))
+            story.extend(flowables)
+            continue
+        if kind == "summary" and _summary(resume_data):
+            flowables.append(Paragraph(e(_summary(resume_data)), styles["body"]))
+        elif kind == "work":
+            for item in _list(resume_data, "workExperience"):
+                flowables.append(entry_row(_text(item.get("title")), _date_range(item)))
+                company = ", ".join(part for part in (_text(item.get("company")), _text(item.get("location"))) if part)
+                if company:
+                    flowables.append(Paragraph(e(company), styles["meta"]))
+                lines = _description_lines(item.get("description"))
+                if lines:
+                    flowables.append(ListFlowable(
+                        [ListItem(Paragraph(e(line), styles["body"]), leftIndent=10) for line in lines],
+                        bulletType="bullet", start="•", leftIndent=10, bulletFontSize=7
+                    ))
+                flowables.append(Spacer(1, 5))
+        elif kind == "education":
+            for item in _list(resume_data, "education"):
+                flowables.append(entry_row(_text(item.get("school")), _date_range(item)))
+                degree = ", ".join(part for part in (_text(item.get("degree")), _text(item.get("field"))) if part)
+                if degree:
+                    flowables.append(Paragraph(e(degree), styles["meta"]))
+                flowables.append(Spacer(1, 4))
+        elif kind == "skills":
+            names = [_text(item.get("name")) for item in _list(resume_data, "skills") if _text(item.get("name"))]
+            if names:
+                flowables.append(Paragraph(e(", ".join(names)), styles["body"]))
+        elif kind == "languages":
+            languages = [
+                f"{_text(item.get('name'))} ({_text(item.get('proficiency'))})" if _text(item.get("proficiency")) else _text(item.get("name"))
+                for item in _list(resume_data, "languages") if _text(item.get("name"))
+            ]
+            if languages:
+                flowables.append(Paragraph(e(", ".join(languages)), styles["body"]))
+
+        if flowables:
+            if section.get("showTitle", True):
+                heading = _text(section.get("title")) or DEFAULT_TITLES[kind]
+                story.append(Paragraph(e(heading.upper()), styles["heading"]))
+                story.append(HRFlowable(width="100%", thickness=0.5, color=border, spaceAfter=4))
+            story.extend(flowables)
+
+    doc.build(story or [Spacer(1, 1)])
+    return buffer.getvalue()
+
+# ---------------------------------------------------------------------------
+# Cached, off-loop rendering
+# ---------------------------------------------------------------------------
+
+_RENDERERS = {"pdf": render_resume_pdf, "html": render_resume_html}
+
+_render_cache = TTLCache(ttl_seconds=RENDER_CACHE_TTL_SECONDS, max_entries=RENDER_CACHE_MAX_ENTRIES)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+
+def _render_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process runs threads that must not be copied mid-lock
+            _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _render_in_worker(fmt: str, schema: Dict[str, Any], resume_data: Dict[str, Any], title: str) -> Any:
+    return _RENDERERS[fmt](schema, resume_data, title)
+
+def render_key(fmt: str, template_version: str, resume_data: Dict[str, Any], title: str) -> str:
+    """Content hash identifying one rendered output"""
+    content = json.dumps(resume_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{fmt}\0{template_version}\0{title}\0{content}".encode("utf-8")).hexdigest()
+
+async def render_resume(fmt: str, template_version: str, schema: Mapping[str, Any], resume_data: Dict[str, Any],
+                        title: str = "Resume") -> Tuple[str, Any]:
+    """(content hash, rendered output); cached, and concurrent identical requests share one render"""
+    key = render_key(fmt, template_version, resume_data, title)
+    cached = _render_cache.get(key)
+    if cached is not None:
+        return key, cached
+
+    pending = _in_flight.get(key)
+    if pending is None:
+        loop = asyncio.get_running_loop()
+        future: Future = _render_pool().submit(_render_in_worker, fmt, _plain(schema), resume_data, title)
+        pending = asyncio.wrap_future(future, loop=loop)
+        _in_flight[key] = pending
+        pending.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    try:
+        output = await asyncio.shield(pending)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool for the next request
+        shutdown_render_pool()
+        raise
+    _render_cache.set(key, output)
+    return key, output
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,110 @@
+"""Resume revision history
+
+Every saved version of a resume gets a resume_revisions row keyed by the
+resume's version number. Most rows hold only the JSON Patch from the previous
+revision; every REVISION_SNAPSHOT_INTERVAL-th revision, and any revision whose
+predecessor is unknown or was never recorded (e.g. a version bumped outside
+the API), holds the full document. Rebuilding a revision reads
+the nearest snapshot and at most REVISION_SNAPSHOT_INTERVAL - 1 deltas, however
+long the history is.
+"""
+from supabase_client import supabase
+from utils.json_patch import apply_json_patch, create_json_patch
+from typing import Any, Dict, List, Optional
+import json
+
+REVISION_SNAPSHOT_INTERVAL = 10
+REVISION_LIST_COLUMNS = "revision, kind, title, size_bytes, created_at"
+
+def _size(content: Any) -> int:
+    return len(json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+def _has_revision(resume_id: str, revision: int) -> bool:
+    response = supabase.table("resume_revisions")\
+        .select("revision")\
+        .eq("resume_id", resume_id)\
+        .eq("revision", revision)\
+        .limit(1)\
+        .execute()
+    return bool(response.data)
+
+def record_revision(resume_id: str, user_id: str, revision: int, title: Optional[str],
+                    document: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    """Store `document` as `revision`; `previous` is the document at revision - 1 when known.
+
+    Best effort: a failure is logged and never fails the save it belongs to.
+    """
+    snapshot = previous is None or (revision - 1) % REVISION_SNAPSHOT_INTERVAL == 0
+    if not snapshot:
+        # A delta is only readable if its base revision row exists
+        try:
+            snapshot = not _has_revision(resume_id, revision - 1)
+        except Exception as e:
+            print(f"Warning: Could not check revision {revision - 1} of resume {resume_id}: {str(e)}")
+            snapshot = True
+    content = document if snapshot else create_json_patch(previous, document)
+    row = {
+        "resume_id": resume_id,
+        "user_id": user_id,
+        "revision": revision,
+        "kind": "snapshot" if snapshot else "delta",
+        "base_revision": None if snapshot else revision - 1,
+        "title": title,
+        "content": content,
+        "size_bytes": _size(content),
+    }
+    try:
+        supabase.table("resume_revisions").upsert(row, on_conflict="resume_id,revision", ignore_duplicates=True).execute()
+    except Exception as e:
+        print(f"Warning: Could not record revision {revision} of resume {resume_id}: {str(e)}")
+
+def list_revisions(resume_id: str, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """Newest revisions first, without their content"""
+    response = supabase.table("resume_revisions")\
+        .select(REVISION_LIST_COLUMNS)\
+        .eq("resume_id", resume_id)\
+        .eq("user_id", user_id)\
+        .order("revision", desc=True)\
+        .limit(limit)\
+        .execute()
+    return response.data or []
+
+def load_revision(resume_id: str, user_id: str, revision: int) -> Optional[Dict[str, Any]]:
+    """{"revision", "title", "resume_data"} as of `revision`, or None when it was never recorded.
+
+    Raises ValueError when the history between the nearest snapshot and
+    `revision` has a gap and the document cannot be rebuilt.
+    """
+    snapshot = supabase.table("resume_revisions")\
+        .select("revision")\
+        .eq("resume_id", resume_id)\
+        .eq("user_id", user_id)\
+        .eq("kind", "snapshot")\
+        .lte("revision", revision)\
+        .order("revision", desc=True)\
+        .limit(1)\
+        .execute()
+    if not snapshot.data:
+        return None
+
+    chain = supabase.table("resume_revisions")\
+        .select("revision, kind, base_revision, title, content")\
+        .eq("resume_id", resume_id)\
+        .eq("user_id", user_id)\
+        .gte("revision", snapshot.data[0]["revision"])\
+        .lte("revision", revision)\
+        .order("revision")\
+        .execute()
+    rows = chain.data or []
+    if not rows or rows[-1]["revision"] != revision:
+        return None
+
+    document = rows[0]["content"]
+    for previous, row in zip(rows, rows[1:]):
+        if row["kind"] == "snapshot":
+            document = row["content"]
+        elif row["base_revision"] == previous["revision"]:
+            document = apply_json_patch(document, row["content"])
+        else:
+            raise ValueError(f"Revision history is missing revision {row['base_revision']}")
+    return {"revision": revision, "title": rows[-1]["title"], "resume_data": document}
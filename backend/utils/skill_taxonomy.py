@@ -0,0 +1,345 @@
+"""Curated skill taxonomy and a one-pass skill extractor
+
+SKILL_TAXONOMY lists canonical skill names by category together with the
+other spellings that show up in postings and profiles ("React.js", "reactjs"
+-> "React"). Every spelling is compiled into one Aho-Corasick automaton, so
+extracting skills from a description is a single linear scan over the text,
+however many skills the taxonomy holds.
+
+Matches must sit on word boundaries, and when spellings overlap the leftmost
+then longest wins ("React Native" over "React", "asp.net" over ".net").
+Spellings that are also everyday words ("go", "excel", "sales") only count
+when the text writes them the way a skill is written ("Go", "Excel").
+"""
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+# Category -> canonical display name -> alternative spellings
+SKILL_TAXONOMY: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "Programming Languages": {
+        "JavaScript": ("js", "ecmascript", "es6"),
+        "TypeScript": ("ts",),
+        "Python": ("python3",),
+        "Java": (),
+        "C#": ("csharp", "c sharp"),
+        "C++": ("cpp",),
+        "C": ("c language", "ansi c"),
+        "Go": ("golang",),
+        "Rust": (),
+        "Ruby": (),
+        "PHP": (),
+        "Swift": (),
+        "Kotlin": (),
+        "Scala": (),
+        "R": ("r language", "rstudio"),
+        "MATLAB": (),
+        "Bash": ("shell scripting", "shell script"),
+        "SQL": ("t-sql", "tsql", "pl/sql", "plsql"),
+        "HTML": ("html5",),
+        "CSS": ("css3",),
+        "Sass": ("scss",),
+    },
+    "Frameworks & Libraries": {
+        "React": ("react.js", "reactjs", "react js"),
+        "React Native": ("react-native",),
+        "Redux": (),
+        "Next.js": ("nextjs", "next js"),
+        "Vue": ("vue.js", "vuejs", "vue js"),
+        "Angular": ("angularjs", "angular.js"),
+        "Svelte": (),
+        "Tailwind CSS": ("tailwind", "tailwindcss"),
+        "Bootstrap": (),
+        "jQuery": (),
+        "Node.js": ("node", "nodejs", "node js"),
+        "Express": ("express.js", "expressjs"),
+        "Django": (),
+        "Flask": (),
+        "FastAPI": (),
+        "Spring Boot": ("spring", "springboot"),
+        "Ruby on Rails": ("rails", "ror"),
+        ".NET": ("dotnet", "asp.net", ".net core"),
+        "GraphQL": (),
+        "TensorFlow": (),
+        "PyTorch": (),
+        "scikit-learn": ("sklearn",),
+        "Pandas": (),
+        "NumPy": (),
+        "Flutter": (),
+    },
+    "Databases": {
+        "PostgreSQL": ("postgres", "psql"),
+        "MySQL": (),
+        "SQL Server": ("mssql", "microsoft sql server"),
+        "Oracle Database": ("oracle db",),
+        "MongoDB": ("mongo",),
+        "Redis": (),
+        "Elasticsearch": ("elastic search", "elk"),
+        "DynamoDB": (),
+        "Snowflake": (),
+        "BigQuery": (),
+        "NoSQL": (),
+    },
+    "Cloud & DevOps": {
+        "AWS": ("amazon web services",),
+        "Azure": ("microsoft azure",),
+        "Google Cloud": ("gcp", "google cloud platform"),
+        "Docker": (),
+        "Kubernetes": ("k8s",),
+        "Terraform": (),
+        "Ansible": (),
+        "CI/CD": ("cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+        "Jenkins": (),
+        "GitHub Actions": (),
+        "Git": (),
+        "Linux": ("unix",),
+        "DevOps": (),
+        "Microservices": ("microservice", "micro services"),
+        "REST APIs": ("rest", "rest api", "restful", "restful api", "restful apis"),
+        "gRPC": (),
+        "Kafka": ("apache kafka",),
+        "Cloud Computing": (),
+        "Cybersecurity": ("cyber security", "information security", "infosec"),
+    },
+    "Data & AI": {
+        "Machine Learning": ("ml",),
+        "Deep Learning": (),
+        "Artificial Intelligence": ("ai",),
+        "Natural Language Processing": ("nlp",),
+        "Computer Vision": (),
+        "LLMs": ("llm", "large language models", "large language model"),
+        "Data Analysis": ("data analytics",),
+        "Data Visualization": (),
+        "Data Engineering": (),
+        "Statistics": ("statistical analysis",),
+        "ETL": (),
+        "Spark": ("apache spark", "pyspark"),
+        "Airflow": ("apache airflow",),
+        "Excel": ("microsoft excel", "ms excel"),
+        "Power BI": ("powerbi",),
+        "Tableau": (),
+        "Looker": (),
+        "Google Analytics": (),
+    },
+    "Testing": {
+        "Unit Testing": ("unit tests",),
+        "Test Automation": ("automated testing",),
+        "Selenium": (),
+        "Cypress": (),
+        "Jest": (),
+        "Pytest": (),
+    },
+    "Design": {
+        "Figma": (),
+        "Sketch": (),
+        "UX Design": ("ux", "user experience"),
+        "UI Design": ("ui", "user interface design"),
+        "Adobe Photoshop": ("photoshop",),
+        "Adobe Illustrator": ("illustrator",),
+    },
+    "Business & Tools": {
+        "Agile": (),
+        "Scrum": (),
+        "Kanban": (),
+        "Jira": (),
+        "Confluence": (),
+        "Project Management": (),
+        "Product Management": (),
+        "Stakeholder Management": (),
+        "Technical Writing": (),
+        "SEO": ("search engine optimization",),
+        "Digital Marketing": (),
+        "Content Marketing": (),
+        "Salesforce": (),
+        "HubSpot": (),
+        "CRM": (),
+        "SAP": (),
+        "Accounting": (),
+        "Financial Modeling": ("financial modelling",),
+        "Sales": ("b2b sales", "inside sales", "outside sales", "enterprise sales", "saas sales", "sales prospecting"),
+        "Customer Service": ("customer support",),
+    },
+    "Soft Skills": {
+        "Communication": ("communication skills",),
+        "Leadership": (),
+        "Problem Solving": (),
+        "Critical Thinking": (),
+        "Teamwork": ("team player",),
+        "Time Management": (),
+    },
+}
+
+SOFT_SKILLS_CATEGORY = "Soft Skills"
+
+# Spellings that are ordinary words in prose ("go to market", "the rest of", "excel at",
+# "our sales team") -> the exact case that marks them as a skill in free text ("Go", "REST").
+# Skills typed by users are normalized whatever their case.
+AMBIGUOUS_SPELLINGS: Dict[str, str] = {
+    "go": "Go", "c": "C", "r": "R", "rest": "REST", "spring": "Spring", "ts": "TS", "ui": "UI", "ux": "UX",
+    "ai": "AI", "ml": "ML", "node": "Node", "express": "Express", "swift": "Swift", "sketch": "Sketch",
+    "excel": "Excel", "sales": "Sales",
+}
+# Next words after which an ambiguous spelling is still prose ("Go to market", "Go live")
+AMBIGUOUS_NEXT_WORDS: Dict[str, Tuple[str, ...]] = {
+    "go": ("to", "live", "ahead", "beyond"),
+}
+
+_SEPARATORS_RE = re.compile(r"[\s_-]+")
+
+def normalize_text(text: str) -> str:
+    """Lowercase and fold hyphens, underscores and whitespace runs into single spaces"""
+    return _SEPARATORS_RE.sub(" ", (text or "").lower()).strip()
+
+def _fold_text(text: str) -> Tuple[str, str]:
+    """(normalize_text(text), the same characters in their original case), position for position"""
+    folded = _SEPARATORS_RE.sub(" ", text or "").strip()
+    # Characters whose lowercase is longer (e.g. "İ") keep their case so positions line up
+    lowered = "".join(char if len(char.lower()) != 1 else char.lower() for char in folded)
+    return lowered, folded
+
+def _next_word(text: str, end: int) -> str:
+    if end >= len(text) or text[end] != " ":
+        return ""
+    following = text.find(" ", end + 1)
+    return text[end + 1:following if following != -1 else len(text)].rstrip(".,;:!?)")
+
+class SkillMatcher:
+    """Aho-Corasick automaton over normalized spellings, each mapped to a canonical skill
+
+    `exact` maps spellings that only count in one exact case to that form.
+    """
+
+    def __init__(self, phrases: Dict[str, str], exact: Optional[Dict[str, str]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (phrase length, canonical, required case or None) for every spelling ending there
+        self._out: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+        exact = exact or {}
+        for phrase, canonical in phrases.items():
+            if phrase:
+                self._add(phrase, canonical, exact.get(phrase))
+        self._link()
+
+    def _add(self, phrase: str, canonical: str, required: Optional[str]) -> None:
+        state = 0
+        for char in phrase:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = following
+        self._out[state].append((len(phrase), canonical, required))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def find(self, text: str, original: Optional[str] = None) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, canonical) matches in normalized `text`, leftmost-longest.
+
+        `original` is `text` before lowercasing; without it spellings that need
+        an exact case never match.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        size = len(text)
+        candidates: List[Tuple[int, int, str]] = []
+        state = 0
+        for end, char in enumerate(text, start=1):
+            following = goto[state].get(char)
+            while following is None and state:
+                state = fail[state]
+                following = goto[state].get(char)
+            state = following or 0
+            if not out[state]:
+                continue
+            for length, canonical, required in out[state]:
+                start = end - length
+                if required is not None and (original is None or original[start:end] != required
+                                             or _next_word(text, end) in AMBIGUOUS_NEXT_WORDS.get(text[start:end], ())):
+                    continue
+                # Word boundaries on both sides; "c++", "c#" and "r&d" must not be read as "c" or "r"
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < size and (text[end].isalnum() or text[end] in "+#&"):
+                    continue
+                candidates.append((start, end, canonical))
+
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+        matches: List[Tuple[int, int, str]] = []
+        covered = 0
+        for start, end, canonical in candidates:
+            if start >= covered:
+                matches.append((start, end, canonical))
+                covered = end
+        return matches
+
+    def count(self, text: str) -> Counter:
+        """Canonical skill -> mentions in `text`, in order of first mention"""
+        lowered, original = _fold_text(text)
+        return Counter(canonical for _, _, canonical in self.find(lowered, original))
+
+def _build_index() -> Tuple[Dict[str, str], Dict[str, str]]:
+    spellings: Dict[str, str] = {}
+    categories: Dict[str, str] = {}
+    for category, skills in SKILL_TAXONOMY.items():
+        for canonical, aliases in skills.items():
+            categories[canonical] = category
+            for spelling in (canonical, *aliases):
+                spellings[normalize_text(spelling)] = canonical
+    return spellings, categories
+
+_SPELLINGS, _CATEGORIES = _build_index()
+_MATCHER = SkillMatcher(_SPELLINGS, AMBIGUOUS_SPELLINGS)
+
+def normalize_skill(name: str) -> str:
+    """Canonical name for a skill; skills outside the taxonomy keep their own spelling"""
+    name = (name or "").strip()
+    return _SPELLINGS.get(normalize_text(name), name)
+
+def skill_category(name: str) -> Optional[str]:
+    """Taxonomy category of a skill, None when it is not in the taxonomy"""
+    return _CATEGORIES.get(normalize_skill(name))
+
+def all_skills(category: Optional[str] = None) -> List[str]:
+    """Canonical skill names, optionally limited to one category"""
+    if category is not None:
+        return list(SKILL_TAXONOMY.get(category, {}))
+    return [canonical for skills in SKILL_TAXONOMY.values() for canonical in skills]
+
+@lru_cache(maxsize=256)
+def _matcher_with(extra: Tuple[str, ...]) -> SkillMatcher:
+    phrases = dict(_SPELLINGS)
+    for skill in extra:
+        spelling = normalize_text(skill)
+        if spelling and spelling not in phrases:
+            phrases[spelling] = skill.strip()
+    return SkillMatcher(phrases, AMBIGUOUS_SPELLINGS)
+
+def custom_skills(skills: Iterable[str]) -> Tuple[str, ...]:
+    """The skills the taxonomy matcher would not find, sorted and deduplicated"""
+    return tuple(sorted({skill.strip() for skill in skills if skill and skill.strip()
+                         and normalize_text(skill) not in _SPELLINGS}))
+
+def skill_matcher(extra_skills: Iterable[str] = ()) -> SkillMatcher:
+    """The taxonomy matcher, extended with skills outside the taxonomy (e.g. a user's own)"""
+    extra = custom_skills(extra_skills)
+    return _matcher_with(extra) if extra else _MATCHER
+
+def extract_skills(text: str, include_soft_skills: bool = True, limit: Optional[int] = None) -> List[str]:
+    """Taxonomy skills mentioned in `text`, most mentioned first"""
+    counts = _MATCHER.count(text)
+    skills = [skill for skill, _ in counts.most_common()
+              if include_soft_skills or _CATEGORIES.get(skill) != SOFT_SKILLS_CATEGORY]
+    return skills[:limit] if limit is not None else skills
@@ -0,0 +1,21 @@
+"""Server-Sent Events helpers for streaming endpoints"""
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator
+import json
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a single SSE frame with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async generator of SSE frames in a non-buffered streaming response"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering so frames flush immediately
+        },
+    )
@@ -0,0 +1,206 @@
+"""In-process registry of active resume templates
+
+Templates only change when the seed scripts run, so they are loaded once at
+startup, parsed into read-only objects indexed by slug and id, and served
+from memory with response bodies and ETags computed at load time.
+
+The registry reloads when
+- `refresh_templates` is called,
+- the TTL lapses and the `templates` version from get_resource_version has
+  moved (checked in the background; the current templates keep serving), or
+- a `templates_changed` NOTIFY arrives. Listening needs a direct database
+  connection, so it only runs when psycopg is installed and SUPABASE_DB_URL
+  is set; otherwise the TTL check picks changes up.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from supabase_client import supabase
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+TEMPLATE_REGISTRY_TTL_SECONDS = 10 * 60
+TEMPLATE_COLUMNS = "id, name, slug, schema, preview_url, is_active, created_at, updated_at"
+TEMPLATE_NOTIFY_CHANNEL = "templates_changed"
+# get_resource_version is keyed by user; the templates version ignores it
+_ANY_USER_ID = "00000000-0000-0000-0000-000000000000"
+
+class Template(NamedTuple):
+    id: str
+    slug: str
+    name: str
+    schema: Mapping[str, Any]
+    preview_url: Optional[str]
+    body: bytes  # GET /api/templates/{id} response
+    etag: str
+
+class _Registry(NamedTuple):
+    by_slug: Mapping[str, Template]
+    by_id: Mapping[str, Template]
+    list_body: bytes  # GET /api/templates response
+    list_etag: str
+    version: Optional[str]
+    checked_at: float
+
+_registry: Optional[_Registry] = None
+_load_lock = threading.Lock()
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="template-refresh")
+_refreshing = threading.Event()
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed JSON: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _parse_schema(schema: Any) -> Dict[str, Any]:
+    if isinstance(schema, str):
+        try:
+            schema = json.loads(schema)
+        except ValueError:
+            return {}
+    return schema if isinstance(schema, dict) else {}
+
+def _serialize(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+def _templates_version() -> Optional[str]:
+    try:
+        response = supabase.rpc("get_resource_version", {"p_user_id": _ANY_USER_ID, "p_resource": "templates"}).execute()
+    except Exception as e:
+        print(f"Warning: Could not compute templates version: {str(e)}")
+        return None
+    return response.data if isinstance(response.data, str) else None
+
+def _build_registry(rows: List[Dict[str, Any]], version: Optional[str]) -> _Registry:
+    by_slug: Dict[str, Template] = {}
+    by_id: Dict[str, Template] = {}
+    summaries = []
+    for row in rows:
+        schema = _parse_schema(row.get("schema"))
+        metadata = schema.get("metadata", {}) if isinstance(schema.get("metadata"), dict) else {}
+        summaries.append({
+            "id": row.get("id"),
+            "slug": row.get("slug"),
+            "name": row.get("name") or metadata.get("name", "Untitled Template"),
+            "description": metadata.get("description", ""),
+            "category": metadata.get("category", "professional"),
+            "badge": metadata.get("badge"),
+            "preview_url": row.get("preview_url"),
+            "colors": metadata.get("colors", []),
+            "is_active": row.get("is_active", True),
+        })
+        body = _serialize({
+            "id": row.get("id"),
+            "slug": row.get("slug"),
+            "name": row.get("name"),
+            "schema": schema,
+            "preview_url": row.get("preview_url"),
+            "is_active": row.get("is_active", True),
+        })
+        template = Template(
+            id=row["id"],
+            slug=row["slug"],
+            name=row.get("name") or "",
+            schema=_freeze(schema),
+            preview_url=row.get("preview_url"),
+            body=body,
+            etag=_etag(body),
+        )
+        by_slug[template.slug] = template
+        by_id[template.id] = template
+
+    list_body = _serialize(summaries)
+    return _Registry(
+        by_slug=MappingProxyType(by_slug),
+        by_id=MappingProxyType(by_id),
+        list_body=list_body,
+        list_etag=_etag(list_body),
+        version=version,
+        checked_at=time.monotonic(),
+    )
+
+def refresh_templates() -> None:
+    """Reload every active template from the database"""
+    global _registry
+    with _load_lock:
+        # Read the version first so a change during the load triggers another reload
+        version = _templates_version()
+        response = supabase.table("templates").select(TEMPLATE_COLUMNS).eq("is_active", True).execute()
+        _registry = _build_registry(response.data or [], version)
+    print(f"📋 TEMPLATES: Registry loaded {len(_registry.by_id)} template(s)")
+
+def _check_version() -> None:
+    global _registry
+    try:
+        current = _registry
+        version = _templates_version()
+        if current is None or version is None or version != current.version:
+            refresh_templates()
+        else:
+            _registry = current._replace(checked_at=time.monotonic())
+    except Exception as e:
+        print(f"Warning: Could not refresh templates: {str(e)}")
+    finally:
+        _refreshing.clear()
+
+def _current() -> _Registry:
+    registry = _registry
+    if registry is None:
+        refresh_templates()
+        return _registry
+    if time.monotonic() - registry.checked_at > TEMPLATE_REGISTRY_TTL_SECONDS and not _refreshing.is_set():
+        _refreshing.set()
+        _refresh_executor.submit(_check_version)
+    return registry
+
+def template_list() -> Tuple[bytes, str]:
+    """(body, etag) of the serialized active template list"""
+    registry = _current()
+    return registry.list_body, registry.list_etag
+
+def find_template(key: str) -> Optional[Template]:
+    """Active template by slug or id"""
+    registry = _current()
+    return registry.by_slug.get(key) or registry.by_id.get(key)
+
+def template_slug(template_id: str) -> str:
+    """Slug for a stored template id; ids that are already slugs (or unknown) are returned unchanged"""
+    template = _current().by_id.get(template_id)
+    return template.slug if template else template_id
+
+def _listen(dsn: str) -> None:
+    import psycopg
+
+    while True:
+        try:
+            with psycopg.connect(dsn, autocommit=True) as conn:
+                conn.execute(f"LISTEN {TEMPLATE_NOTIFY_CHANNEL}")
+                # Catch up on anything missed while disconnected
+                refresh_templates()
+                for _ in conn.notifies():
+                    refresh_templates()
+        except Exception as e:
+            print(f"Warning: Template change listener disconnected: {str(e)}")
+            time.sleep(30)
+
+def start_template_listener() -> bool:
+    """Reload on NOTIFY templates_changed; returns False when listening is unavailable"""
+    dsn = os.getenv("SUPABASE_DB_URL")
+    if not dsn:
+        return False
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        print("📋 TEMPLATES: psycopg not installed, relying on TTL version checks")
+        return False
+    threading.Thread(target=_listen, args=(dsn,), name="template-listener", daemon=True).start()
+    return True
@@ -0,0 +1,83 @@
+"""Per-user cache of auth.users emails
+
+Email is owned by Supabase auth, so reading it needs an admin API round trip.
+The cache is primed from the verified user returned by `get_current_user`,
+served stale-while-revalidate once an entry passes its refresh age, and
+dropped when the account is deleted.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from supabase_client import supabase
+from utils.cache import TTLCache
+from typing import Optional, Set, Tuple
+import asyncio
+import threading
+import time
+
+# Entries older than this are still served but refreshed in the background
+USER_EMAIL_REFRESH_SECONDS = 5 * 60
+# Entries older than this are never served
+USER_EMAIL_TTL_SECONDS = 60 * 60
+
+_email_cache = TTLCache(ttl_seconds=USER_EMAIL_TTL_SECONDS, max_entries=4096)
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="user-email-refresh")
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
+
+def remember_user_email(user_id: str, email: Optional[str]) -> None:
+    """Store an email already known to be current (e.g. from a verified token)"""
+    _email_cache.set(user_id, (time.monotonic(), email))
+
+def forget_user_email(user_id: str) -> None:
+    """Drop the cached email, e.g. after the auth user is deleted or changed"""
+    _email_cache.invalidate(user_id)
+
+def fetch_user_email(user_id: str) -> Optional[str]:
+    """Look the email up in auth.users via the admin API and cache it"""
+    version = _email_cache.version(user_id)
+    user_response = supabase.auth.admin.get_user_by_id(user_id)
+    email = None
+    if user_response and user_response.user and user_response.user.email:
+        email = user_response.user.email
+    _email_cache.set(user_id, (time.monotonic(), email), version=version)
+    return email
+
+def _refresh_in_background(user_id: str) -> None:
+    with _refreshing_lock:
+        if user_id in _refreshing:
+            return
+        _refreshing.add(user_id)
+
+    def refresh():
+        try:
+            fetch_user_email(user_id)
+        except Exception as e:
+            print(f"Warning: Could not refresh email for user {user_id}: {str(e)}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(user_id)
+
+    _refresh_executor.submit(refresh)
+
+def _cached_user_email(user_id: str) -> Tuple[bool, Optional[str]]:
+    """Return (hit, email), scheduling a refresh when the entry is stale"""
+    entry = _email_cache.get(user_id)
+    if entry is None:
+        return False, None
+    fetched_at, email = entry
+    if time.monotonic() - fetched_at > USER_EMAIL_REFRESH_SECONDS:
+        _refresh_in_background(user_id)
+    return True, email
+
+def get_user_email(user_id: str) -> Optional[str]:
+    """Return the user's email, only calling the admin API on a cold cache"""
+    hit, email = _cached_user_email(user_id)
+    if hit:
+        return email
+    return fetch_user_email(user_id)
+
+async def aget_user_email(user_id: str) -> Optional[str]:
+    """Async variant of get_user_email; a warm cache never leaves the event loop"""
+    hit, email = _cached_user_email(user_id)
+    if hit:
+        return email
+    return await asyncio.to_thread(fetch_user_email, user_id)
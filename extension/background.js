@@ -244,6 +244,10 @@ async function handleOpenDashboard(sendResponse) {
   }
 }
 
+// Job list columns the extension shows; descriptions are left out
+const JOB_LIST_FIELDS = 'id,user_id,job_title,company,location,salary,job_url,status,excitement_level,date_applied,deadline,created_at,updated_at';
+const JOB_LIST_PAGE_SIZE = 500;
+
 // Handle getting jobs
 async function handleGetJobs(sendResponse) {
   try {
@@ -258,20 +262,28 @@ async function handleGetJobs(sendResponse) {
       return;
     }
     
-    // Fetch jobs from backend
-    const response = await fetch(`${CONFIG.API_BASE_URL}/api/jobs`, {
-      headers: {
-        'Authorization': `Bearer ${token}`,
-        'Content-Type': 'application/json'
+    // Fetch jobs from backend page by page, without descriptions
+    const jobs = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams({ fields: JOB_LIST_FIELDS, limit: String(JOB_LIST_PAGE_SIZE) });
+      if (cursor) params.set('cursor', cursor);
+      const response = await fetch(`${CONFIG.API_BASE_URL}/api/jobs?${params.toString()}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        }
+      });
+      
+      if (!response.ok) {
+        sendResponse({ success: false, error: 'Failed to fetch jobs' });
+        return;
       }
-    });
+      jobs.push(...await response.json());
+      cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
     
-    if (response.ok) {
-      const jobs = await response.json();
-      sendResponse({ success: true, jobs: jobs });
-    } else {
-      sendResponse({ success: false, error: 'Failed to fetch jobs' });
-    }
+    sendResponse({ success: true, jobs: jobs });
   } catch (error) {
     console.error('Get jobs error:', error);
     sendResponse({ success: false, error: error.message });
@@ -370,6 +370,33 @@ export function Dashboard({ }: DashboardProps) {
     }
   };
 
+  // Move several jobs to one status in a single request (multi-card Kanban drag).
+  // Rethrows on failure so the board reverts the cards it already moved.
+  const handleBulkStatusUpdate = async (jobIds: string[], newStatus: string) => {
+    const status = newStatus as Job['status'];
+    try {
+      const { results } = await jobApi.bulkUpdateJobs(jobIds.map(id => ({ id, status })));
+      const updatedJobs = new Map<string, Job>();
+      const missingIds = new Set<string>();
+      results.forEach(result => {
+        if (result.success && result.job) {
+          updatedJobs.set(result.id, result.job);
+        } else if (result.error === 'Job not found') {
+          missingIds.add(result.id);
+        }
+      });
+      // Jobs that no longer exist are dropped from the UI, as in handleStatusUpdate.
+      // Jobs that failed to update keep their old status, so the board moves them back.
+      setJobs(prevJobs => prevJobs
+        .filter(job => !missingIds.has(job.id))
+        .map(job => updatedJobs.get(job.id) ?? job));
+      setSelectedJobs([]);
+    } catch (err) {
+      console.error('Error updating job statuses:', err);
+      throw err;
+    }
+  };
+
   // Handle job selection
   const handleJobSelection = (jobId: string, checked: boolean) => {
     if (checked) {
@@ -1137,6 +1164,9 @@ export function Dashboard({ }: DashboardProps) {
                 <KanbanBoard
                   jobs={getFilteredAndSortedJobs()}
                   onStatusUpdate={handleStatusUpdate}
+                  onBulkStatusUpdate={handleBulkStatusUpdate}
+                  selectedJobIds={selectedJobs}
+                  onToggleSelect={handleJobSelection}
                   onEditJob={handleEditJob}
                   onDeleteJob={handleJobDelete}
                   onStarRatingUpdate={handleStarRatingUpdate}
@@ -44,6 +44,8 @@ interface MatchAnalysis {
   improvements: string[];
   missingSkills: string[];
   matchedSkills: string[];
+  // Set when the AI write-up failed and only the keyword match is shown
+  narrativeError?: string;
 }
 
 // Move helper functions outside component to prevent recreation on every render
@@ -792,6 +794,13 @@ export default function JobDetail() {
                       </div>
                     </div>
 
+                    {matchAnalysis.narrativeError && (
+                      <div className="flex items-start gap-2 rounded-lg border border-orange-200 bg-orange-50 p-4 text-sm text-orange-800">
+                        <AlertCircle className="h-5 w-5 flex-shrink-0 text-orange-500" />
+                        <span>AI analysis is unavailable ({matchAnalysis.narrativeError}). Showing the keyword match only.</span>
+                      </div>
+                    )}
+
                     {/* Strengths */}
                     {matchAnalysis.strengths.length > 0 && (
                       <div className="bg-white rounded-xl p-5 lg:p-6 border border-green-200 shadow-md">
@@ -29,8 +29,31 @@ interface KanbanBoardProps {
   onDeleteJob: (job: Job) => void;
   onStarRatingUpdate: (jobId: string, newRating: number) => void;
   updatingJobId: string | null;
+  // Cards picked with Ctrl/Cmd/Shift-click; dragging one of them moves them all
+  selectedJobIds?: string[];
+  onToggleSelect?: (jobId: string, selected: boolean) => void;
+  // Rejects when the request fails, so the board can put the cards back
+  onBulkStatusUpdate?: (jobIds: string[], newStatus: string) => Promise<void>;
 }
 
+// Move the given cards into one column, keeping their order
+const moveCards = (columns: Record<string, Job[]>, jobIds: string[], status: string): Record<string, Job[]> => {
+  const ids = new Set(jobIds);
+  const moved: Job[] = [];
+  const next: Record<string, Job[]> = {};
+  Object.entries(columns).forEach(([column, columnJobs]) => {
+    next[column] = columnJobs.filter((job) => {
+      if (!ids.has(job.id)) return true;
+      moved.push(job);
+      return false;
+    });
+  });
+  if (next[status]) {
+    next[status] = [...next[status], ...moved.map((job) => ({ ...job, status: status as Job['status'] }))];
+  }
+  return next;
+};
+
 interface JobCardProps {
   job: Job;
   onEdit: (job: Job) => void;
@@ -38,9 +61,11 @@ interface JobCardProps {
   onStarRatingUpdate: (jobId: string, newRating: number) => void;
   updatingJobId: string | null;
   getStatusColor: (status: string) => string;
+  isSelected: boolean;
+  onToggleSelect?: (jobId: string, selected: boolean) => void;
 }
 
-const JobCard: React.FC<JobCardProps> = ({ job, onEdit, onDelete, onStarRatingUpdate, updatingJobId, getStatusColor }) => {
+const JobCard: React.FC<JobCardProps> = ({ job, onEdit, onDelete, onStarRatingUpdate, updatingJobId, getStatusColor, isSelected, onToggleSelect }) => {
   const {
     attributes,
     listeners,
@@ -82,9 +107,15 @@ const JobCard: React.FC<JobCardProps> = ({ job, onEdit, onDelete, onStarRatingUp
       style={style}
       {...attributes}
       {...listeners}
+      onClick={(e) => {
+        if (onToggleSelect && (e.ctrlKey || e.metaKey || e.shiftKey)) {
+          e.preventDefault();
+          onToggleSelect(job.id, !isSelected);
+        }
+      }}
       className={`rounded-xl border-2 p-4 shadow-lg hover:shadow-xl transition-all duration-300 cursor-grab active:cursor-grabbing ${
         isDragging ? 'opacity-50 rotate-2 scale-105' : 'hover:scale-105'
-      } ${getStatusColor(job.status)}`}
+      } ${getStatusColor(job.status)} ${isSelected ? 'ring-2 ring-blue-500 ring-offset-2' : ''}`}
     >
       <div className="space-y-3">
         {/* Header */}
@@ -182,6 +213,8 @@ interface KanbanColumnProps {
   onStarRatingUpdate: (jobId: string, newRating: number) => void;
   updatingJobId: string | null;
   getStatusColor: (status: string) => string;
+  selectedJobIds: string[];
+  onToggleSelect?: (jobId: string, selected: boolean) => void;
 }
 
 const KanbanColumn: React.FC<KanbanColumnProps> = ({
@@ -192,6 +225,8 @@ const KanbanColumn: React.FC<KanbanColumnProps> = ({
   onStarRatingUpdate,
   updatingJobId,
   getStatusColor,
+  selectedJobIds,
+  onToggleSelect,
 }) => {
   const { setNodeRef } = useSortable({ id: title });
 
@@ -232,6 +267,8 @@ const KanbanColumn: React.FC<KanbanColumnProps> = ({
               onStarRatingUpdate={onStarRatingUpdate}
               updatingJobId={updatingJobId}
               getStatusColor={getStatusColor}
+              isSelected={selectedJobIds.includes(job.id)}
+              onToggleSelect={onToggleSelect}
             />
           ))
         )}
@@ -247,6 +284,9 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({
   onDeleteJob,
   onStarRatingUpdate,
   updatingJobId,
+  selectedJobIds = [],
+  onToggleSelect,
+  onBulkStatusUpdate,
 }) => {
   const [activeId, setActiveId] = useState<string | null>(null);
   const [jobColumns, setJobColumns] = useState<Record<string, Job[]>>({});
@@ -332,6 +372,23 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({
       }
     }
 
+    // Dragging a selected card moves the whole selection in one request
+    if (newStatus && onBulkStatusUpdate && selectedJobIds.length > 1 && selectedJobIds.includes(jobId)) {
+      const movedJobs = jobs.filter((j) => selectedJobIds.includes(j.id) && j.status !== newStatus);
+      if (movedJobs.length > 0) {
+        const targetStatus = newStatus;
+        // Show the move right away; if the request fails, send each card back to its column
+        setJobColumns((columns) => moveCards(columns, movedJobs.map((j) => j.id), targetStatus));
+        onBulkStatusUpdate(movedJobs.map((j) => j.id), targetStatus).catch(() => {
+          setJobColumns((columns) => movedJobs.reduce(
+            (reverted, j) => moveCards(reverted, [j.id], j.status),
+            columns
+          ));
+        });
+      }
+      return;
+    }
+
     // Only update if we have a valid new status and it's different from current
     if (newStatus && job.status !== newStatus) {
       console.log('Updating job status from', job.status, 'to', newStatus);
@@ -362,6 +419,8 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({
                 onStarRatingUpdate={onStarRatingUpdate}
                 updatingJobId={updatingJobId}
                 getStatusColor={getStatusColor}
+                selectedJobIds={selectedJobIds}
+                onToggleSelect={onToggleSelect}
               />
             </SortableContext>
           ))}
@@ -48,6 +48,20 @@ export function JobModal({ isOpen, onClose, onJobSaved, jobToEdit, mode }: JobMo
         deadline: jobToEdit.deadline || '',
         description: jobToEdit.description || ''
       });
+      // The job list omits descriptions; load the full job so saving doesn't clear it
+      if (jobToEdit.description === undefined) {
+        let cancelled = false;
+        jobApi.getJob(jobToEdit.id)
+          .then(fullJob => {
+            if (!cancelled) {
+              setFormData(prev => ({ ...prev, description: fullJob.description || '' }));
+            }
+          })
+          .catch(err => console.error('Failed to load job description:', err));
+        return () => {
+          cancelled = true;
+        };
+      }
     } else if (mode === 'add' && isOpen) {
       // Only reset form for add mode when modal is opened
       setFormData({
@@ -33,15 +33,58 @@ import type { ResumeData, Skill, WorkExperience, Education } from '@/types/resum
 import { profileApi, skillsApi, experienceApi, educationApi, subscriptionApi } from '@/lib/api';
 import type { Profile, Skill as ProfileSkill, WorkExperience as ProfileWorkExperience, Education as ProfileEducation } from '@/lib/types';
 
+// Summary the list endpoint returns instead of the full resume data
+interface ResumePreview {
+  personalInfo?: { firstName?: string; lastName?: string; jobTitle?: string; location?: string };
+  summary?: string;
+  workExperience?: { title?: string; company?: string; startDate?: string; endDate?: string; isCurrent?: boolean }[];
+  education?: { school?: string; degree?: string }[];
+  skills?: string[];
+}
+
 interface SavedResume {
   id: string;
   title: string;
   template_id: string;
-  resume_data: ResumeData;
+  preview: ResumePreview;
   created_at: string;
   updated_at: string;
 }
 
+// Expand a list preview into the ResumeData shape the thumbnail renderer expects
+function previewToResumeData(preview: ResumePreview = {}): ResumeData {
+  const info = preview.personalInfo || {};
+  return {
+    personalInfo: {
+      firstName: info.firstName || '',
+      lastName: info.lastName || '',
+      email: '',
+      phone: '',
+      location: info.location || '',
+      jobTitle: info.jobTitle || '',
+    },
+    summary: preview.summary || '',
+    workExperience: (preview.workExperience || []).map((exp, index) => ({
+      id: `preview-${index}`,
+      title: exp.title || '',
+      company: exp.company || '',
+      startDate: exp.startDate || '',
+      endDate: exp.endDate || '',
+      isCurrent: !!exp.isCurrent,
+      description: '',
+    })),
+    education: (preview.education || []).map((edu, index) => ({
+      id: `preview-${index}`,
+      school: edu.school || '',
+      degree: edu.degree || '',
+      startDate: '',
+      endDate: '',
+    })),
+    skills: (preview.skills || []).map((name, index) => ({ id: `preview-${index}`, name, category: '' })),
+    languages: [],
+  };
+}
+
 export function ResumeBuilderHome() {
   const navigate = useNavigate();
   const { listResumes, deleteResume, saveResume } = useResumeBuilder();
@@ -88,12 +131,7 @@ export function ResumeBuilderHome() {
     setError(null);
     try {
       const data = await listResumes();
-      // Parse resume_data if it's a string
-      const parsedResumes = (data || []).map((r: any) => ({
-        ...r,
-        resume_data: typeof r.resume_data === 'string' ? JSON.parse(r.resume_data) : r.resume_data
-      }));
-      setResumes(parsedResumes);
+      setResumes(data || []);
     } catch (err) {
       console.error('Failed to load resumes:', err);
       setError('Failed to load your resumes. Please try again.');
@@ -424,7 +462,7 @@ export function ResumeBuilderHome() {
                           <div style={{ width: '800px', minHeight: '1000px' }}>
                             <TemplateRenderer 
                               templateId={resume.template_id || 'modern-professional'} 
-                              data={resume.resume_data} 
+                              data={previewToResumeData(resume.preview)} 
                             />
                           </div>
                         </div>
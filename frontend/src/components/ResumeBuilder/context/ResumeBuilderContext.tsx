@@ -1,6 +1,7 @@
 import { createContext, useCallback, useContext, useMemo, useRef, useState } from 'react';
 import type { ResumeData, PersonalInfo, WorkExperience, Education, Skill } from '@/types/resume';
 import { supabase } from '@/lib/supabaseClient';
+import { createPatch } from '@/lib/jsonPatch';
 
 type ResumeTemplateId = string;
 
@@ -64,6 +65,8 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
   const [currentResumeId, setCurrentResumeId] = useState<string | null>(null);
 
   const debouncedTimerRef = useRef<number | undefined>(undefined);
+  // Last copy of the open resume known to be on the server, so saves can send only a patch
+  const savedResumeRef = useRef<{ id: string; version: number; data: ResumeData } | null>(null);
 
   const markDirty = useCallback(() => {
     setIsDirty(true);
@@ -184,6 +187,7 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
 
       const result = await response.json();
       const savedId = result.id;
+      savedResumeRef.current = { id: savedId, version: 1, data };
       setCurrentResumeId(savedId);
       console.log('Context - Resume saved with ID:', savedId);
       return savedId;
@@ -207,13 +211,26 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
 
       const updatePayload: any = {};
       if (title !== undefined) updatePayload.title = title;
-      if (data !== undefined) updatePayload.resume_data = data;
+      const saved = savedResumeRef.current;
+      let method = 'PUT';
+      if (data !== undefined && saved && saved.id === resumeId) {
+        // Send only what changed since the last save; the server rejects it if the resume moved on
+        method = 'PATCH';
+        updatePayload.version = saved.version;
+        updatePayload.patch = createPatch(saved.data, data);
+        if (updatePayload.patch.length === 0 && title === undefined) {
+          return;
+        }
+      } else if (data !== undefined) {
+        updatePayload.resume_data = data;
+      }
 
       const response = await fetch(`${API_BASE_URL}/api/resume-builder/${resumeId}`, {
-        method: 'PUT',
+        method,
         headers,
         body: JSON.stringify(updatePayload),
       });
+      let savedResponse = response;
 
       if (!response.ok) {
         if (response.status === 401) {
@@ -231,7 +248,7 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
             // Retry with refreshed token
             headers['Authorization'] = `Bearer ${refreshedSession.access_token}`;
             const retryResponse = await fetch(`${API_BASE_URL}/api/resume-builder/${resumeId}`, {
-              method: 'PUT',
+              method,
               headers,
               body: JSON.stringify(updatePayload),
             });
@@ -241,9 +258,12 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
               console.error('Failed to update resume after token refresh:', errorText);
               throw new Error('Authentication failed. Please try again.');
             }
+            savedResponse = retryResponse;
           } else {
             throw new Error('Authentication failed. Please log in again.');
           }
+        } else if (response.status === 409) {
+          throw new Error('This resume was changed in another tab or device. Reload it to get the latest version before saving.');
         } else {
           const errorText = await response.text();
           console.error('Failed to update resume:', errorText);
@@ -251,6 +271,8 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
         }
       }
 
+      const result = await savedResponse.json();
+      savedResumeRef.current = { id: resumeId, version: result.version ?? 1, data: result.resume_data };
       console.log('Context - Resume updated:', resumeId);
     } catch (error) {
       console.error('Error updating resume:', error);
@@ -359,6 +381,7 @@ export function ResumeBuilderProvider({ children }: { children: React.ReactNode
         ? JSON.parse(result.resume_data) 
         : result.resume_data;
       setResumeData(resumeData as ResumeData);
+      savedResumeRef.current = { id: resumeId, version: result.version ?? 1, data: resumeData as ResumeData };
       setSelectedTemplate(result.template_id);
       setCurrentResumeId(resumeId);
       setIsAIGenerated(true);
@@ -43,7 +43,7 @@ const DEBUG_API_CALLS = import.meta.env.DEV && import.meta.env.VITE_DEBUG_API ==
 const requestCache = new Map<string, { data: any; timestamp: number; promise?: Promise<any> }>();
 const CACHE_TTL = 30000; // 30 seconds - increased for better navigation performance
 
-export async function cachedApiCall<T>(endpoint: string, options?: RequestInit): Promise<T> {
+export async function cachedApiCall<T>(endpoint: string, options?: RequestInit, load?: () => Promise<T>): Promise<T> {
   // Only cache GET requests
   const method = options?.method || 'GET';
   if (method !== 'GET') {
@@ -63,7 +63,7 @@ export async function cachedApiCall<T>(endpoint: string, options?: RequestInit):
     return cached.promise;
   }
   
-  const promise = apiCall<T>(endpoint, options);
+  const promise = load ? load() : apiCall<T>(endpoint, options);
   requestCache.set(cacheKey, { data: null, timestamp: 0, promise });
   
   try {
@@ -85,11 +85,12 @@ export function invalidateCache(endpoint?: string) {
   }
 }
 
-// Helper function to make authenticated API calls
-export const apiCall = async <T>(
+// Helper function to make authenticated API calls; also returns the response
+// headers for callers that need them (e.g. X-Next-Cursor when paging)
+const apiRequest = async <T>(
   endpoint: string,
   options: RequestInit = {}
-): Promise<T> => {
+): Promise<{ data: T; headers: Headers }> => {
   if (DEBUG_API_CALLS) {
     console.log(`=== API CALL DEBUG ===`);
     console.log(`Calling endpoint: ${endpoint}`);
@@ -186,7 +187,7 @@ export const apiCall = async <T>(
       
       // For non-critical endpoints with server disconnected errors, return empty array instead of throwing
       if (isNonCriticalEndpoint && isServerDisconnected) {
-        return [] as T;
+        return { data: [] as T, headers: response.headers };
       }
       
       throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
@@ -197,7 +198,7 @@ export const apiCall = async <T>(
       console.log(`Response data:`, result);
       console.log(`=== END API CALL DEBUG ===`);
     }
-    return result;
+    return { data: result, headers: response.headers };
   } catch (error) {
     console.error(`API call failed [${endpoint}]:`, error);
     if (error instanceof Error) {
@@ -211,11 +212,39 @@ export const apiCall = async <T>(
   }
 };
 
+export const apiCall = async <T>(
+  endpoint: string,
+  options: RequestInit = {}
+): Promise<T> => {
+  const { data } = await apiRequest<T>(endpoint, options);
+  return data;
+};
+
+// Job list columns for the dashboard, Kanban board and extension. Descriptions
+// are large and only needed when a job is opened, so they're fetched per job.
+const JOB_LIST_FIELDS = 'id,user_id,job_title,company,location,salary,job_url,status,excitement_level,date_applied,deadline,created_at,updated_at';
+const JOB_LIST_PAGE_SIZE = 500;
+
+// Fetch every job page by page, following the X-Next-Cursor header
+const fetchJobList = async (): Promise<Job[]> => {
+  const jobs: Job[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ fields: JOB_LIST_FIELDS, limit: String(JOB_LIST_PAGE_SIZE) });
+    if (cursor) params.set('cursor', cursor);
+    const { data, headers } = await apiRequest<Job[]>(`/api/jobs?${params.toString()}`);
+    jobs.push(...data);
+    cursor = headers.get('X-Next-Cursor');
+  } while (cursor);
+  return jobs;
+};
+
 // Job API functions
 export const jobApi = {
   // Get all jobs for the current user
   getJobs: async (): Promise<Job[]> => {
-    return cachedApiCall<Job[]>('/api/jobs');
+    // Cached under '/api/jobs' so the existing invalidateCache('/api/jobs') calls still apply
+    return cachedApiCall<Job[]>('/api/jobs', undefined, fetchJobList);
   },
 
   // Get a specific job by ID
@@ -254,6 +283,24 @@ export const jobApi = {
     }
   },
 
+  // Update several jobs (e.g. a multi-card status move) in one request
+  bulkUpdateJobs: async (updates: Array<UpdateJobData & { id: string }>): Promise<{
+    results: Array<{ id: string; success: boolean; job?: Job | null; error?: string | null }>;
+    updated: number;
+    failed: number;
+  }> => {
+    const result = await apiCall<{
+      results: Array<{ id: string; success: boolean; job?: Job | null; error?: string | null }>;
+      updated: number;
+      failed: number;
+    }>('/api/jobs/bulk', {
+      method: 'PATCH',
+      body: JSON.stringify({ updates }),
+    });
+    invalidateCache('/api/jobs');
+    return result;
+  },
+
   // Delete a job
   deleteJob: async (id: string): Promise<{ success: boolean; message: string }> => {
     const result = await apiCall<{ success: boolean; message: string }>(`/api/jobs/${id}`, {
@@ -273,6 +320,7 @@ export const aiApi = {
     improvements: string[];
     missingSkills: string[];
     matchedSkills: string[];
+    narrativeError?: string;
   }> => {
     return apiCall<{
       matchScore: number;
@@ -280,6 +328,7 @@ export const aiApi = {
       improvements: string[];
       missingSkills: string[];
       matchedSkills: string[];
+      narrativeError?: string;
     }>(`/api/ai/job-match/${jobId}`, {
       method: 'POST',
     });
@@ -0,0 +1,49 @@
+// Minimal RFC 6902 diff used to send resume edits as JSON Patch instead of whole documents
+
+export type JsonPatchOperation =
+  | { op: 'add' | 'replace'; path: string; value: unknown }
+  | { op: 'remove'; path: string };
+
+const escapeToken = (token: string) => token.replace(/~/g, '~0').replace(/\//g, '~1');
+
+const isObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value);
+
+function diff(before: unknown, after: unknown, path: string, ops: JsonPatchOperation[]) {
+  if (before === after) return;
+
+  if (isObject(before) && isObject(after)) {
+    for (const key of Object.keys(before)) {
+      if (!(key in after) || after[key] === undefined) {
+        if (before[key] !== undefined) ops.push({ op: 'remove', path: `${path}/${escapeToken(key)}` });
+      }
+    }
+    for (const key of Object.keys(after)) {
+      if (after[key] === undefined) continue;
+      const childPath = `${path}/${escapeToken(key)}`;
+      if (!(key in before) || before[key] === undefined) {
+        ops.push({ op: 'add', path: childPath, value: after[key] });
+      } else {
+        diff(before[key], after[key], childPath, ops);
+      }
+    }
+    return;
+  }
+
+  // Same-length arrays are diffed per item; anything else (inserts, reorders) replaces the array
+  if (Array.isArray(before) && Array.isArray(after) && before.length === after.length) {
+    after.forEach((item, index) => diff(before[index], item, `${path}/${index}`, ops));
+    return;
+  }
+
+  if (JSON.stringify(before) !== JSON.stringify(after)) {
+    ops.push({ op: 'replace', path, value: after });
+  }
+}
+
+/** Operations that turn `before` into `after` (both plain JSON values) */
+export function createPatch(before: unknown, after: unknown): JsonPatchOperation[] {
+  const ops: JsonPatchOperation[] = [];
+  diff(before, after, '', ops);
+  return ops;
+}
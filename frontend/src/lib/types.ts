@@ -10,7 +10,7 @@ export interface Job {
   excitement_level: number; // 1-5 star rating
   date_applied: string;
   deadline: string;
-  description: string;
+  description?: string; // omitted from the job list; loaded with the single job
   created_at: string;
   updated_at: string;
 }
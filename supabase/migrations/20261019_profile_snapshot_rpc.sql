@@ -0,0 +1,35 @@
+-- Profile snapshot RPC
+-- Returns the user_profile row together with skills, work experience, education
+-- and languages as one JSON document so the API can load a profile in a single round trip.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.get_profile_snapshot(p_user_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'profile', (
+            SELECT to_jsonb(p) FROM public.user_profile p
+            WHERE p.user_id = p_user_id
+            ORDER BY p.created_at
+            LIMIT 1
+        ),
+        'skills', COALESCE((
+            SELECT jsonb_agg(to_jsonb(s) ORDER BY s.created_at)
+            FROM public.user_skills s WHERE s.user_id = p_user_id
+        ), '[]'::jsonb),
+        'work_experience', COALESCE((
+            SELECT jsonb_agg(to_jsonb(w) ORDER BY w.start_date DESC NULLS LAST)
+            FROM public.user_work_experience w WHERE w.user_id = p_user_id
+        ), '[]'::jsonb),
+        'education', COALESCE((
+            SELECT jsonb_agg(to_jsonb(e) ORDER BY e.start_date DESC NULLS LAST)
+            FROM public.user_education e WHERE e.user_id = p_user_id
+        ), '[]'::jsonb),
+        'languages', COALESCE((
+            SELECT jsonb_agg(to_jsonb(l) ORDER BY l.created_at)
+            FROM public.user_languages l WHERE l.user_id = p_user_id
+        ), '[]'::jsonb)
+    );
+$$ LANGUAGE sql STABLE;
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- Keyset pagination indexes for the job list endpoints
+-- GET /api/jobs pages through a user's jobs ordered by (updated_at DESC, id DESC)
+-- and filters by status and date_applied; these indexes keep every page an index range scan.
+
+BEGIN;
+
+-- The cursor compares updated_at, so it must never be NULL
+UPDATE public.jobs SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+ALTER TABLE public.jobs ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_user_updated_id
+    ON public.jobs(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status_updated_id
+    ON public.jobs(user_id, status, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_date_applied
+    ON public.jobs(user_id, date_applied);
+
+-- Superseded by the composite indexes above (user_id is their leading column)
+DROP INDEX IF EXISTS public.idx_jobs_user_id;
+
+COMMIT;
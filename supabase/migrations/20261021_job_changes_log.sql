@@ -0,0 +1,141 @@
+-- Job change log for delta sync
+-- Every insert, update and delete on public.jobs appends a row here so clients can
+-- ask GET /api/jobs/changes?since=<cursor> for just what changed since their last sync.
+-- The log is written by a trigger on public.jobs, which also fires while an auth.users
+-- delete cascades into jobs, so it carries no foreign key to auth.users (the insert
+-- would reference the user being deleted and abort the cascade).
+-- prune_job_changes() keeps it bounded: see the retention notes below.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.job_changes (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    job_id UUID NOT NULL,
+    op VARCHAR(10) NOT NULL CHECK (op IN ('upsert', 'delete')),
+    changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Writing transaction; see get_job_changes
+    txid BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_changes_user_id_id ON public.job_changes(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_job_changes_job_id_id ON public.job_changes(job_id, id);
+CREATE INDEX IF NOT EXISTS idx_job_changes_user_id_txid_id ON public.job_changes(user_id, txid, id);
+
+ALTER TABLE public.job_changes ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own job changes" ON public.job_changes;
+CREATE POLICY "Users can view own job changes" ON public.job_changes
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.record_job_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO public.job_changes (user_id, job_id, op) VALUES (OLD.user_id, OLD.id, 'delete');
+        RETURN OLD;
+    END IF;
+    INSERT INTO public.job_changes (user_id, job_id, op) VALUES (NEW.user_id, NEW.id, 'upsert');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS record_jobs_change ON public.jobs;
+CREATE TRIGGER record_jobs_change
+    AFTER INSERT OR UPDATE OR DELETE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.record_job_change();
+
+-- Delta sync reads the log through get_job_changes, ordered by (txid, id) rather than id.
+-- Ids are taken at insert time, not commit time: a transaction holding id N can commit
+-- after a client has already synced past N+1, and an id cursor would skip N for good.
+-- So only rows written by transactions older than every transaction still in progress
+-- (txid below the snapshot xmin) are returned; those are committed and no row can
+-- appear before them any more, so a (txid, id) cursor never skips a late commit.
+-- A long-running transaction anywhere in the database delays sync until it ends.
+CREATE OR REPLACE FUNCTION public.get_job_changes(p_user_id UUID, p_since_txid BIGINT, p_since_id BIGINT, p_limit INTEGER)
+RETURNS TABLE (id BIGINT, job_id UUID, op VARCHAR, txid BIGINT) AS $$
+    SELECT c.id, c.job_id, c.op, c.txid
+    FROM public.job_changes c
+    WHERE c.user_id = p_user_id
+      AND (c.txid, c.id) > (p_since_txid, p_since_id)
+      AND c.txid < pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+    ORDER BY c.txid, c.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Seed the log with the existing jobs so a sync from cursor 0 sees every job
+INSERT INTO public.job_changes (user_id, job_id, op)
+SELECT j.user_id, j.id, 'upsert'
+FROM public.jobs j
+WHERE NOT EXISTS (SELECT 1 FROM public.job_changes c WHERE c.job_id = j.id)
+ORDER BY j.updated_at, j.id;
+
+-- Retention
+-- A delta sync only needs the latest change per job: a job changed after a client's
+-- cursor has its latest row either after that cursor or already synced (upserts are
+-- read from jobs at sync time, so that sync saw the later state). So superseded rows
+-- are dropped outright, which bounds the log by the number of jobs a user has ever had.
+-- Delete tombstones are dropped once older than p_tombstone_days; the highest txid
+-- dropped is recorded per user in job_changes_horizon, and a sync from a cursor at or
+-- below it is told to start over (reset) because it may have missed deletes. The newest row per user is
+-- always kept so MAX(id), the jobs resource version, never goes backwards.
+-- Rows of users that no longer exist are removed as well.
+CREATE TABLE IF NOT EXISTS public.job_changes_horizon (
+    user_id UUID PRIMARY KEY,
+    pruned_txid BIGINT NOT NULL DEFAULT 0
+);
+
+ALTER TABLE public.job_changes_horizon ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own job changes horizon" ON public.job_changes_horizon;
+CREATE POLICY "Users can view own job changes horizon" ON public.job_changes_horizon
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.prune_job_changes(p_tombstone_days INTEGER DEFAULT 90)
+RETURNS INTEGER AS $$
+DECLARE
+    superseded INTEGER;
+    expired INTEGER;
+    orphaned INTEGER;
+BEGIN
+    DELETE FROM public.job_changes c
+    WHERE EXISTS (SELECT 1 FROM public.job_changes newer WHERE newer.job_id = c.job_id AND newer.id > c.id);
+    GET DIAGNOSTICS superseded = ROW_COUNT;
+
+    WITH dropped AS (
+        DELETE FROM public.job_changes c
+        WHERE c.op = 'delete'
+          AND c.changed_at < NOW() - make_interval(days => p_tombstone_days)
+          AND c.id < (SELECT MAX(m.id) FROM public.job_changes m WHERE m.user_id = c.user_id)
+        RETURNING c.user_id, c.txid
+    ), horizon AS (
+        INSERT INTO public.job_changes_horizon (user_id, pruned_txid)
+        SELECT user_id, MAX(txid) FROM dropped GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+            SET pruned_txid = GREATEST(public.job_changes_horizon.pruned_txid, EXCLUDED.pruned_txid)
+    )
+    SELECT COUNT(*) INTO expired FROM dropped;
+
+    DELETE FROM public.job_changes c
+    WHERE NOT EXISTS (SELECT 1 FROM auth.users u WHERE u.id = c.user_id);
+    GET DIAGNOSTICS orphaned = ROW_COUNT;
+    DELETE FROM public.job_changes_horizon h
+    WHERE NOT EXISTS (SELECT 1 FROM auth.users u WHERE u.id = h.user_id);
+
+    RETURN superseded + expired + orphaned;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.prune_job_changes(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.prune_job_changes(INTEGER) TO service_role;
+
+-- Nightly with pg_cron where it is enabled; elsewhere run SELECT public.prune_job_changes()
+-- from any scheduler
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('prune-job-changes', '17 3 * * *', 'SELECT public.prune_job_changes()');
+    END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,38 @@
+-- Resource version RPC for conditional GETs
+-- Returns a cheap version string for one of a user's resources so the API can
+-- answer If-None-Match with 304 Not Modified without running the full query.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.get_resource_version(p_user_id UUID, p_resource TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    CASE p_resource
+    WHEN 'jobs' THEN
+        -- The change log id moves on every insert, update and delete
+        RETURN (SELECT COALESCE(MAX(id), 0)::text FROM public.job_changes WHERE user_id = p_user_id);
+    WHEN 'skills' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_skills WHERE user_id = p_user_id);
+    WHEN 'experience' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_work_experience WHERE user_id = p_user_id);
+    WHEN 'education' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_education WHERE user_id = p_user_id);
+    WHEN 'languages' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_languages WHERE user_id = p_user_id);
+    WHEN 'profile' THEN
+        RETURN concat_ws('|',
+            (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.user_profile WHERE user_id = p_user_id),
+            public.get_resource_version(p_user_id, 'skills'),
+            public.get_resource_version(p_user_id, 'experience'),
+            public.get_resource_version(p_user_id, 'education'),
+            public.get_resource_version(p_user_id, 'languages')
+        );
+    WHEN 'templates' THEN
+        RETURN (SELECT COALESCE(MAX(updated_at)::text, '') || ':' || COUNT(*) FROM public.templates WHERE is_active);
+    ELSE
+        RETURN NULL;
+    END CASE;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+COMMIT;
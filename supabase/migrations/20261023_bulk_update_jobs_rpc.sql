@@ -0,0 +1,42 @@
+-- Bulk job update RPC
+-- Applies many per-job field changes (e.g. a multi-card Kanban move) for one user
+-- in a single UPDATE statement. Only keys present in each element are written.
+-- Returns one result per input element, in input order.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.bulk_update_jobs(p_user_id UUID, p_updates JSONB)
+RETURNS JSONB AS $$
+    WITH input AS (
+        SELECT (t.elem->>'id')::uuid AS id, t.elem, t.ord
+        FROM jsonb_array_elements(p_updates) WITH ORDINALITY AS t(elem, ord)
+    ),
+    updated AS (
+        UPDATE public.jobs j SET
+            job_title = CASE WHEN i.elem ? 'job_title' THEN i.elem->>'job_title' ELSE j.job_title END,
+            company = CASE WHEN i.elem ? 'company' THEN i.elem->>'company' ELSE j.company END,
+            location = CASE WHEN i.elem ? 'location' THEN i.elem->>'location' ELSE j.location END,
+            salary = CASE WHEN i.elem ? 'salary' THEN i.elem->>'salary' ELSE j.salary END,
+            job_url = CASE WHEN i.elem ? 'job_url' THEN i.elem->>'job_url' ELSE j.job_url END,
+            status = CASE WHEN i.elem ? 'status' THEN i.elem->>'status' ELSE j.status END,
+            excitement_level = CASE WHEN i.elem ? 'excitement_level' THEN (i.elem->>'excitement_level')::int ELSE j.excitement_level END,
+            date_applied = CASE WHEN i.elem ? 'date_applied' THEN (i.elem->>'date_applied')::date ELSE j.date_applied END,
+            deadline = CASE WHEN i.elem ? 'deadline' THEN (i.elem->>'deadline')::date ELSE j.deadline END,
+            description = CASE WHEN i.elem ? 'description' THEN i.elem->>'description' ELSE j.description END
+        FROM input i
+        WHERE j.id = i.id AND j.user_id = p_user_id
+        RETURNING j.*
+    )
+    SELECT COALESCE(jsonb_agg(
+        jsonb_build_object(
+            'id', i.id,
+            'success', u.id IS NOT NULL,
+            'job', to_jsonb(u),
+            'error', CASE WHEN u.id IS NULL THEN 'Job not found' END
+        ) ORDER BY i.ord
+    ), '[]'::jsonb)
+    FROM input i
+    LEFT JOIN updated u ON u.id = i.id;
+$$ LANGUAGE sql;
+
+COMMIT;
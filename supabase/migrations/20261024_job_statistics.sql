@@ -0,0 +1,160 @@
+-- Incrementally maintained job statistics
+-- Triggers on public.jobs keep per-user counters so the statistics endpoints read a
+-- handful of small rows instead of scanning every job:
+--   job_status_counts   current number of jobs per status
+--   job_weekly_counts   jobs added (by created_at week) and applications (by date_applied week)
+--   job_stage_durations completed time spent in each status, summed over status changes
+-- These tables (like job_changes) are written by triggers on public.jobs, including while
+-- auth.users deletes cascade into jobs, so they carry no foreign key to auth.users.
+
+BEGIN;
+
+ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS status_changed_at TIMESTAMP WITH TIME ZONE;
+
+-- Backfill without firing the updated_at and change-log triggers
+ALTER TABLE public.jobs DISABLE TRIGGER USER;
+UPDATE public.jobs SET status_changed_at = COALESCE(updated_at, created_at, NOW()) WHERE status_changed_at IS NULL;
+ALTER TABLE public.jobs ENABLE TRIGGER USER;
+
+ALTER TABLE public.jobs ALTER COLUMN status_changed_at SET DEFAULT NOW();
+
+CREATE TABLE IF NOT EXISTS public.job_status_counts (
+    user_id UUID NOT NULL,
+    status VARCHAR(100) NOT NULL,
+    job_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS public.job_weekly_counts (
+    user_id UUID NOT NULL,
+    week_start DATE NOT NULL,
+    jobs_added INTEGER NOT NULL DEFAULT 0,
+    applications INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, week_start)
+);
+
+CREATE TABLE IF NOT EXISTS public.job_stage_durations (
+    user_id UUID NOT NULL,
+    status VARCHAR(100) NOT NULL,
+    transitions INTEGER NOT NULL DEFAULT 0,
+    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+);
+
+ALTER TABLE public.job_status_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.job_weekly_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.job_stage_durations ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own job status counts" ON public.job_status_counts;
+CREATE POLICY "Users can view own job status counts" ON public.job_status_counts
+    FOR SELECT USING (auth.uid() = user_id);
+DROP POLICY IF EXISTS "Users can view own job weekly counts" ON public.job_weekly_counts;
+CREATE POLICY "Users can view own job weekly counts" ON public.job_weekly_counts
+    FOR SELECT USING (auth.uid() = user_id);
+DROP POLICY IF EXISTS "Users can view own job stage durations" ON public.job_stage_durations;
+CREATE POLICY "Users can view own job stage durations" ON public.job_stage_durations
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- Add (p_delta = 1) or remove (p_delta = -1) one job's contribution to the counters
+CREATE OR REPLACE FUNCTION public.bump_job_stats(
+    p_user_id UUID, p_status TEXT, p_created_at TIMESTAMP WITH TIME ZONE, p_date_applied DATE, p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.job_status_counts (user_id, status, job_count)
+    VALUES (p_user_id, p_status, p_delta)
+    ON CONFLICT (user_id, status) DO UPDATE
+        SET job_count = public.job_status_counts.job_count + EXCLUDED.job_count;
+
+    INSERT INTO public.job_weekly_counts (user_id, week_start, jobs_added)
+    VALUES (p_user_id, date_trunc('week', COALESCE(p_created_at, NOW()))::date, p_delta)
+    ON CONFLICT (user_id, week_start) DO UPDATE
+        SET jobs_added = public.job_weekly_counts.jobs_added + EXCLUDED.jobs_added;
+
+    IF p_date_applied IS NOT NULL THEN
+        INSERT INTO public.job_weekly_counts (user_id, week_start, applications)
+        VALUES (p_user_id, date_trunc('week', p_date_applied)::date, p_delta)
+        ON CONFLICT (user_id, week_start) DO UPDATE
+            SET applications = public.job_weekly_counts.applications + EXCLUDED.applications;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.touch_job_status_changed_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.status_changed_at = COALESCE(NEW.status_changed_at, NOW());
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.maintain_job_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE'
+           OR NEW.user_id IS DISTINCT FROM OLD.user_id
+           OR NEW.status IS DISTINCT FROM OLD.status
+           OR NEW.created_at IS DISTINCT FROM OLD.created_at
+           OR NEW.date_applied IS DISTINCT FROM OLD.date_applied THEN
+            PERFORM public.bump_job_stats(OLD.user_id, OLD.status, OLD.created_at, OLD.date_applied, -1);
+        END IF;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND NEW.status IS DISTINCT FROM OLD.status THEN
+        INSERT INTO public.job_stage_durations (user_id, status, transitions, total_seconds)
+        VALUES (
+            OLD.user_id, OLD.status, 1,
+            GREATEST(EXTRACT(EPOCH FROM NEW.status_changed_at - COALESCE(OLD.status_changed_at, OLD.created_at, NEW.status_changed_at)), 0)
+        )
+        ON CONFLICT (user_id, status) DO UPDATE
+            SET transitions = public.job_stage_durations.transitions + 1,
+                total_seconds = public.job_stage_durations.total_seconds + EXCLUDED.total_seconds;
+    END IF;
+
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (
+            NEW.user_id IS DISTINCT FROM OLD.user_id
+            OR NEW.status IS DISTINCT FROM OLD.status
+            OR NEW.created_at IS DISTINCT FROM OLD.created_at
+            OR NEW.date_applied IS DISTINCT FROM OLD.date_applied)) THEN
+        PERFORM public.bump_job_stats(NEW.user_id, NEW.status, NEW.created_at, NEW.date_applied, 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS touch_jobs_status_changed_at ON public.jobs;
+CREATE TRIGGER touch_jobs_status_changed_at
+    BEFORE INSERT OR UPDATE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.touch_job_status_changed_at();
+
+DROP TRIGGER IF EXISTS maintain_jobs_stats ON public.jobs;
+CREATE TRIGGER maintain_jobs_stats
+    AFTER INSERT OR UPDATE OR DELETE ON public.jobs
+    FOR EACH ROW EXECUTE FUNCTION public.maintain_job_stats();
+
+-- Backfill the counters from existing jobs (stage durations start accumulating from now)
+DELETE FROM public.job_status_counts;
+DELETE FROM public.job_weekly_counts;
+
+INSERT INTO public.job_status_counts (user_id, status, job_count)
+SELECT user_id, status, COUNT(*) FROM public.jobs GROUP BY user_id, status;
+
+INSERT INTO public.job_weekly_counts (user_id, week_start, jobs_added, applications)
+SELECT user_id, week_start, SUM(jobs_added), SUM(applications)
+FROM (
+    SELECT user_id, date_trunc('week', COALESCE(created_at, NOW()))::date AS week_start, 1 AS jobs_added, 0 AS applications
+    FROM public.jobs
+    UNION ALL
+    SELECT user_id, date_trunc('week', date_applied)::date, 0, 1
+    FROM public.jobs WHERE date_applied IS NOT NULL
+) contributions
+GROUP BY user_id, week_start;
+
+COMMIT;
@@ -0,0 +1,62 @@
+-- Full-text search over saved jobs
+-- search_vector is a stored generated column, so Postgres keeps it current on every
+-- insert and update (including the enrichment background tasks' updates) without triggers.
+
+BEGIN;
+
+ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(job_title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(location, '')), 'C') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON public.jobs USING GIN (search_vector);
+
+-- Minimal HTML escaping for text returned inside markup
+CREATE OR REPLACE FUNCTION public.html_escape(p_text TEXT)
+RETURNS TEXT AS $$
+    SELECT replace(replace(replace(replace(replace(p_text,
+        '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '"', '&quot;'), '''', '&#39;');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Ranked, highlighted search over one user's jobs.
+-- The scraped text is HTML-escaped before highlighting, so the <mark></mark> around
+-- matches is the only markup in a snippet and it is safe to render as HTML.
+CREATE OR REPLACE FUNCTION public.search_jobs(p_user_id UUID, p_query TEXT, p_limit INTEGER DEFAULT 20, p_offset INTEGER DEFAULT 0)
+RETURNS TABLE (
+    id UUID,
+    job_title VARCHAR,
+    company VARCHAR,
+    location VARCHAR,
+    status VARCHAR,
+    date_applied DATE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    rank REAL,
+    headline TEXT
+) AS $$
+    WITH q AS (
+        SELECT websearch_to_tsquery('english'::regconfig, p_query) AS query
+    ),
+    hits AS (
+        SELECT j.id, j.job_title, j.company, j.location, j.status, j.date_applied, j.updated_at, j.description,
+               ts_rank_cd(j.search_vector, q.query) AS rank
+        FROM public.jobs j, q
+        WHERE j.user_id = p_user_id AND j.search_vector @@ q.query
+        ORDER BY rank DESC, j.updated_at DESC, j.id DESC
+        LIMIT p_limit OFFSET p_offset
+    )
+    -- Headlines are expensive, so they are only built for the returned page
+    SELECT h.id, h.job_title, h.company, h.location, h.status, h.date_applied, h.updated_at, h.rank,
+           ts_headline(
+               'english'::regconfig,
+               public.html_escape(concat_ws(' - ', h.job_title, h.company, h.location, h.description)),
+               q.query,
+               'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=" ... "'
+           )
+    FROM hits h, q
+    ORDER BY h.rank DESC, h.updated_at DESC, h.id DESC;
+$$ LANGUAGE sql STABLE;
+
+COMMIT;
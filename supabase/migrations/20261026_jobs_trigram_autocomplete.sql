@@ -0,0 +1,36 @@
+-- Company / job title autocomplete
+-- Trigram indexes let ILIKE '%q%' and fuzzy (%) matches on the user's saved
+-- companies and titles use an index instead of scanning every job.
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_company_trgm ON public.jobs USING GIN (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_title_trgm ON public.jobs USING GIN (job_title gin_trgm_ops);
+
+-- Distinct values of `company` or `job_title` matching p_query, best first:
+-- prefix matches, then substring matches, then fuzzy matches, each by similarity and use count.
+CREATE OR REPLACE FUNCTION public.suggest_job_values(p_user_id UUID, p_field TEXT, p_query TEXT, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (value TEXT, uses BIGINT) AS $$
+DECLARE
+    v_escaped TEXT := replace(replace(replace(p_query, '\', '\\'), '%', '\%'), '_', '\_');
+BEGIN
+    IF p_field NOT IN ('company', 'job_title') THEN
+        RAISE EXCEPTION 'Unsupported autocomplete field: %', p_field;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT %1$I::text, COUNT(*)
+         FROM public.jobs
+         WHERE user_id = $1 AND (%1$I ILIKE $2 OR %1$I %% $3)
+         GROUP BY %1$I
+         ORDER BY %1$I ILIKE $4 DESC, %1$I ILIKE $2 DESC, similarity(%1$I, $3) DESC, COUNT(*) DESC, %1$I
+         LIMIT $5',
+        p_field
+    )
+    USING p_user_id, '%' || v_escaped || '%', p_query, v_escaped || '%', p_limit;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+COMMIT;
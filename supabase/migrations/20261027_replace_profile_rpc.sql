@@ -0,0 +1,160 @@
+-- Transactional full-profile save
+-- replace_profile upserts the user_profile row and diff-applies the normalized
+-- sections in one transaction, then returns the fresh get_profile_snapshot document.
+--
+-- p_profile:  user_profile columns to set (keys absent are left unchanged), or NULL
+-- p_sections: any of "skills", "work_experience", "education", "languages"; a present
+--             key makes that array the complete section, an absent key leaves it alone.
+--             Skills and languages are matched by name/language, experience and
+--             education by id (items without an id are inserted; an id that is not
+--             one of the user's rows raises P0002 and nothing is saved).
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.replace_profile(p_user_id UUID, p_profile JSONB, p_sections JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    v_columns TEXT[];
+    v_set TEXT;
+    v_insert_columns TEXT;
+    v_insert_values TEXT;
+    v_updated INTEGER;
+    v_unknown UUID;
+BEGIN
+    -- An id that is not one of the user's rows would otherwise be dropped silently;
+    -- fail the whole save instead (P0002 -> 404 in PUT /api/profile/full)
+    IF p_sections ? 'work_experience' THEN
+        SELECT r.id INTO v_unknown
+        FROM jsonb_to_recordset(p_sections->'work_experience') AS r(id UUID)
+        WHERE r.id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM public.user_work_experience w WHERE w.id = r.id AND w.user_id = p_user_id)
+        LIMIT 1;
+        IF v_unknown IS NOT NULL THEN
+            RAISE EXCEPTION 'Work experience % not found', v_unknown USING ERRCODE = 'P0002';
+        END IF;
+    END IF;
+
+    IF p_sections ? 'education' THEN
+        SELECT r.id INTO v_unknown
+        FROM jsonb_to_recordset(p_sections->'education') AS r(id UUID)
+        WHERE r.id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM public.user_education e WHERE e.id = r.id AND e.user_id = p_user_id)
+        LIMIT 1;
+        IF v_unknown IS NOT NULL THEN
+            RAISE EXCEPTION 'Education % not found', v_unknown USING ERRCODE = 'P0002';
+        END IF;
+    END IF;
+
+    -- Profile row: only real, client-writable columns present in p_profile
+    IF p_profile IS NOT NULL THEN
+        SELECT array_agg(c.column_name::text ORDER BY c.ordinal_position) INTO v_columns
+        FROM information_schema.columns c
+        WHERE c.table_schema = 'public'
+          AND c.table_name = 'user_profile'
+          AND p_profile ? c.column_name
+          AND c.column_name NOT IN ('id', 'user_id', 'email', 'skills', 'work_experience', 'education', 'created_at', 'updated_at');
+
+        IF v_columns IS NOT NULL THEN
+            SELECT string_agg(format('%I = r.%I', col, col), ', ') INTO v_set FROM unnest(v_columns) col;
+            EXECUTE format(
+                'UPDATE public.user_profile p SET %s, updated_at = NOW()
+                 FROM jsonb_populate_record(NULL::public.user_profile, $1) r
+                 WHERE p.user_id = $2',
+                v_set
+            ) USING p_profile, p_user_id;
+        ELSE
+            UPDATE public.user_profile SET updated_at = NOW() WHERE user_id = p_user_id;
+        END IF;
+        -- EXECUTE does not set FOUND
+        GET DIAGNOSTICS v_updated = ROW_COUNT;
+
+        IF v_updated = 0 THEN
+            v_columns := array_remove(COALESCE(v_columns, ARRAY[]::text[]), 'full_name');
+            SELECT COALESCE(string_agg(format(', %I', col), ''), ''), COALESCE(string_agg(format(', r.%I', col), ''), '')
+            INTO v_insert_columns, v_insert_values
+            FROM unnest(v_columns) col;
+            EXECUTE format(
+                'INSERT INTO public.user_profile (user_id, full_name%s)
+                 SELECT $2, COALESCE(r.full_name, ''User'')%s
+                 FROM jsonb_populate_record(NULL::public.user_profile, $1) r',
+                v_insert_columns, v_insert_values
+            ) USING p_profile, p_user_id;
+        END IF;
+    END IF;
+
+    IF p_sections ? 'skills' THEN
+        DELETE FROM public.user_skills s
+        WHERE s.user_id = p_user_id
+          AND s.name NOT IN (SELECT r.name FROM jsonb_to_recordset(p_sections->'skills') AS r(name TEXT));
+
+        INSERT INTO public.user_skills (user_id, name, proficiency, category)
+        SELECT p_user_id, r.name, r.proficiency, COALESCE(r.category, 'Technical')
+        FROM jsonb_to_recordset(p_sections->'skills') AS r(name TEXT, proficiency TEXT, category TEXT)
+        ON CONFLICT (user_id, name) DO UPDATE
+            SET proficiency = EXCLUDED.proficiency, category = EXCLUDED.category
+            WHERE (public.user_skills.proficiency, public.user_skills.category)
+                  IS DISTINCT FROM (EXCLUDED.proficiency, EXCLUDED.category);
+    END IF;
+
+    IF p_sections ? 'languages' THEN
+        DELETE FROM public.user_languages l
+        WHERE l.user_id = p_user_id
+          AND l.language NOT IN (SELECT r.language FROM jsonb_to_recordset(p_sections->'languages') AS r(language TEXT));
+
+        INSERT INTO public.user_languages (user_id, language, proficiency)
+        SELECT p_user_id, r.language, r.proficiency
+        FROM jsonb_to_recordset(p_sections->'languages') AS r(language TEXT, proficiency TEXT)
+        ON CONFLICT (user_id, language) DO UPDATE
+            SET proficiency = EXCLUDED.proficiency
+            WHERE public.user_languages.proficiency IS DISTINCT FROM EXCLUDED.proficiency;
+    END IF;
+
+    IF p_sections ? 'work_experience' THEN
+        DELETE FROM public.user_work_experience w
+        WHERE w.user_id = p_user_id
+          AND w.id NOT IN (
+              SELECT r.id FROM jsonb_to_recordset(p_sections->'work_experience') AS r(id UUID) WHERE r.id IS NOT NULL
+          );
+
+        UPDATE public.user_work_experience w
+        SET title = r.title, company = r.company, location = r.location, start_date = r.start_date,
+            end_date = r.end_date, is_current = COALESCE(r.is_current, FALSE), description = r.description
+        FROM jsonb_to_recordset(p_sections->'work_experience')
+            AS r(id UUID, title TEXT, company TEXT, location TEXT, start_date DATE, end_date DATE, is_current BOOLEAN, description TEXT)
+        WHERE w.id = r.id AND w.user_id = p_user_id
+          AND (w.title, w.company, w.location, w.start_date, w.end_date, w.is_current, w.description)
+              IS DISTINCT FROM (r.title, r.company, r.location, r.start_date, r.end_date, COALESCE(r.is_current, FALSE), r.description);
+
+        INSERT INTO public.user_work_experience (user_id, title, company, location, start_date, end_date, is_current, description)
+        SELECT p_user_id, r.title, r.company, r.location, r.start_date, r.end_date, COALESCE(r.is_current, FALSE), r.description
+        FROM jsonb_to_recordset(p_sections->'work_experience')
+            AS r(id UUID, title TEXT, company TEXT, location TEXT, start_date DATE, end_date DATE, is_current BOOLEAN, description TEXT)
+        WHERE r.id IS NULL;
+    END IF;
+
+    IF p_sections ? 'education' THEN
+        DELETE FROM public.user_education e
+        WHERE e.user_id = p_user_id
+          AND e.id NOT IN (
+              SELECT r.id FROM jsonb_to_recordset(p_sections->'education') AS r(id UUID) WHERE r.id IS NOT NULL
+          );
+
+        UPDATE public.user_education e
+        SET school = r.school, degree = r.degree, start_date = r.start_date, end_date = r.end_date
+        FROM jsonb_to_recordset(p_sections->'education')
+            AS r(id UUID, school TEXT, degree TEXT, start_date DATE, end_date DATE)
+        WHERE e.id = r.id AND e.user_id = p_user_id
+          AND (e.school, e.degree, e.start_date, e.end_date) IS DISTINCT FROM (r.school, r.degree, r.start_date, r.end_date);
+
+        INSERT INTO public.user_education (user_id, school, degree, start_date, end_date)
+        SELECT p_user_id, r.school, r.degree, r.start_date, r.end_date
+        FROM jsonb_to_recordset(p_sections->'education')
+            AS r(id UUID, school TEXT, degree TEXT, start_date DATE, end_date DATE)
+        WHERE r.id IS NULL;
+    END IF;
+
+    RETURN public.get_profile_snapshot(p_user_id);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
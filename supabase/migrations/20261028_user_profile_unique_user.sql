@@ -0,0 +1,28 @@
+-- One profile row per user
+-- Profile writes upsert with ON CONFLICT (user_id); that needs a unique user_id,
+-- and full_name needs a default so an upsert that creates the row may omit it.
+
+BEGIN;
+
+-- Keep the most recently updated row (the user's latest edits) for any user that
+-- somehow has several
+DELETE FROM public.user_profile p
+USING (
+    SELECT id, row_number() OVER (
+        PARTITION BY user_id
+        ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST, id DESC
+    ) AS position
+    FROM public.user_profile
+) ranked
+WHERE p.id = ranked.id
+  AND ranked.position > 1;
+
+ALTER TABLE public.user_profile DROP CONSTRAINT IF EXISTS user_profile_user_id_key;
+ALTER TABLE public.user_profile ADD CONSTRAINT user_profile_user_id_key UNIQUE (user_id);
+
+-- The unique constraint's index covers lookups by user_id
+DROP INDEX IF EXISTS public.idx_user_profile_user_id;
+
+ALTER TABLE public.user_profile ALTER COLUMN full_name SET DEFAULT 'User';
+
+COMMIT;
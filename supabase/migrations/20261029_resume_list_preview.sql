@@ -0,0 +1,119 @@
+-- Lightweight resume list
+-- resume_builder_data.preview holds a small summary of resume_data (name, headline,
+-- first few roles and skills, section counts), recomputed by a trigger whenever
+-- resume_data is written, so the list endpoint never has to read full documents.
+--
+-- Existing rows start with an empty preview ('{}', which resume_preview never returns)
+-- and are filled by backfill_resume_preview_batch. Run backend/backfill_resume_preview.py
+-- after deploying; each batch commits on its own, so no long lock is held.
+
+BEGIN;
+
+-- Rows saved by older clients hold resume_data as a JSON-encoded string; unwrap those
+CREATE OR REPLACE FUNCTION public.resume_preview(p_data JSONB)
+RETURNS JSONB AS $$
+    WITH d AS (
+        SELECT CASE WHEN jsonb_typeof(p_data) = 'string' THEN (p_data #>> '{}')::jsonb ELSE p_data END AS data
+    ),
+    sections AS (
+        SELECT
+            data,
+            CASE WHEN jsonb_typeof(data->'personalInfo') = 'object' THEN data->'personalInfo' ELSE '{}'::jsonb END AS info,
+            CASE WHEN jsonb_typeof(data->'workExperience') = 'array' THEN data->'workExperience' ELSE '[]'::jsonb END AS work,
+            CASE WHEN jsonb_typeof(data->'education') = 'array' THEN data->'education' ELSE '[]'::jsonb END AS education,
+            CASE WHEN jsonb_typeof(data->'skills') = 'array' THEN data->'skills' ELSE '[]'::jsonb END AS skills,
+            CASE WHEN jsonb_typeof(data->'languages') = 'array' THEN data->'languages' ELSE '[]'::jsonb END AS languages
+        FROM d
+    )
+    SELECT jsonb_build_object(
+        'personalInfo', jsonb_build_object(
+            'firstName', COALESCE(info->>'firstName', ''),
+            'lastName', COALESCE(info->>'lastName', ''),
+            'jobTitle', COALESCE(info->>'jobTitle', ''),
+            'location', COALESCE(info->>'location', '')
+        ),
+        'summary', left(COALESCE(NULLIF(data->>'summary', ''), info->>'summary', ''), 280),
+        'workExperience', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'title', COALESCE(w.value->>'title', ''),
+                       'company', COALESCE(w.value->>'company', ''),
+                       'startDate', COALESCE(w.value->>'startDate', ''),
+                       'endDate', COALESCE(w.value->>'endDate', ''),
+                       'isCurrent', COALESCE(w.value->'isCurrent' = 'true'::jsonb, FALSE)
+                   ) ORDER BY w.ordinality)
+            FROM jsonb_array_elements(work) WITH ORDINALITY AS w(value, ordinality)
+            WHERE w.ordinality <= 3 AND jsonb_typeof(w.value) = 'object'
+        ), '[]'::jsonb),
+        'education', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'school', COALESCE(e.value->>'school', ''),
+                       'degree', COALESCE(e.value->>'degree', '')
+                   ) ORDER BY e.ordinality)
+            FROM jsonb_array_elements(education) WITH ORDINALITY AS e(value, ordinality)
+            WHERE e.ordinality <= 2 AND jsonb_typeof(e.value) = 'object'
+        ), '[]'::jsonb),
+        'skills', COALESCE((
+            SELECT jsonb_agg(s.value->>'name' ORDER BY s.ordinality)
+            FROM jsonb_array_elements(skills) WITH ORDINALITY AS s(value, ordinality)
+            WHERE s.ordinality <= 8 AND jsonb_typeof(s.value) = 'object' AND s.value->>'name' <> ''
+        ), '[]'::jsonb),
+        'counts', jsonb_build_object(
+            'workExperience', jsonb_array_length(work),
+            'education', jsonb_array_length(education),
+            'skills', jsonb_array_length(skills),
+            'languages', jsonb_array_length(languages)
+        )
+    )
+    FROM sections;
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE public.resume_builder_data ADD COLUMN IF NOT EXISTS preview JSONB NOT NULL DEFAULT '{}'::jsonb;
+
+CREATE OR REPLACE FUNCTION public.set_resume_preview()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.preview := public.resume_preview(NEW.resume_data);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_resume_builder_data_preview ON public.resume_builder_data;
+CREATE TRIGGER set_resume_builder_data_preview
+    BEFORE INSERT OR UPDATE OF resume_data ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.set_resume_preview();
+
+-- Fills up to p_batch_size empty previews; returns how many were filled
+CREATE OR REPLACE FUNCTION public.backfill_resume_preview_batch(p_batch_size INTEGER DEFAULT 500)
+RETURNS INTEGER AS $$
+DECLARE
+    v_filled INTEGER;
+BEGIN
+    -- A derived column, not an edit: keep updated_at (and so the newest-first list order) as is.
+    -- ALTER TABLE is transactional and its lock lasts only for this batch.
+    ALTER TABLE public.resume_builder_data DISABLE TRIGGER update_resume_builder_data_updated_at;
+
+    WITH batch AS (
+        SELECT id FROM public.resume_builder_data
+        WHERE preview = '{}'::jsonb
+        LIMIT p_batch_size
+    )
+    UPDATE public.resume_builder_data r
+    SET preview = public.resume_preview(r.resume_data)
+    FROM batch
+    WHERE r.id = batch.id;
+    GET DIAGNOSTICS v_filled = ROW_COUNT;
+
+    ALTER TABLE public.resume_builder_data ENABLE TRIGGER update_resume_builder_data_updated_at;
+    RETURN v_filled;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Runs as the table owner (needed for DISABLE TRIGGER), so keep it away from API roles
+REVOKE EXECUTE ON FUNCTION public.backfill_resume_preview_batch(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.backfill_resume_preview_batch(INTEGER) TO service_role;
+
+-- Serves the newest-first list; replaces the plain user_id index
+CREATE INDEX IF NOT EXISTS idx_resume_builder_data_user_updated ON public.resume_builder_data(user_id, updated_at DESC);
+DROP INDEX IF EXISTS public.idx_resume_builder_data_user_id;
+
+COMMIT;
@@ -0,0 +1,24 @@
+-- Change notification for the in-process template registry
+-- Every write to templates bumps updated_at (so get_resource_version('templates') moves)
+-- and sends NOTIFY templates_changed for servers that LISTEN.
+
+BEGIN;
+
+DROP TRIGGER IF EXISTS update_templates_updated_at ON public.templates;
+CREATE TRIGGER update_templates_updated_at BEFORE UPDATE ON public.templates
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE OR REPLACE FUNCTION public.notify_templates_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('templates_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_templates_changed ON public.templates;
+CREATE TRIGGER notify_templates_changed
+    AFTER INSERT OR UPDATE OR DELETE ON public.templates
+    FOR EACH STATEMENT EXECUTE FUNCTION public.notify_templates_changed();
+
+COMMIT;
@@ -0,0 +1,64 @@
+-- Store resume_builder_data.resume_data as a JSON object instead of a JSON-encoded string
+-- The API used to write json.dumps(...) into the JSONB column, which stores a scalar string:
+-- every read had to re-parse it and the GIN index only saw one opaque value per row.
+--
+-- The trigger unwraps string payloads from any server still on the old code, and
+-- backfill_resume_data_batch converts existing rows a batch at a time. Run
+-- backend/backfill_resume_data.py after deploying; it loops until nothing is left
+-- and each batch commits on its own, so no long lock is held.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.unwrap_resume_data()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF jsonb_typeof(NEW.resume_data) = 'string' THEN
+        NEW.resume_data := (NEW.resume_data #>> '{}')::jsonb;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Named to sort before set_resume_builder_data_preview, so the preview sees the object
+DROP TRIGGER IF EXISTS normalize_resume_builder_data_json ON public.resume_builder_data;
+CREATE TRIGGER normalize_resume_builder_data_json
+    BEFORE INSERT OR UPDATE OF resume_data ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.unwrap_resume_data();
+
+-- Converts up to p_batch_size string-encoded rows; returns how many were converted
+CREATE OR REPLACE FUNCTION public.backfill_resume_data_batch(p_batch_size INTEGER DEFAULT 500)
+RETURNS INTEGER AS $$
+DECLARE
+    v_converted INTEGER;
+BEGIN
+    -- This is a storage change, not an edit: keep updated_at (and so list order) as is.
+    -- ALTER TABLE is transactional and its lock lasts only for this batch.
+    ALTER TABLE public.resume_builder_data DISABLE TRIGGER update_resume_builder_data_updated_at;
+
+    WITH batch AS (
+        SELECT id FROM public.resume_builder_data
+        WHERE jsonb_typeof(resume_data) = 'string'
+        LIMIT p_batch_size
+    )
+    UPDATE public.resume_builder_data r
+    SET resume_data = (r.resume_data #>> '{}')::jsonb
+    FROM batch
+    WHERE r.id = batch.id;
+    GET DIAGNOSTICS v_converted = ROW_COUNT;
+
+    ALTER TABLE public.resume_builder_data ENABLE TRIGGER update_resume_builder_data_updated_at;
+    RETURN v_converted;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Runs as the table owner (needed for DISABLE TRIGGER), so keep it away from API roles
+REVOKE EXECUTE ON FUNCTION public.backfill_resume_data_batch(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.backfill_resume_data_batch(INTEGER) TO service_role;
+
+-- Enforced for new writes right away; validate once the backfill has finished:
+--   ALTER TABLE public.resume_builder_data VALIDATE CONSTRAINT resume_builder_data_resume_data_object;
+ALTER TABLE public.resume_builder_data DROP CONSTRAINT IF EXISTS resume_builder_data_resume_data_object;
+ALTER TABLE public.resume_builder_data ADD CONSTRAINT resume_builder_data_resume_data_object
+    CHECK (jsonb_typeof(resume_data) = 'object') NOT VALID;
+
+COMMIT;
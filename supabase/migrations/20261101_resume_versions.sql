@@ -0,0 +1,39 @@
+-- Optimistic concurrency for resume documents
+-- version increases on every change to resume_data or title. Writers send the version
+-- they started from and the API only updates the row while it still matches.
+
+BEGIN;
+
+ALTER TABLE public.resume_builder_data ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION public.bump_resume_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old JSONB := OLD.resume_data;
+    v_new JSONB := NEW.resume_data;
+BEGIN
+    -- Compare documents the way unwrap_resume_data stores them: rewriting a JSON-encoded
+    -- string as the object it holds (backfill_resume_data_batch) is not an edit.
+    -- This trigger sorts before normalize_resume_builder_data_json, so NEW may still be a string.
+    IF jsonb_typeof(v_old) = 'string' THEN
+        v_old := (v_old #>> '{}')::jsonb;
+    END IF;
+    IF jsonb_typeof(v_new) = 'string' THEN
+        v_new := (v_new #>> '{}')::jsonb;
+    END IF;
+
+    IF v_new IS DISTINCT FROM v_old OR NEW.title IS DISTINCT FROM OLD.title THEN
+        NEW.version := OLD.version + 1;
+    ELSE
+        NEW.version := OLD.version;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_resume_builder_data_version ON public.resume_builder_data;
+CREATE TRIGGER bump_resume_builder_data_version
+    BEFORE UPDATE ON public.resume_builder_data
+    FOR EACH ROW EXECUTE FUNCTION public.bump_resume_version();
+
+COMMIT;
@@ -0,0 +1,40 @@
+-- Resume revision history (see backend/utils/resume_revisions.py)
+-- One row per resume version. Deltas hold the JSON Patch from base_revision; snapshots
+-- hold the full document and are written every 10th revision so rebuilding any
+-- revision reads a bounded number of rows.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.resume_revisions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    resume_id UUID NOT NULL REFERENCES public.resume_builder_data(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('snapshot', 'delta')),
+    base_revision INTEGER,
+    title VARCHAR(255),
+    content JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (resume_id, revision),
+    CHECK ((kind = 'snapshot') = (base_revision IS NULL))
+);
+
+-- Finds the nearest snapshot at or below a revision
+CREATE INDEX IF NOT EXISTS idx_resume_revisions_snapshots ON public.resume_revisions(resume_id, revision) WHERE kind = 'snapshot';
+
+ALTER TABLE public.resume_revisions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own resume revisions" ON public.resume_revisions
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- Start every existing resume's history with a snapshot of its current version
+INSERT INTO public.resume_revisions (resume_id, user_id, revision, kind, title, content, size_bytes)
+SELECT r.id, r.user_id, r.version, 'snapshot', r.title, d.data, octet_length(d.data::text)
+FROM public.resume_builder_data r,
+     LATERAL (
+         SELECT CASE WHEN jsonb_typeof(r.resume_data) = 'string' THEN (r.resume_data #>> '{}')::jsonb ELSE r.resume_data END AS data
+     ) d
+ON CONFLICT (resume_id, revision) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,44 @@
+-- Embedding vectors for saved jobs and profiles (see backend/utils/embeddings.py)
+-- content_hash is the SHA-1 of the embedded text; a row whose hash no longer matches
+-- the job or profile is re-embedded on the next index build. Similarity is computed
+-- in the API process, so the vectors are plain REAL[] and need no extension.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.job_embeddings (
+    job_id UUID PRIMARY KEY REFERENCES public.jobs(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,
+    content_hash CHAR(40) NOT NULL,
+    embedding REAL[] NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_embeddings_user_model ON public.job_embeddings(user_id, model);
+
+CREATE TABLE IF NOT EXISTS public.profile_embeddings (
+    user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,
+    content_hash CHAR(40) NOT NULL,
+    embedding REAL[] NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+DROP TRIGGER IF EXISTS update_job_embeddings_updated_at ON public.job_embeddings;
+CREATE TRIGGER update_job_embeddings_updated_at BEFORE UPDATE ON public.job_embeddings
+    FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_profile_embeddings_updated_at ON public.profile_embeddings;
+CREATE TRIGGER update_profile_embeddings_updated_at BEFORE UPDATE ON public.profile_embeddings
+    FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+ALTER TABLE public.job_embeddings ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.profile_embeddings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own job embeddings" ON public.job_embeddings
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can view own profile embedding" ON public.profile_embeddings
+    FOR SELECT USING (auth.uid() = user_id);
+
+COMMIT;
@@ -0,0 +1,65 @@
+-- replace_profile: experience/education ids that are unknown or belong to another user
+-- Run with: supabase test db
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pgtap WITH SCHEMA extensions;
+
+SELECT plan(6);
+
+INSERT INTO auth.users (id, email) VALUES
+    ('11111111-1111-1111-1111-111111111111', 'owner@example.com'),
+    ('22222222-2222-2222-2222-222222222222', 'other@example.com');
+
+INSERT INTO public.user_work_experience (id, user_id, title, company) VALUES
+    ('aaaaaaaa-0000-0000-0000-000000000001', '11111111-1111-1111-1111-111111111111', 'Engineer', 'Acme'),
+    ('aaaaaaaa-0000-0000-0000-000000000002', '22222222-2222-2222-2222-222222222222', 'Designer', 'Globex');
+
+INSERT INTO public.user_education (id, user_id, school) VALUES
+    ('bbbbbbbb-0000-0000-0000-000000000001', '11111111-1111-1111-1111-111111111111', 'State University');
+
+-- Another user's experience id
+SELECT throws_ok(
+    $$ SELECT public.replace_profile('11111111-1111-1111-1111-111111111111', '{"job_title": "Lead"}'::jsonb,
+        '{"work_experience": [{"id": "aaaaaaaa-0000-0000-0000-000000000002", "title": "Stolen", "company": "Globex"}]}'::jsonb) $$,
+    'P0002',
+    'Work experience aaaaaaaa-0000-0000-0000-000000000002 not found',
+    'a foreign experience id is rejected'
+);
+
+-- An id that does not exist at all
+SELECT throws_ok(
+    $$ SELECT public.replace_profile('11111111-1111-1111-1111-111111111111', NULL,
+        '{"education": [{"id": "bbbbbbbb-0000-0000-0000-00000000ffff", "school": "Nowhere"}]}'::jsonb) $$,
+    'P0002',
+    'Education bbbbbbbb-0000-0000-0000-00000000ffff not found',
+    'an unknown education id is rejected'
+);
+
+-- The failed saves changed nothing
+SELECT is(
+    (SELECT title FROM public.user_work_experience WHERE id = 'aaaaaaaa-0000-0000-0000-000000000001'),
+    'Engineer',
+    'the owner''s experience is untouched'
+);
+SELECT is(
+    (SELECT title FROM public.user_work_experience WHERE id = 'aaaaaaaa-0000-0000-0000-000000000002'),
+    'Designer',
+    'the other user''s experience is untouched'
+);
+SELECT is(
+    (SELECT COUNT(*)::int FROM public.user_education WHERE user_id = '11111111-1111-1111-1111-111111111111'),
+    1,
+    'the owner''s education is untouched'
+);
+
+-- Known ids still update in place
+SELECT lives_ok(
+    $$ SELECT public.replace_profile('11111111-1111-1111-1111-111111111111', NULL,
+        '{"work_experience": [{"id": "aaaaaaaa-0000-0000-0000-000000000001", "title": "Senior Engineer", "company": "Acme"}]}'::jsonb) $$,
+    'the user''s own ids are accepted'
+);
+
+SELECT * FROM finish();
+
+ROLLBACK;